@@ -5,6 +5,8 @@ from main_components.main_screen import MainScreen
 from main_components.manager_panel import ManagerPanel
 from main_components.admin_panel import AdminPanel
 from main_components.booking_staff_panel import BookingStaffPanel
+from main_components.services.booking_service import SeatHoldReaper
+from database.database_settings import SessionLocal, release_connection
 
 
 class MainApplication(tk.Tk):
@@ -20,9 +22,12 @@ class MainApplication(tk.Tk):
         style.configure("Selected.TButton", background="gray", foreground="black") #Selected style
         style.configure("Available.TButton", background="green", foreground="black") #Available style
         style.configure("Unavailable.TButton", background="red", foreground="black") #unavailable style.
+        style.configure("Held.TButton", background="orange", foreground="black") #held by another terminal style.
 
         self.main_frame = ttk.Frame(self)
         self.main_frame.pack(fill=tk.BOTH, expand=True)
+        self.hold_reaper = SeatHoldReaper(SessionLocal) # Expires abandoned seat holds in the background.
+        self.hold_reaper.start()
         self.show_login()
 
     def setup_menu(self):
@@ -44,6 +49,7 @@ class MainApplication(tk.Tk):
     def clear_frame(self):
         for widget in self.main_frame.winfo_children():
             widget.destroy()
+        release_connection() # The next screen starts a fresh transaction on the shared session.
 
     def show_login(self):
         self.clear_frame()
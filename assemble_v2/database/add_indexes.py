@@ -0,0 +1,44 @@
+import sys
+import os
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(parent_dir)
+import logging
+from typing import List
+from sqlalchemy import inspect
+from main_components.models import Base
+
+logger = logging.getLogger(__name__)
+
+
+def create_missing_indexes(engine) -> List[str]:
+    """
+    Creates every index declared on the models that the existing database does not have yet.
+    Tables and data are left untouched, so this can be run against the live database.
+
+    Args:
+        engine: The engine of the database to migrate.
+    Returns:
+        List[str]: The names of the indexes that were created.
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    created = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            logger.warning(f"Skipping indexes of missing table {table.name}, run create_database.py first.")
+            continue
+        existing_indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            if index.name in existing_indexes:
+                continue
+            index.create(bind=engine)
+            created.append(index.name)
+            logger.info(f"Created index {index.name} on {table.name}.")
+    return created
+
+
+if __name__ == "__main__":
+    from database.database_settings import get_engine
+    logging.basicConfig(level=logging.INFO)
+    created = create_missing_indexes(get_engine())
+    print(f"Created {len(created)} indexes: {', '.join(created) if created else 'none, the schema is up to date.'}")
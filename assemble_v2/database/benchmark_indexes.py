@@ -0,0 +1,174 @@
+"""
+Benchmarks the service lookups covered by the schema indexes.
+
+Fills a throwaway SQLite database with synthetic cinemas, screenings and bookings, then runs every
+lookup before and after add_indexes.py and prints the query plan and median latency of each one.
+
+Usage: python database/benchmark_indexes.py [--cinemas 10] [--days 30] [--repeat 50]
+"""
+
+import sys
+import os
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(parent_dir)
+import argparse
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from datetime import time as clock_time
+from sqlalchemy import create_engine, event, insert, text
+from sqlalchemy.orm import sessionmaker
+from main_components.models import Base, Booking, Cinema, City, Film, Screen, Screening, Seat, SeatAvailability, Ticket
+from main_components.enums import PaymentStatus
+from main_components.services.booking_service import BookingService
+from main_components.services.screening_service import ScreeningService
+from main_components.services.seat_service import SeatService
+from main_components.services.ticket_service import TicketService
+from database.add_indexes import create_missing_indexes
+
+START_TIMES = [clock_time(11, 0), clock_time(15, 0), clock_time(19, 30)]
+
+
+def fill_database(engine, cinemas: int, screens_per_cinema: int, seats_per_screen: int, days: int, bookings_per_screening: int) -> dict:
+    """Inserts the synthetic data set and returns sample keys to look up."""
+    today = date.today()
+    with engine.begin() as connection:
+        connection.execute(insert(City), [{"city_id": 1, "name": "Bristol", "country": "UK", "price_morning": 6, "price_afternoon": 7, "price_evening": 8}])
+        connection.execute(insert(Film), [{"film_id": 1, "name": "Benchmark", "genre": "Drama", "cast": "", "description": "", "age_rating": "PG",
+                                           "critic_rating": 7.0, "runtime": 120, "release_date": today}])
+        connection.execute(insert(Cinema), [{"cinema_id": cinema_id, "city_id": 1, "name": f"Cinema {cinema_id}", "address": ""} for cinema_id in range(1, cinemas + 1)])
+        screens, seats = [], []
+        for cinema_id in range(1, cinemas + 1):
+            for screen_number in range(1, screens_per_cinema + 1):
+                screen_id = f"S{screen_number}"
+                screens.append({"screen_id": screen_id, "cinema_id": cinema_id, "total_capacity": seats_per_screen, "row_number": 10})
+                seats.extend({"seat_id": f"{screen_id}_C{cinema_id}_{n}", "screen_id": screen_id, "cinema_id": cinema_id, "seat_type": "Lower"}
+                             for n in range(1, seats_per_screen + 1))
+        connection.execute(insert(Screen), screens)
+        connection.execute(insert(Seat), seats)
+
+        screening_id = 0
+        for day in range(days):
+            screenings, availability, bookings, tickets = [], [], [], []
+            for screen in screens:
+                for start_time in START_TIMES:
+                    screening_id += 1
+                    screenings.append({"screening_id": screening_id, "film_id": 1, "screen_id": screen["screen_id"], "cinema_id": screen["cinema_id"],
+                                       "date": today + timedelta(days=day), "start_time": start_time, "screening_availability": 1})
+                    for n in range(1, seats_per_screen + 1):
+                        seat_id = f"{screen['screen_id']}_C{screen['cinema_id']}_{n}"
+                        booking_id = str(uuid.uuid4()) if n <= bookings_per_screening else None
+                        availability.append({"screening_id": screening_id, "seat_id": seat_id, "seat_availability": 0 if booking_id else 1, "booking_id": booking_id})
+                        if booking_id:
+                            customer = f"Customer {screening_id}-{n}"
+                            bookings.append({"booking_id": booking_id, "seat_id": seat_id, "customer_name": customer,
+                                             "customer_email": f"customer{screening_id}-{n}@example.com", "customer_phone": None})
+                            tickets.append({"booking_id": booking_id, "seat_id": seat_id, "ticket_price": 8.0, "qr_code": None,
+                                            "payment_status": PaymentStatus.PAID, "issue_date": datetime.now()})
+            connection.execute(insert(Screening), screenings)
+            connection.execute(insert(SeatAvailability), availability)
+            connection.execute(insert(Booking), bookings)
+            connection.execute(insert(Ticket), tickets)
+    sample = bookings[len(bookings) // 2]
+    return {"cinema_id": cinemas // 2 + 1, "date": today + timedelta(days=days // 2), "screen_id": "S1",
+            "booking_id": sample["booking_id"], "customer_name": sample["customer_name"], "customer_email": sample["customer_email"]}
+
+
+def build_cases(session, sample: dict) -> list:
+    """The service lookups that each index is meant to serve."""
+    screening_service = ScreeningService(session)
+    seat_service = SeatService(session)
+    ticket_service = TicketService(session)
+    booking_service = BookingService(session, ticket_service)
+    return [
+        ("ScreeningService.get_screenings_by_cinema_and_date", lambda: screening_service.get_screenings_by_cinema_and_date(sample["cinema_id"], sample["date"])),
+        ("SeatService.get_all_seats_by_screen", lambda: seat_service.get_all_seats_by_screen(sample["screen_id"], sample["cinema_id"])),
+        ("SeatService.get_seat_availability_for_booking", lambda: seat_service.get_seat_availability_for_booking(sample["booking_id"])),
+        ("TicketService.get_tickets_by_booking", lambda: ticket_service.get_tickets_by_booking(sample["booking_id"])),
+        ("BookingService.get_bookings_by_customer", lambda: booking_service.get_bookings_by_customer(sample["customer_name"])),
+        ("BookingService.get_bookings_by_customer_email", lambda: booking_service.get_bookings_by_customer_email(sample["customer_email"])),
+    ]
+
+
+def measure(engine, session, lookup, repeat: int):
+    """Returns the query plan of the lookup's statement and its median latency in milliseconds."""
+    statements = []
+    listener = lambda conn, cursor, statement, parameters, context, executemany: statements.append((statement, parameters))
+    event.listen(engine, "before_cursor_execute", listener)
+    lookup()
+    event.remove(engine, "before_cursor_execute", listener)
+    statement, parameters = statements[0]
+    with engine.connect() as connection:
+        plan = [row[-1] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+
+    timings = []
+    for _ in range(repeat):
+        session.expunge_all()  # Time the query, not the identity map.
+        started = time.perf_counter()
+        lookup()
+        timings.append((time.perf_counter() - started) * 1000)
+    return plan, statistics.median(timings)
+
+
+def drop_model_indexes(engine) -> None:
+    """Drops the declared indexes so the baseline matches the schema before the migration."""
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                connection.execute(text(f"DROP INDEX IF EXISTS {index.name}"))
+
+
+def run_benchmark(cinemas: int = 10, screens_per_cinema: int = 4, seats_per_screen: int = 80, days: int = 30,
+                  bookings_per_screening: int = 20, repeat: int = 50, database_path: str = None) -> dict:
+    """
+    Runs every lookup without and with the indexes.
+
+    Returns:
+        dict: {lookup name: {"before": (plan, median ms), "after": (plan, median ms)}}
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = database_path or os.path.join(directory, "benchmark.db")
+        engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(bind=engine)
+        drop_model_indexes(engine)
+        sample = fill_database(engine, cinemas, screens_per_cinema, seats_per_screen, days, bookings_per_screening)
+        with engine.begin() as connection:
+            connection.execute(text("ANALYZE"))
+
+        session = sessionmaker(bind=engine)()
+        results = {}
+        try:
+            for phase in ("before", "after"):
+                if phase == "after":
+                    create_missing_indexes(engine)
+                    with engine.begin() as connection:
+                        connection.execute(text("ANALYZE"))
+                for name, lookup in build_cases(session, sample):
+                    results.setdefault(name, {})[phase] = measure(engine, session, lookup, repeat)
+        finally:
+            session.close()
+            engine.dispose()
+    return results
+
+
+def print_report(results: dict) -> None:
+    for name, phases in results.items():
+        (plan_before, before), (plan_after, after) = phases["before"], phases["after"]
+        print(f"\n{name}")
+        print(f"  before: {before:8.3f} ms  {' | '.join(plan_before)}")
+        print(f"  after:  {after:8.3f} ms  {' | '.join(plan_after)}")
+        print(f"  speedup: {before / after if after else float('inf'):.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the lookup indexes on a synthetic SQLite database.")
+    parser.add_argument("--cinemas", type=int, default=10)
+    parser.add_argument("--screens", type=int, default=4)
+    parser.add_argument("--seats", type=int, default=80)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--bookings", type=int, default=20, help="Booked seats per screening.")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    print_report(run_benchmark(args.cinemas, args.screens, args.seats, args.days, args.bookings, args.repeat))
@@ -0,0 +1,23 @@
+import sys
+import os
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(parent_dir)
+import logging
+from sqlalchemy.orm import sessionmaker
+from main_components.models import SalesRollup
+from main_components.services.reporting_service import ReportingService
+from database.database_settings import get_engine
+
+# Creates the sales_rollups table on an existing database and fills it from the tickets sold so far.
+# Afterwards the booking and ticket services keep it up to date. Safe to re-run, the rollups are rebuilt from scratch.
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    engine = get_engine()
+    SalesRollup.__table__.create(bind=engine, checkfirst=True)
+    session = sessionmaker(bind=engine)()
+    try:
+        count = ReportingService(session).rebuild_sales_rollups()
+        print(f"Sales rollups rebuilt: {count} screening/day rows.")
+    finally:
+        session.close()
@@ -2,12 +2,14 @@ import sys
 import os
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(parent_dir)
-import mysql.connector # To connect with the MYsql table created in MYSQL workbench.
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 from main_components.models import Base
 from main_components.models.booking import Booking
 from main_components.models.seat_availability import SeatAvailability
+from main_components.models.seat_hold import SeatHold
+from main_components.models.booking_event import BookingEvent
+from main_components.models.sales_rollup import SalesRollup
+from main_components.models.training_snapshot import TrainingSnapshot
+from main_components.models.training_checkpoint import TrainingCheckpoint
 from main_components.models.cinema import Cinema
 from main_components.models.city import City
 from main_components.models.film import Film
@@ -21,16 +23,9 @@ from main_components.models.ticket import Ticket
 from main_components.models.user import User
 from main_components.models import Base  # Import your Base metadata
 
-conn = mysql.connector.connect(
-    host="localhost",
-    user="MickelUWE",
-    password="g<bI1Z11iC]c", 
-    database="Cinema"
-)
+from database.database_settings import get_engine
 
-DATABASE_URL = "mysql+pymysql://MickelUWE:g<bI1Z11iC]c@localhost:3306/cinema"
-engine = create_engine(DATABASE_URL, echo = True) # Initialises connection to the existing database, echo=True enables debugging (Printing out all queries it executes).
-SessionLocal = sessionmaker(bind=engine) # Creates database sessions
+engine = get_engine() # Configured from the CINEMA_DB_* environment variables, set CINEMA_DB_BACKEND=sqlite for a local database.
 
 # Base.metadata.create_all(engine)
 
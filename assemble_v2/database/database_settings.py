@@ -1,32 +1,136 @@
-import mysql.connector
+import os
+import threading
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-
-# Database connection parameters
-DB_HOST = "localhost"
-DB_USER = "MickelUWE"
-DB_PASSWORD = "g<bI1Z11iC]c"
-DB_NAME = "Cinema"
-
-# MySQL Connector connection
-conn = mysql.connector.connect(
-    host=DB_HOST,
-    user=DB_USER,
-    password=DB_PASSWORD,
-    database=DB_NAME
-)
-
-# SQLAlchemy configuration
-DATABASE_URL = f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:3306/{DB_NAME.lower()}"
-engine = create_engine(DATABASE_URL, echo=False)
-SessionLocal = sessionmaker(bind=engine)
+from sqlalchemy.engine import URL
+from sqlalchemy.orm import Session, scoped_session
+from sqlalchemy.pool import StaticPool
+
+# Database connection parameters, each one can be overridden with the environment variable named in the comment.
+DB_BACKEND = os.getenv("CINEMA_DB_BACKEND", "mysql")  # "mysql" or "sqlite".
+DB_HOST = os.getenv("CINEMA_DB_HOST", "localhost")
+DB_PORT = int(os.getenv("CINEMA_DB_PORT", "3306"))
+DB_USER = os.getenv("CINEMA_DB_USER", "MickelUWE")
+DB_PASSWORD = os.getenv("CINEMA_DB_PASSWORD", "g<bI1Z11iC]c")
+DB_NAME = os.getenv("CINEMA_DB_NAME", "Cinema")
+SQLITE_PATH = os.getenv("CINEMA_DB_SQLITE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "cinema.db"))  # ":memory:" for a throwaway database.
+
+# Connection pool settings.
+POOL_SIZE = int(os.getenv("CINEMA_DB_POOL_SIZE", "5"))
+MAX_OVERFLOW = int(os.getenv("CINEMA_DB_MAX_OVERFLOW", "10"))
+POOL_PRE_PING = os.getenv("CINEMA_DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")  # Replaces connections dropped by the server while idle.
+POOL_RECYCLE_SECONDS = int(os.getenv("CINEMA_DB_POOL_RECYCLE", "1800"))  # Below MySQL's wait_timeout.
+POOL_TIMEOUT_SECONDS = int(os.getenv("CINEMA_DB_POOL_TIMEOUT", "30"))
+STATEMENT_TIMEOUT_MS = int(os.getenv("CINEMA_DB_STATEMENT_TIMEOUT_MS", "30000"))  # 0 disables the timeout.
+ECHO = os.getenv("CINEMA_DB_ECHO", "false").lower() in ("1", "true", "yes")
+
+
+class DatabaseConfig:
+    """
+    The settings used to build the engine. Defaults come from the module level settings above.
+    """
+    def __init__(self, backend: str = None, url: str = None, pool_size: int = None, max_overflow: int = None, pool_pre_ping: bool = None,
+                 pool_recycle: int = None, pool_timeout: int = None, statement_timeout_ms: int = None, echo: bool = None):
+        self.backend = backend or DB_BACKEND
+        if self.backend not in ("mysql", "sqlite"):
+            raise ValueError(f"Unsupported database backend {self.backend}, expected 'mysql' or 'sqlite'.")
+        self.url = url or os.getenv("CINEMA_DB_URL") or self.default_url()
+        self.pool_size = POOL_SIZE if pool_size is None else pool_size
+        self.max_overflow = MAX_OVERFLOW if max_overflow is None else max_overflow
+        self.pool_pre_ping = POOL_PRE_PING if pool_pre_ping is None else pool_pre_ping
+        self.pool_recycle = POOL_RECYCLE_SECONDS if pool_recycle is None else pool_recycle
+        self.pool_timeout = POOL_TIMEOUT_SECONDS if pool_timeout is None else pool_timeout
+        self.statement_timeout_ms = STATEMENT_TIMEOUT_MS if statement_timeout_ms is None else statement_timeout_ms
+        self.echo = ECHO if echo is None else echo
+
+    def default_url(self):
+        if self.backend == "sqlite":
+            return f"sqlite:///{SQLITE_PATH}"
+        return URL.create("mysql+pymysql", username=DB_USER, password=DB_PASSWORD, host=DB_HOST, port=DB_PORT, database=DB_NAME.lower())
+
+    def __repr__(self):
+        url = self.url if isinstance(self.url, str) else self.url.render_as_string(hide_password=True)
+        return f"<DatabaseConfig(backend={self.backend}, url={url}, pool_size={self.pool_size}, max_overflow={self.max_overflow})>"
+
+
+def create_engine_from_config(config: DatabaseConfig = None):
+    """
+    Builds an engine from the configuration. No connection is opened until the engine is first used.
+
+    Args:
+        config (DatabaseConfig): The settings to use, read from the environment when omitted.
+    Returns:
+        Engine: The configured engine.
+    """
+    config = config or DatabaseConfig()
+    if config.backend == "sqlite":
+        # SQLite has no statement timeout, the busy timeout bounds how long a writer waits for a lock instead.
+        connect_args = {"check_same_thread": False, "timeout": max(config.statement_timeout_ms, 1000) / 1000}
+        if str(config.url) in ("sqlite://", "sqlite:///:memory:"):
+            return create_engine(config.url, echo=config.echo, connect_args=connect_args, poolclass=StaticPool)
+        return create_engine(config.url, echo=config.echo, connect_args=connect_args, pool_size=config.pool_size,
+                             max_overflow=config.max_overflow, pool_timeout=config.pool_timeout, pool_pre_ping=config.pool_pre_ping)
+
+    connect_args = {}
+    if config.statement_timeout_ms:
+        # Aborts SELECTs that run longer than the timeout, so one slow report can't pin a pooled connection.
+        connect_args["init_command"] = f"SET SESSION MAX_EXECUTION_TIME={int(config.statement_timeout_ms)}"
+    return create_engine(config.url, echo=config.echo, connect_args=connect_args, pool_size=config.pool_size, max_overflow=config.max_overflow,
+                         pool_pre_ping=config.pool_pre_ping, pool_recycle=config.pool_recycle, pool_timeout=config.pool_timeout)
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """Returns the application's engine, creating it on first use."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = create_engine_from_config()
+    return _engine
+
+
+def configure_engine(config: DatabaseConfig = None):
+    """
+    Replaces the application's engine, for example to point a local run or a script at SQLite.
+    Sessions opened afterwards use the new engine.
+    """
+    global _engine
+    with _engine_lock:
+        SessionLocal.remove()
+        if _engine is not None:
+            _engine.dispose()
+        _engine = create_engine_from_config(config)
+    return _engine
+
+
+def _create_session() -> Session:
+    return Session(bind=get_engine())
+
+
+# One session per thread, shared by every frame and service running on it. Sessions only hold a pooled
+# connection while a transaction is open, so the whole UI needs a single connection instead of one per window.
+SessionLocal = scoped_session(_create_session)
+
+
+def release_connection():
+    """
+    Ends the calling thread's transaction so its connection goes back to the pool.
+    Loaded objects stay attached to the session and are reloaded on next access.
+    """
+    SessionLocal.rollback()
+
 
 def get_db_connection():
     """
     Creates and returns a fresh MySQL connector connection
     """
+    import mysql.connector  # Only needed by callers that want a raw connection.
     return mysql.connector.connect(
         host=DB_HOST,
+        port=DB_PORT,
         user=DB_USER,
         password=DB_PASSWORD,
         database=DB_NAME
@@ -36,8 +140,8 @@ def get_db():
     """
     Creates and returns a new SQLAlchemy session
     """
-    db = SessionLocal()
+    db = Session(bind=get_engine())
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
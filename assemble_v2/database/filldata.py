@@ -2,8 +2,6 @@ import sys
 import os
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(parent_dir)
-import mysql.connector # To connect with the MYsql table created in MYSQL workbench.
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import IntegrityError
 from datetime import datetime, timedelta, time
@@ -36,15 +34,9 @@ from main_components.services.seat_service import SeatService
 from main_components.services.ticket_service import TicketService
 from main_components.services.user_service import UserService 
 from main_components.enums import PaymentStatus
-# Create a connection to the database
-conn = mysql.connector.connect(
-    host="localhost",
-    user="MickelUWE",
-    password="g<bI1Z11iC]c",
-    database="Cinema"
-)   
-DATABASE_URL = "mysql+pymysql://MickelUWE:g<bI1Z11iC]c@localhost:3306/cinema"
-engine = create_engine(DATABASE_URL, echo = False) # Initialises connection to the existing database, echo=True enables debugging (Printing out all queries it executes).
+from database.database_settings import get_engine
+
+engine = get_engine() # Configured from the CINEMA_DB_* environment variables, set CINEMA_DB_BACKEND=sqlite for a local database.
 SessionLocal = sessionmaker(bind=engine) # Creates database sessions
 
 def fill_city():
@@ -0,0 +1,41 @@
+import sys
+import os
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(parent_dir)
+import argparse
+import logging
+import time
+from sqlalchemy.orm import sessionmaker
+from main_components.models import TrainingCheckpoint, TrainingSnapshot
+from main_components.prediction.model_registry import get_model_registry
+from main_components.prediction.retraining import VALIDATION_DAYS, WINDOW_DAYS, extract_training_snapshots, retrain_model
+from database.database_settings import get_engine
+
+# Nightly retraining of the demand model from the bookings in the database. Creates the snapshot tables if missing,
+# extracts the screenings shown since the last run and retrains on the sliding window. The new model is saved to
+# the application's model directory (CINEMA_MODEL_DIR) only if its validation error does not regress.
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Retrains the demand model on the screenings shown so far.")
+    parser.add_argument('--window-days', type=int, default=WINDOW_DAYS)
+    parser.add_argument('--validation-days', type=int, default=VALIDATION_DAYS)
+    parser.add_argument('--tolerance', type=float, default=0.0, help="Accepted relative increase of the validation RMSE.")
+    parser.add_argument('--full', action='store_true', help="Extract every shown screening again, ignoring the checkpoint.")
+    arguments = parser.parse_args()
+
+    engine = get_engine()
+    TrainingSnapshot.__table__.create(bind=engine, checkfirst=True)
+    TrainingCheckpoint.__table__.create(bind=engine, checkfirst=True)
+    session = sessionmaker(bind=engine)()
+    try:
+        started = time.perf_counter()
+        extracted = extract_training_snapshots(session, full=arguments.full)
+        print(f"Extracted {extracted} screenings in {time.perf_counter() - started:.1f}s.")
+        result = retrain_model(session, get_model_registry(), window_days=arguments.window_days,
+                               validation_days=arguments.validation_days, tolerance=arguments.tolerance)
+        print(f"Trained on {result.trained_rows} screenings, validated on {result.validation_rows}: "
+              f"RMSE {result.new_rmse:.2f} against {result.current_rmse}. "
+              f"{'Saved as' if result.promoted else 'Kept'} model {result.version} in {time.perf_counter() - started:.1f}s.")
+    finally:
+        session.close()
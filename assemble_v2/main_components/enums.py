@@ -4,4 +4,15 @@ class PaymentStatus(enum.Enum):
     PENDING = "pending"
     PAID = "paid"
     REFUNDED = "refunded"
-    
\ No newline at end of file
+    
+
+class SeatState(enum.Enum):
+    AVAILABLE = "available"
+    HELD = "held"
+    BOOKED = "booked"
+
+class CancellationStatus(enum.Enum):
+    CANCELLED = "cancelled"
+    NOT_FOUND = "not_found"
+    NO_SCREENING = "no_screening"
+    ALREADY_STARTED = "already_started"
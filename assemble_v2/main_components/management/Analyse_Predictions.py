@@ -1,14 +1,16 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import pandas as pd
-import joblib
-from datetime import datetime
-from database.database_settings import SessionLocal
-from main_components.services.screening_service import ScreeningService
+from datetime import datetime, date, timedelta
+import os
+from database.database_settings import SessionLocal, release_connection
 from main_components.services.cinema_service import CinemaService
-from main_components.services.screen_service import ScreenService
-from main_components.services.film_service import FilmService
-from main_components.services.city_service import CityService
+from main_components.prediction.forecast_cache import predict_with_cache
+from main_components.prediction.features import load_screening_features
+from main_components.prediction.model_registry import ModelSchemaError, get_model_registry
+from main_components.prediction.forecast import forecast_range
+
+FORECAST_DAYS = 14 # The default outlook, two weeks from today.
+FORECAST_PROCESSES = int(os.getenv("CINEMA_FORECAST_PROCESSES", "0")) or None # Worker processes for large forecasts.
 
 class PredictionAnalysisPage(tk.Frame):
     def __init__(self, parent, callback=None):
@@ -16,13 +18,8 @@ class PredictionAnalysisPage(tk.Frame):
         self.callback = callback
         self.session = SessionLocal()
         self.cinema_service = CinemaService(self.session) 
-        self.screening_service = ScreeningService(self.session)
-        self.screen_service = ScreenService(self.session)
-        self.film_service = FilmService(self.session)
-        self.city_service = CityService(self.session)
+        self.model_registry = get_model_registry() # Loaded on the first prediction and shared by every page.
         self.setup_ui()
-        self.model = joblib.load('C:/Users/Hp/Documents/GitHub/System_Development_group/assemble_v2/main_components/management/gradient_boosting_model.joblib')
-        self.scaler = joblib.load('C:/Users/Hp/Documents/GitHub/System_Development_group/assemble_v2/main_components/management/scaler.joblib')
 
     def setup_ui(self):
         # --- Prediction for a Specific Showing ---
@@ -74,78 +71,35 @@ class PredictionAnalysisPage(tk.Frame):
         self.specific_cinema_sales_result_label = ttk.Label(self, text="")
         self.specific_cinema_sales_result_label.grid(row=12, column=1)
 
-        # Back button
-        ttk.Button(self, text="Back", command=self.go_back).grid(row=13, column=0, columnspan=2, pady=10) 
+        # --- Forecast for a Range of Days ---
+        ttk.Label(self, text="--- Forecast Tickets Sold for a Range of Days ---").grid(row=13, column=0, columnspan=2, pady=(15, 5))
 
-    def datetime_to_excel(self, datetime_obj):
-        origin = datetime(1900, 1, 1)
-        return (datetime_obj - origin).days + 2
-    
-    def predict_tickets_sold(self, input_data):
-        input_df = pd.DataFrame([input_data])
-        # Convert release_date and date from string to Excel serial number
-        input_df['release_date'] = pd.to_datetime(input_df['release_date']).apply(self.datetime_to_excel)
-        input_df['date'] = pd.to_datetime(input_df['date']).apply(self.datetime_to_excel)
-
-        # Convert boolean columns to 0/1
-        boolean_cols = input_df.select_dtypes(include='bool').columns
-        input_df[boolean_cols] = input_df[boolean_cols].astype(int)
-
-        # Remove duplicates
-        input_df.drop_duplicates(inplace=True)
-
-        # Scale the numerical features (same as in training)
-        numerical_cols = ['capacity', 'ticket_price', 'release_date', 'rating', 'date'] 
-        input_df[numerical_cols] = self.scaler.transform(input_df[numerical_cols])
-
-        # Drop low importance features (same as in training)
-        low_importance_features = [
-            'ticket_price',
-            'screen_id',
-            'film_id',
-            'show_time_category_Morning',
-            'Romance',
-            'Comedy',
-            'Sci-Fi',
-            'cinema_location_Cardiff',
-            'show_time_category_Afternoon',
-            'Drama',
-            'Adventure',
-            'Action',
-            'seat_type_Lower',
-            'cinema_id',
-            'cinema_location_Bristol',
-            'seat_type_VIP',
-            'Mystery',
-            'seat_type_Upper',
-            'Horror',
-            'cinema_location_London',
-            'cinema_location_Birmingham',
-            'Thriller'
-        ]
-
-        input_df_reduced = input_df.drop(low_importance_features, axis=1)
-
-        training_columns = ['date', 'capacity', 'release_date', 'rating', 'show_time_category_Evening',
-                       'day_of_week_Friday', 'day_of_week_Monday', 'day_of_week_Saturday',
-                       'day_of_week_Sunday', 'day_of_week_Thursday', 'day_of_week_Tuesday',
-                       'day_of_week_Wednesday']
-        
-        # Create the day of week columns.
-        day_name = pd.to_datetime(input_data['date']).day_name() # Extracts day of week from date.
-        for day in ['Friday', 'Monday', 'Saturday', 'Sunday', 'Thursday', 'Tuesday', 'Wednesday']:
-            input_df_reduced[f'day_of_week_{day}'] = 1 if day == day_name else 0 # Creates each column day 
-        
-        input_df_reduced = input_df_reduced[training_columns]
+        today = date.today()
+        ttk.Label(self, text="From (YYYY-MM-DD):").grid(row=14, column=0)
+        self.range_start_entry = ttk.Entry(self)
+        self.range_start_entry.insert(0, today.isoformat())
+        self.range_start_entry.grid(row=14, column=1)
+
+        ttk.Label(self, text="To (YYYY-MM-DD):").grid(row=15, column=0)
+        self.range_end_entry = ttk.Entry(self)
+        self.range_end_entry.insert(0, (today + timedelta(days=FORECAST_DAYS - 1)).isoformat())
+        self.range_end_entry.grid(row=15, column=1)
 
-        # Make the prediction
-        prediction = round(self.model.predict(input_df_reduced)[0])
+        ttk.Label(self, text="Cinema IDs (optional, comma separated):").grid(row=16, column=0)
+        self.range_cinema_ids_entry = ttk.Entry(self)
+        self.range_cinema_ids_entry.grid(row=16, column=1)
 
-        # Enforce the capacity constraint.
-        capacity = input_data['capacity']
-        prediction = min(prediction, capacity) #ensure prediction is not higher than capacity.
+        ttk.Button(self, text="Forecast Range", command=self.forecast_date_range).grid(row=17, column=0, columnspan=2, pady=5)
 
-        return prediction
+        # Back button
+        ttk.Button(self, text="Back", command=self.go_back).grid(row=18, column=0, columnspan=2, pady=10) 
+
+    def predict_tickets_sold(self, input_data):
+        return int(predict_with_cache(self.model_registry.get(), [input_data])[0])
+
+    def predict_total_tickets(self, feature_rows):
+        """Sums the predictions for many screenings, scoring the ones not cached together in one batch."""
+        return int(predict_with_cache(self.model_registry.get(), feature_rows).sum())
 
 
     def predict_tickets_for_showing(self, input_data = None):
@@ -161,102 +115,27 @@ class PredictionAnalysisPage(tk.Frame):
                 messagebox.showerror("Input Error", "Screening ID must be a positive integer.")
                 return
 
-            screening = self.screening_service.get_screening_by_id(screening_id)
-            if not screening:
+            feature_rows = load_screening_features(self.session, screening_ids=[screening_id])
+            if not feature_rows:
                 messagebox.showerror("Input Error", f"Screening with ID {screening_id} not found.")
                 return
-            cinema_id = screening.cinema_id
-            film_id = screening.film_id
-            screen_id = screening.screen_id
-            date = screening.date
-            start_time = screening.start_time
-
-            film = self.film_service.get_film_by_id(film_id)
-            release_date = film.release_date
-            rating = film.critic_rating
-            genres = film.get_genre()
-            film_title = film.name
-
-            genre_scores = {
-                "Action": 0,
-                "Adventure": 0,
-                "Comedy": 0,
-                "Drama": 0,
-                "Horror": 0,
-                "Mystery": 0,
-                "Romance": 0,
-                "Sci-Fi": 0,
-                "Thriller": 0,
-            }
-            
-            for genre in genres:
-                if genre in genre_scores:
-                    genre_scores[genre] = 1
-
-            cinema = self.cinema_service.get_cinema_by_id(cinema_id)
-            city_id = cinema.city_id
-            city = self.city_service.get_city_by_id(city_id)
-            city_name = city.name
-            birmingham = 1 if city_name == "Birmingham" else 0
-            bristol = 1 if city_name == "Bristol" else 0
-            cardiff = 1 if city_name == "Cardiff" else 0
-            london = 1 if city_name == "London" else 0
-            screen = self.screen_service.get_screen_by_id(screen_id)
-            capacity = screen.total_capacity
-
-            start_hour = start_time.hour
-            start_minute = start_time.minute
-            start_second = start_time.second
-
-            morning = 1 if 8 <= start_hour < 12 else 0
-            afternoon = 1 if 12 <= start_hour < 17 else 0
-            evening = 1 if 17 <= start_hour <= 23 else 0
-            
-
-            # Create input dictionary
-            input_data = {
-                'capacity': capacity,
-                'release_date': release_date,
-                'date': date,
-                'rating': rating,
-                'show_time_category_Evening': evening,
-                'show_time_category_Morning': morning,
-                'show_time_category_Afternoon': afternoon,
-                'seat_type_Lower': 0,
-                'seat_type_Upper': 0,
-                'seat_type_VIP': 0,
-                'cinema_location_Birmingham': birmingham,
-                'cinema_location_Bristol': bristol,
-                'cinema_location_Cardiff': cardiff,
-                'cinema_location_London': london,
-                'cinema_id': cinema_id,
-                'screen_id': screen_id,
-                'film_id': film_id,
-                'Action': genre_scores["Action"],
-                'Adventure': genre_scores["Adventure"],
-                'Comedy': genre_scores["Comedy"],
-                'Drama': genre_scores["Drama"],
-                'Horror': genre_scores["Horror"],
-                'Mystery': genre_scores["Mystery"],
-                'Romance': genre_scores["Romance"],
-                'Sci-Fi': genre_scores["Sci-Fi"],
-                'Thriller': genre_scores["Thriller"],
-                'ticket_price': 1000, # Cant calculate as every seat in a screen has a different price.
-            }
+            input_data = feature_rows[0]
 
             # Call predict_tickets_sold
             prediction = self.predict_tickets_sold(input_data)
 
             # Display prediction with film title and showing time
-            output_text = f"Film: {film_title}\nDate: {date}\nStart Time: {start_time}\nPredicted Tickets: {prediction}"
+            output_text = f"Film: {input_data['film_name']}\nDate: {input_data['date']}\nStart Time: {input_data['start_time']}\nPredicted Tickets: {prediction}"
             self.output_label.config(text=output_text)
 
+        except (OSError, ModelSchemaError) as e:
+            messagebox.showerror("Prediction Error", f"The demand model could not be loaded: {e}")
         except ValueError as ve:
             messagebox.showerror("Input Error", "Invalid Screening ID. Please enter a whole number.")
         except Exception as e:
             messagebox.showerror("An Error Occurred", f"An unexpected error occurred: {e}")
         finally:
-            self.session.close()
+            release_connection() # The session is shared with the other frames, so it must stay open.
         
     def predict_total_day_sales_for_all_cinemas(self):
         date_str = self.day_prediction_date_entry.get().strip()
@@ -271,57 +150,19 @@ class PredictionAnalysisPage(tk.Frame):
             messagebox.showerror("Input Error", "Date must be in YYYY-MM-DD format.")
             return
 
-        all_cinemas = self.cinema_service.get_all_cinemas()
-        total_predicted_sales = 0
-
-        for cinema in all_cinemas:
-            screenings_on_date = self.screening_service.get_screenings_by_cinema_and_date(cinema.cinema_id, prediction_date)
-            for screening in screenings_on_date:
-                film = self.film_service.get_film_by_id(screening.film_id)
-                screen_obj = self.screen_service.get_screen_by_id(screening.screen_id)
-
-                if film and screen_obj:
-                    start_hour = screening.start_time.hour
-                    morning = 1 if 8 <= start_hour < 12 else 0
-                    afternoon = 1 if 12 <= start_hour < 17 else 0
-                    evening = 1 if 17 <= start_hour <= 23 else 0
-                    genres = film.get_genre()
-                    genre_scores = {genre: 1 if genre in genres else 0 for genre in ["Action", "Adventure", "Comedy", "Drama", "Horror", "Mystery", "Romance", "Sci-Fi", "Thriller"]}
-                    city_id = cinema.city_id
-                    city = self.city_service.get_city_by_id(city_id)
-                    city_name = city.name
-                    birmingham = 1 if city_name == "Birmingham" else 0
-                    bristol = 1 if city_name == "Bristol" else 0
-                    cardiff = 1 if city_name == "Cardiff" else 0
-                    london = 1 if city_name == "London" else 0
-
-                    input_data = {
-                        'capacity': screen_obj.total_capacity,
-                        'release_date': film.release_date,
-                        'date': screening.date,
-                        'rating': film.critic_rating,
-                        'show_time_category_Evening': evening,
-                        'show_time_category_Morning': morning,
-                        'show_time_category_Afternoon': afternoon,
-                        'seat_type_Lower': 0,
-                        'seat_type_Upper': 0,
-                        'seat_type_VIP': 0,
-                        'cinema_location_Birmingham': birmingham,
-                        'cinema_location_Bristol': bristol,
-                        'cinema_location_Cardiff': cardiff,
-                        'cinema_location_London': london,
-                        'cinema_id': cinema.cinema_id,
-                        'screen_id': screen_obj.screen_id,
-                        'film_id': film.film_id,
-                        **genre_scores,
-                        'ticket_price': 1000, # Placeholder
-                    }
-                    total_predicted_sales += self.predict_tickets_sold(input_data)
+        try:
+            feature_rows = load_screening_features(self.session, prediction_date) # Every screening of the day in one query.
+            total_predicted_sales = self.predict_total_tickets(feature_rows)
+        except (OSError, ModelSchemaError) as e:
+            messagebox.showerror("Prediction Error", f"The demand model could not be loaded: {e}")
+            return
+        except Exception as e:
+            messagebox.showerror("An Error Occurred", f"An unexpected error occurred: {e}")
+            return
+        finally:
+            release_connection() # The session is shared with the other frames, so it must stay open.
 
         self.day_sales_result_label.config(text=f"all cinemas on {prediction_date.strftime('%Y-%m-%d')}: {total_predicted_sales}")
-        
-
-
 
     def predict_total_day_sales_for_specific_cinema(self):
         cinema_id_str = self.specific_cinema_id_entry.get().strip()
@@ -344,65 +185,97 @@ class PredictionAnalysisPage(tk.Frame):
             messagebox.showerror("Input Error", "Invalid Cinema ID or Date format (YYYY-MM-DD).")
             return
 
-        cinema = self.cinema_service.get_cinema_by_id(cinema_id)
-        if not cinema:
-            messagebox.showerror("Input Error", f"Cinema with ID {cinema_id} not found.")
-            return
+        try:
+            cinema = self.cinema_service.get_cinema_by_id(cinema_id)
+            if not cinema:
+                messagebox.showerror("Input Error", f"Cinema with ID {cinema_id} not found.")
+                return
 
-        screenings_on_date = self.screening_service.get_screenings_by_cinema_and_date(cinema_id, prediction_date)
-        total_predicted_sales = 0
+            feature_rows = load_screening_features(self.session, prediction_date, cinema_ids=[cinema_id])
 
-        if not screenings_on_date:
-            self.specific_cinema_sales_result_label.config(text=f"No screenings found for Cinema {cinema_id} on {prediction_date.strftime('%Y-%m-%d')}.")
-            return
+            if not feature_rows:
+                self.specific_cinema_sales_result_label.config(text=f"No screenings found for Cinema {cinema_id} on {prediction_date.strftime('%Y-%m-%d')}.")
+                return
 
-        for screening in screenings_on_date:
-            film = self.film_service.get_film_by_id(screening.film_id)
-            screen_obj = self.screen_service.get_screen_by_id(screening.screen_id)
-
-            if film and screen_obj:
-                start_hour = screening.start_time.hour
-                morning = 1 if 8 <= start_hour < 12 else 0
-                afternoon = 1 if 12 <= start_hour < 17 else 0
-                evening = 1 if 17 <= start_hour <= 23 else 0
-                genres = film.get_genre()
-                genre_scores = {genre: 1 if genre in genres else 0 for genre in ["Action", "Adventure", "Comedy", "Drama", "Horror", "Mystery", "Romance", "Sci-Fi", "Thriller"]}
-                city_id = cinema.city_id
-                city = self.city_service.get_city_by_id(city_id)
-                city_name = city.name
-                birmingham = 1 if city_name == "Birmingham" else 0
-                bristol = 1 if city_name == "Bristol" else 0
-                cardiff = 1 if city_name == "Cardiff" else 0
-                london = 1 if city_name == "London" else 0
-
-                input_data = {
-                    'capacity': screen_obj.total_capacity,
-                    'release_date': film.release_date,
-                    'date': screening.date,
-                    'rating': film.critic_rating,
-                    'show_time_category_Evening': evening,
-                    'show_time_category_Morning': morning,
-                    'show_time_category_Afternoon': afternoon,
-                    'seat_type_Lower': 0,
-                    'seat_type_Upper': 0,
-                    'seat_type_VIP': 0,
-                    'cinema_location_Birmingham': birmingham,
-                    'cinema_location_Bristol': bristol,
-                    'cinema_location_Cardiff': cardiff,
-                    'cinema_location_London': london,
-                    'cinema_id': cinema.cinema_id,
-                    'screen_id': screen_obj.screen_id,
-                    'film_id': film.film_id,
-                    **genre_scores,
-                    'ticket_price': 1000, # Placeholder
-                }
-                total_predicted_sales += self.predict_tickets_sold(input_data)
+            total_predicted_sales = self.predict_total_tickets(feature_rows)
+        except (OSError, ModelSchemaError) as e:
+            messagebox.showerror("Prediction Error", f"The demand model could not be loaded: {e}")
+            return
+        except Exception as e:
+            messagebox.showerror("An Error Occurred", f"An unexpected error occurred: {e}")
+            return
+        finally:
+            release_connection() # The session is shared with the other frames, so it must stay open.
 
         self.specific_cinema_sales_result_label.config(text=f"Cinema {cinema_id} on {prediction_date.strftime('%Y-%m-%d')}: {total_predicted_sales}")
 
+    def forecast_date_range(self):
+        try:
+            start_date = datetime.strptime(self.range_start_entry.get().strip(), '%Y-%m-%d').date()
+            end_date = datetime.strptime(self.range_end_entry.get().strip(), '%Y-%m-%d').date()
+            cinema_ids_str = self.range_cinema_ids_entry.get().strip()
+            cinema_ids = [int(cinema_id) for cinema_id in cinema_ids_str.split(',') if cinema_id.strip()] if cinema_ids_str else None
+        except ValueError:
+            messagebox.showerror("Input Error", "Dates must be in YYYY-MM-DD format and Cinema IDs whole numbers.")
+            return
+        if end_date < start_date:
+            messagebox.showerror("Input Error", "The end date must not be before the start date.")
+            return
 
-            
+        try:
+            forecast = forecast_range(start_date, end_date, cinema_ids, session=self.session, processes=FORECAST_PROCESSES)
+            cinema_names = {cinema.cinema_id: cinema.name for cinema in self.cinema_service.get_all_cinemas()}
+        except (OSError, ModelSchemaError) as e:
+            messagebox.showerror("Prediction Error", f"The demand model could not be loaded: {e}")
+            return
+        except Exception as e:
+            messagebox.showerror("An Error Occurred", f"An unexpected error occurred: {e}")
+            return
+        finally:
+            release_connection()
+        ForecastViewer(forecast, cinema_names, start_date, end_date)
 
     def go_back(self):
         if self.callback:
-            self.callback("back")
\ No newline at end of file
+            self.callback("back")
+
+
+class ForecastViewer(tk.Toplevel):
+    """Shows a range forecast as predicted tickets per day, per cinema, per film and per day and cinema."""
+    def __init__(self, forecast, cinema_names, start_date, end_date):
+        super().__init__()
+        self.title(f"Forecast {start_date} to {end_date}")
+        self.forecast = forecast
+        self.cinema_names = cinema_names
+        self.setup_ui()
+
+    def cinema_label(self, cinema_id):
+        return f"{self.cinema_names.get(cinema_id, 'Unknown')} ({cinema_id})"
+
+    def add_tab(self, notebook, title, columns, rows):
+        frame = ttk.Frame(notebook)
+        tree = ttk.Treeview(frame, columns=columns, show="headings")
+        for column in columns:
+            tree.heading(column, text=column)
+        for values in rows:
+            tree.insert("", tk.END, values=values)
+        scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        notebook.add(frame, text=title)
+
+    def setup_ui(self):
+        forecast = self.forecast
+        notebook = ttk.Notebook(self)
+        notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        self.add_tab(notebook, "By Day", ("Day", "Predicted Tickets"),
+                     [(day.strftime('%a %Y-%m-%d'), tickets) for day, tickets in forecast["by_day"].items()])
+        self.add_tab(notebook, "By Cinema", ("Cinema", "Predicted Tickets"),
+                     [(self.cinema_label(cinema_id), tickets) for cinema_id, tickets in forecast["by_cinema"].items()])
+        self.add_tab(notebook, "By Film", ("Film", "Predicted Tickets"),
+                     [(f"{forecast['film_names'].get(film_id)} ({film_id})", tickets) for film_id, tickets in forecast["by_film"].items()])
+        self.add_tab(notebook, "By Day and Cinema", ("Day", "Cinema", "Predicted Tickets"),
+                     [(day.strftime('%a %Y-%m-%d'), self.cinema_label(cinema_id), tickets)
+                      for (day, cinema_id), tickets in forecast["by_day_and_cinema"].items()])
+        ttk.Label(self, text=f"Total: {forecast['total']} tickets over {forecast['screenings']} screenings").pack(pady=5)
@@ -1,28 +1,45 @@
-import json
 import datetime
+import logging
 import os
+from main_components.management.event_index import DEFAULT_PAGE_SIZE
+from main_components.management.event_store import get_event_store, get_event_writer
+
+logger = logging.getLogger(__name__)
+_sql_store = None
+
+EVENT_STORE_BACKEND = os.getenv("CINEMA_EVENT_STORE", "jsonl")  # "jsonl" for the local log files, "sql" for the shared booking_events table.
 
 class BookingEventsManager:
-    def __init__(self, filename="booking_events.json"):
+    def __init__(self, filename="booking_events.json", directory=None, store=None):
+        # Events are appended to JSON Lines segments in the directory, booking_events/ by default, or to the
+        # booking_events table when CINEMA_EVENT_STORE=sql. A legacy JSON array file is migrated into the store
+        # the first time the log is opened.
         self.filename = filename
-        self.events = self.load_events()
+        self.directory = directory or os.path.splitext(filename)[0]
+        self.store = store or self.create_store(self.directory)
+        self.store.migrate_json_array(self.filename)
+        self.writer = get_event_writer(self.store)  # Disk writes happen on a background thread, off the Tk event loop.
+
+    @staticmethod
+    def create_store(directory):
+        if EVENT_STORE_BACKEND == "sql":
+            global _sql_store
+            if _sql_store is None:
+                from database.database_settings import get_engine
+                from sqlalchemy.orm import sessionmaker
+                from main_components.management.sql_event_store import SqlEventStore
+                _sql_store = SqlEventStore(sessionmaker(bind=get_engine()))
+            return _sql_store
+        return get_event_store(directory)
 
     def load_events(self):
-        if os.path.exists(self.filename):
-            try:
-                with open(self.filename, "r") as f:
-                    return json.load(f)
-            except (FileNotFoundError, json.JSONDecodeError):
-                return []
-        else:
-            return []
+        return list(self.iter_events())
 
     def save_events(self):
-        with open(self.filename, "w") as f:
-            json.dump(self.events, f, indent=4)
+        self.writer.flush()
 
     def log_event(self, booking_id, user_id, event_type, event_data):
-        print(f"Logging event: booking_id={booking_id}, user_id={user_id}, event_type={event_type}, event_data={event_data}")
+        logger.debug(f"Logging event: booking_id={booking_id}, user_id={user_id}, event_type={event_type}")
         event = {
             "booking_id": booking_id,
             "user_id": user_id,
@@ -30,19 +47,51 @@ class BookingEventsManager:
             "event_data": event_data,
             "timestamp": datetime.datetime.now().isoformat()
         }
-        self.events.append(event)
-        self.save_events()
-
-    def get_events(self, booking_id=None, event_type=None, start_date=None, end_date=None):
-        filtered_events = self.events[:]  # Create a copy
-
-        if booking_id:
-            filtered_events = [e for e in filtered_events if e["booking_id"] == booking_id]
-        if event_type:
-            filtered_events = [e for e in filtered_events if e["event_type"] == event_type]
-        if start_date:
-            filtered_events = [e for e in filtered_events if datetime.datetime.fromisoformat(e["timestamp"]) >= start_date]
-        if end_date:
-            filtered_events = [e for e in filtered_events if datetime.datetime.fromisoformat(e["timestamp"]) <= end_date]
-
-        return filtered_events
\ No newline at end of file
+        self.writer.submit(event)
+
+    def metrics(self):
+        """Throughput and back-pressure counters of the background writer."""
+        return self.writer.metrics()
+
+    def iter_events(self):
+        """Streams the events from disk, oldest first."""
+        self.writer.flush()
+        return self.store.iter_events()
+
+    def refresh_index(self):
+        """Brings the store's index up to date with the log, including other terminals' events, and returns it."""
+        self.writer.flush()
+        return self.store.index()
+
+    def get_events(self, booking_id=None, event_type=None, start_date=None, end_date=None, user_id=None, offset=0, limit=None):
+        return list(self.refresh_index().query(booking_id=booking_id, event_type=event_type, user_id=user_id,
+                                               start_date=start_date, end_date=end_date, offset=offset, limit=limit))
+
+    def iter_event_pages(self, page_size=DEFAULT_PAGE_SIZE, **filters):
+        """Yields the matching events page by page, oldest first. Takes the same filters as get_events."""
+        return self.refresh_index().iter_pages(page_size, **filters)
+
+    def events_per_hour(self, event_type=None, start_date=None, end_date=None):
+        """Event counts keyed by "YYYY-MM-DD HH:00"."""
+        self.writer.flush()
+        return self.store.count_by_hour(event_type=event_type, start_date=start_date, end_date=end_date)
+
+    def events_per_user(self, event_type=None, start_date=None, end_date=None):
+        self.writer.flush()
+        return self.store.count_by_user(event_type=event_type, start_date=start_date, end_date=end_date)
+
+    def events_per_screening(self, event_type=None, start_date=None, end_date=None):
+        self.writer.flush()
+        return self.store.count_by_screening(event_type=event_type, start_date=start_date, end_date=end_date)
+
+    def events_per_type(self, start_date=None, end_date=None):
+        self.writer.flush()
+        return self.store.count_by_event_type(start_date=start_date, end_date=end_date)
+
+    def read_page(self, position=None, page_size=DEFAULT_PAGE_SIZE, event_type=None, start_date=None, end_date=None):
+        """
+        Reads one page of events straight from the store, without loading the rest of the log.
+        Returns the page and the position to pass for the next page, None after the last page.
+        """
+        self.writer.flush()
+        return self.store.read_page(position, page_size, event_type=event_type, start_date=start_date, end_date=end_date)
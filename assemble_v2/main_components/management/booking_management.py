@@ -3,10 +3,12 @@ from tkinter import ttk, messagebox
 from tkinter import Toplevel, Text, Button
 import re
 from database.database_settings import SessionLocal
-from main_components.services.booking_service import BookingService
+from main_components.services.booking_service import BookingService, BookingTimeoutError, SeatUnavailableError
+from main_components.services.seat_service import SeatService
 from main_components.services.ticket_service import TicketService
 from main_components.services.screening_service import ScreeningService
 from main_components.models import SeatAvailability, Seat, Booking, Screening
+from main_components.enums import SeatState, CancellationStatus
 import datetime
 import os
 import subprocess
@@ -24,6 +26,8 @@ class BookingManagement(tk.Frame):
         self.session = SessionLocal()
         self.booking_service = BookingService(self.session, TicketService(self.session))
         self.screening_service = ScreeningService(self.session)
+        self.seat_service = SeatService(self.session)
+        self.hold_id = None # Hold on the seats selected in the create booking window.
         self.setup_ui()
         self.sort_order = {} # Store the current sort order for each column
         self.event_manager = BookingEventsManager()
@@ -60,6 +64,7 @@ class BookingManagement(tk.Frame):
     def create_booking_ui(self):
         self.create_window = tk.Toplevel(self)
         self.create_window.title("Create Booking")
+        self.create_window.protocol("WM_DELETE_WINDOW", self.close_create_window) # Release held seats when the window is closed.
 
         # Screening Selection
         tk.Label(self.create_window, text="Select Screening:", anchor='w').grid(row=0, column=0, sticky='ew', padx=5, pady=5)
@@ -140,33 +145,27 @@ class BookingManagement(tk.Frame):
         if selected_screening:
 
             # Reset selected seats when a new screening is selected.
+            self.release_seat_hold()
             self.selected_seats = [] if hasattr(self, 'selected_seats') else []
             self.update_selected_seats_display() #update display to show empty seats.
 
-            seats = self.session.query(Seat).filter(
-            Seat.cinema_id == (selected_screening.cinema_id if self.cinema_id != 'all' else selected_screening.cinema_id),
-            Seat.screen_id == selected_screening.screen_id,).all()
-
-            # Sort available_seats by Seatnumber
-            seats.sort(key=lambda seat: int(seat.seat_id.split('_')[-1])) # Get seatnumber
+            # Seat states come from the cached availability map, sorted by seat number, with no query per seat.
+            self.seat_states = self.seat_service.get_seat_states(selected_screening.screening_id, self.hold_id)
 
             self.seat_buttons = {}  # Store seat buttons for color changes
             row = 0
             col = 0
-            for seat in seats:
-                #check seat availability.
-                seat_availability_obj = self.session.query(SeatAvailability).filter(
-                SeatAvailability.seat_id == seat.seat_id,
-                SeatAvailability.screening_id == selected_screening.screening_id,).first()
-
-                if seat_availability_obj and seat_availability_obj.seat_availability == 1:
+            for seat_id, seat_state in self.seat_states.items():
+                if seat_state == SeatState.AVAILABLE:
                     button_style = "Available.TButton"  # green
+                elif seat_state == SeatState.HELD:
+                    button_style = "Held.TButton"  # orange, another terminal is booking it
                 else:
                     button_style = "Unavailable.TButton"  # red
 
-                button = ttk.Button(self.seat_frame, text=seat.seat_id, command=lambda s_id=seat.seat_id: self.select_seat(s_id, selected_screening.screening_id), style=button_style)
+                button = ttk.Button(self.seat_frame, text=seat_id, command=lambda s_id=seat_id: self.select_seat(s_id, selected_screening.screening_id), style=button_style)
                 button.grid(row=row, column=col, padx=5, pady=5) 
-                self.seat_buttons[seat.seat_id] = button
+                self.seat_buttons[seat_id] = button
                 col += 1
                 if col > 10: # adjust the number of columns
                     col = 0
@@ -174,26 +173,28 @@ class BookingManagement(tk.Frame):
 
 
     def select_seat(self, seat_id, screening_id):
-        seat_availability_obj = self.session.query(SeatAvailability).filter(
-        SeatAvailability.seat_id == seat_id,
-        SeatAvailability.screening_id == screening_id,).first()
-
-        if seat_availability_obj and seat_availability_obj.seat_availability == 0:
-            # Seat is unavailable (red), prevent selection
+        if self.seat_states.get(seat_id) != SeatState.AVAILABLE:
+            # Seat is booked (red) or held by another terminal (orange), prevent selection
             return
     
         if not hasattr(self, 'selected_seats'):
             self.selected_seats = []
         if seat_id not in self.selected_seats:
+            # Hold the seat so that no other terminal can book it while this booking is being made.
+            try:
+                self.hold_id = self.booking_service.hold_seats([seat_id], screening_id, hold_id=self.hold_id)
+            except SeatUnavailableError as e:
+                self.seat_states[seat_id] = SeatState.HELD
+                self.seat_buttons[seat_id].config(style="Held.TButton")
+                messagebox.showerror("Error", str(e))
+                return
             self.selected_seats.append(seat_id)
             self.seat_buttons[seat_id].config(style="Selected.TButton")  # Change color
         else:
             self.selected_seats.remove(seat_id)
+            self.booking_service.release_hold(self.hold_id, [seat_id])
             if seat_id in self.seat_buttons:
-                if seat_availability_obj and seat_availability_obj.seat_availability == 1:
-                    self.seat_buttons[seat_id].config(style="Available.TButton")  # revert to green
-                else:
-                    self.seat_buttons[seat_id].config(style="Unavailable.TButton")  # revert to red
+                self.seat_buttons[seat_id].config(style="Available.TButton")  # revert to green
         
         # Update the selected seats display
         self.update_selected_seats_display()
@@ -274,10 +275,13 @@ class BookingManagement(tk.Frame):
         
         if messagebox.askyesno("Confirm Booking", confirmation_message): 
             try:
-                booking_objects = self.booking_service.create_booking(seat_ids, customer_name, customer_email, customer_phone, screening_id)
+                booking_objects = self.booking_service.convert_hold_to_booking(self.hold_id, customer_name, customer_email, customer_phone)
                 if booking_objects is None:
+                    # The hold is still in place, release it with the window so the seats are free to select again.
                     messagebox.showerror("Error", "Booking creation failed. Please check the logs for details.")
+                    self.close_create_window()
                     return
+                self.hold_id = None # The booking released the hold.
 
                 messagebox.showinfo("Success", "Booking created successfully.")
 
@@ -298,9 +302,21 @@ class BookingManagement(tk.Frame):
                 }
                 self.event_manager.log_event(booking_ids, self.user.user_id, "booking", booking_data)
 
+            except BookingTimeoutError as e:
+                self.hold_id = None
+                messagebox.showerror("Booking Timed Out", str(e))
             except ValueError as e:
                 messagebox.showerror("Error", str(e))
-        self.create_window.destroy() #destroy the window.
+        self.close_create_window() #destroy the window.
+
+    def release_seat_hold(self):
+        if self.hold_id:
+            self.booking_service.release_hold(self.hold_id)
+            self.hold_id = None
+
+    def close_create_window(self):
+        self.release_seat_hold()
+        self.create_window.destroy()
 
 
 
@@ -357,6 +373,31 @@ class BookingManagement(tk.Frame):
                     except Exception as e:
                         messagebox.showerror("Error", f"An unexpected error occurred: {e}")
 
+        def cancel_selected_bookings():
+            booking_ids = list(dict.fromkeys(tree.item(item, "values")[0] for item in tree.selection())) # One entry per booking, rows are per seat.
+            if not booking_ids:
+                messagebox.showerror("Error", "Please select at least one booking.")
+                return
+            if not messagebox.askyesno("Confirm Cancellation", f"Are you sure you want to cancel {len(booking_ids)} bookings?"):
+                return
+            try:
+                results = self.booking_service.cancel_bookings(booking_ids)
+            except Exception as e:
+                messagebox.showerror("Error", f"An unexpected error occurred: {e}")
+                return
+
+            cancelled = [booking_id for booking_id, status in results.items() if status == CancellationStatus.CANCELLED]
+            for booking_id in cancelled:
+                cancellation_data = {"cancellation_reason": "Bulk Cancellation"}
+                self.event_manager.log_event(booking_id, self.user.user_id, "cancellation", cancellation_data)
+
+            skipped = [f"{booking_id}: {status.value}" for booking_id, status in results.items() if status != CancellationStatus.CANCELLED]
+            summary = f"{len(cancelled)} bookings cancelled."
+            if skipped:
+                summary += "\n\nNot cancelled:\n" + "\n".join(skipped)
+            messagebox.showinfo("Bulk Cancellation", summary)
+            refresh_treeview()
+
         def refresh_treeview():
             for item in tree.get_children():
                 tree.delete(item)  # Clear the treeview
@@ -426,6 +467,10 @@ class BookingManagement(tk.Frame):
         refresh_button = tk.Button(cancel_window, text="Search", command=refresh_treeview)
         refresh_button.pack(pady=5)
 
+        # Bulk cancellation of every selected booking
+        cancel_selected_button = tk.Button(cancel_window, text="Cancel Selected Bookings", command=cancel_selected_bookings)
+        cancel_selected_button.pack(pady=5)
+
         tree.bind("<Double-1>", select_for_cancellation)
     
     def view_bookings_ui(self):
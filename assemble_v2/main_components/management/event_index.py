@@ -0,0 +1,137 @@
+import datetime
+import threading
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from typing import Callable, Dict, Iterable, Iterator, List
+
+DEFAULT_PAGE_SIZE = 100
+
+
+class EventIndex:
+    """
+    An in-memory index over booking events.
+
+    Timestamps are parsed once when an event is added. Events are kept sorted by timestamp, so a date range
+    is two binary searches, and hash indexes map each event_type, user_id and booking id to the positions of
+    its events. A query starts from the most selective index and only looks at the events inside the range.
+    """
+    def __init__(self, events: Iterable[Dict] = ()):
+        self._lock = threading.RLock()
+        self._timestamps: List[datetime.datetime] = []
+        self._events: List[Dict] = []
+        self._by_event_type: Dict[str, List[int]] = {}
+        self._by_user_id: Dict[object, List[int]] = {}
+        self._by_booking_id: Dict[str, List[int]] = {}
+        self.add_many(events)
+
+    def __len__(self):
+        return len(self._events)
+
+    @staticmethod
+    def _booking_ids(event: Dict) -> List[str]:
+        """Booking events store the ids of every seat's booking, other events a single id."""
+        booking_id = event.get("booking_id")
+        if isinstance(booking_id, list):
+            return list(dict.fromkeys(booking_id))
+        return [booking_id] if booking_id is not None else []
+
+    def _index(self, position: int, event: Dict):
+        self._by_event_type.setdefault(event.get("event_type"), []).append(position)
+        self._by_user_id.setdefault(event.get("user_id"), []).append(position)
+        for booking_id in self._booking_ids(event):
+            self._by_booking_id.setdefault(booking_id, []).append(position)
+
+    def _rebuild(self):
+        self._by_event_type, self._by_user_id, self._by_booking_id = {}, {}, {}
+        for position, event in enumerate(self._events):
+            self._index(position, event)
+
+    def add_many(self, events: Iterable[Dict]) -> None:
+        """Adds events. Events arriving in timestamp order are appended, anything older forces one re-sort."""
+        with self._lock:
+            out_of_order = False
+            for event in events:
+                timestamp = datetime.datetime.fromisoformat(event["timestamp"])
+                if self._timestamps and timestamp < self._timestamps[-1]:
+                    position = bisect_right(self._timestamps, timestamp)
+                    self._timestamps.insert(position, timestamp)
+                    self._events.insert(position, event)
+                    out_of_order = True
+                else:
+                    self._timestamps.append(timestamp)
+                    self._events.append(event)
+                    if not out_of_order:
+                        self._index(len(self._events) - 1, event)
+            if out_of_order:
+                self._rebuild()
+
+    def add(self, event: Dict) -> None:
+        self.add_many([event])
+
+    def _candidates(self, booking_id, event_type, user_id, lo: int, hi: int) -> Iterable[int]:
+        """The positions in [lo, hi) of the smallest matching index, or the whole range without filters."""
+        postings = []
+        if booking_id is not None:
+            key = booking_id[0] if isinstance(booking_id, list) and booking_id else booking_id
+            postings.append(self._by_booking_id.get(key, []))
+        if event_type is not None:
+            postings.append(self._by_event_type.get(event_type, []))
+        if user_id is not None:
+            postings.append(self._by_user_id.get(user_id, []))
+        if not postings:
+            return range(lo, hi)
+        smallest = min(postings, key=len)
+        return smallest[bisect_left(smallest, lo):bisect_left(smallest, hi)]
+
+    @staticmethod
+    def _matches(event: Dict, booking_id, event_type, user_id) -> bool:
+        if event_type is not None and event.get("event_type") != event_type:
+            return False
+        if user_id is not None and event.get("user_id") != user_id:
+            return False
+        if booking_id is not None:
+            if isinstance(booking_id, list):
+                return event.get("booking_id") == booking_id
+            return booking_id in EventIndex._booking_ids(event)
+        return True
+
+    def query(self, booking_id=None, event_type=None, user_id=None, start_date: datetime.datetime = None,
+              end_date: datetime.datetime = None, offset: int = 0, limit: int = None) -> Iterator[Dict]:
+        """
+        Yields the matching events, oldest first. Both date bounds are inclusive.
+        A booking_id string matches every event that involves that booking, a list matches the exact list.
+        """
+        with self._lock:
+            lo = bisect_left(self._timestamps, start_date) if start_date else 0
+            hi = bisect_right(self._timestamps, end_date) if end_date else len(self._timestamps)
+            candidates = [self._events[position] for position in self._candidates(booking_id, event_type, user_id, lo, hi)]
+        skipped = returned = 0
+        for event in candidates:
+            if not self._matches(event, booking_id, event_type, user_id):
+                continue
+            if skipped < offset:
+                skipped += 1
+                continue
+            if limit is not None and returned >= limit:
+                return
+            returned += 1
+            yield event
+
+    def count(self, **filters) -> int:
+        return sum(1 for _ in self.query(**filters))
+
+    def count_by(self, key: Callable[[Dict], object], **filters) -> Dict:
+        """Counts the matching events per key(event), sorted by key with None last."""
+        counts = Counter(key(event) for event in self.query(**filters))
+        return dict(sorted(counts.items(), key=lambda item: (item[0] is None, item[0])))
+
+    def iter_pages(self, page_size: int = DEFAULT_PAGE_SIZE, **filters) -> Iterator[List[Dict]]:
+        """Yields the matching events in pages of page_size, oldest first."""
+        page = []
+        for event in self.query(**filters):
+            page.append(event)
+            if len(page) == page_size:
+                yield page
+                page = []
+        if page:
+            yield page
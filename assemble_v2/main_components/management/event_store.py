@@ -0,0 +1,440 @@
+import atexit
+from abc import ABC, abstractmethod
+import datetime
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from main_components.management.event_index import EventIndex
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_MAX_BYTES = 4 * 1024 * 1024  # A new segment is started once the current one reaches this size.
+FSYNC_INTERVAL_SECONDS = 1.0  # At most this much acknowledged data can be lost if the machine goes down.
+SEGMENT_PREFIX = "events-"
+SEGMENT_SUFFIX = ".jsonl"
+
+
+def _matches(event: Dict, event_type: str = None, start_date: datetime.datetime = None, end_date: datetime.datetime = None) -> bool:
+    if event_type and event.get("event_type") != event_type:
+        return False
+    if start_date or end_date:
+        timestamp = datetime.datetime.fromisoformat(event["timestamp"])
+        if (start_date and timestamp < start_date) or (end_date and timestamp > end_date):
+            return False
+    return True
+
+
+class EventStore(ABC):
+    """
+    The interface BookingEventsManager writes and reads events through.
+
+    Every store keeps an EventIndex over its log for get_events, brought up to date with read_since by index().
+    """
+    def __init__(self):
+        self._index = EventIndex()
+        self._index_position = None  # Where the index stopped reading the log.
+        self._index_lock = threading.Lock()
+
+    @abstractmethod
+    def append_many(self, events: Iterable[Dict]) -> None:
+        """Appends events in order."""
+
+    def append(self, event: Dict) -> None:
+        """Appends one event."""
+        self.append_many([event])
+
+    @abstractmethod
+    def iter_events(self) -> Iterator[Dict]:
+        """Streams all events, oldest first."""
+
+    @abstractmethod
+    def read_since(self, position=None) -> Tuple[List[Dict], object]:
+        """Returns the events after a position, and the position to read from next."""
+
+    @abstractmethod
+    def read_page(self, position=None, limit: int = 100, event_type: str = None, start_date: datetime.datetime = None,
+                  end_date: datetime.datetime = None) -> Tuple[List[Dict], object]:
+        """Returns up to limit matching events after a position, and the position to read the next page from."""
+
+    @abstractmethod
+    def count_by_hour(self, event_type: str = None, start_date: datetime.datetime = None, end_date: datetime.datetime = None) -> Dict[str, int]:
+        """Events per hour, keyed by "YYYY-MM-DD HH:00"."""
+
+    @abstractmethod
+    def count_by_user(self, event_type: str = None, start_date: datetime.datetime = None, end_date: datetime.datetime = None) -> Dict[int, int]:
+        """Events per staff user."""
+
+    @abstractmethod
+    def count_by_screening(self, event_type: str = None, start_date: datetime.datetime = None, end_date: datetime.datetime = None) -> Dict[int, int]:
+        """Events per screening, for events that record one."""
+
+    @abstractmethod
+    def count_by_event_type(self, event_type: str = None, start_date: datetime.datetime = None, end_date: datetime.datetime = None) -> Dict[str, int]:
+        """Events per event type."""
+
+    def index(self) -> EventIndex:
+        """Adds the events appended since the last call, including other processes' events, to the index and returns it."""
+        with self._index_lock:
+            events, self._index_position = self.read_since(self._index_position)
+            self._index.add_many(events)
+        return self._index
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def migrate_json_array(self, json_path: str) -> int:
+        """
+        Copies the events of a legacy JSON array file into the store and renames the file to <name>.migrated,
+        so the migration runs once.
+
+        Returns:
+            int: The number of events migrated.
+        """
+        if not os.path.exists(json_path):
+            return 0
+        try:
+            with open(json_path, "r", encoding="utf-8") as f:
+                events = json.load(f)
+        except json.JSONDecodeError as e:
+            logger.error(f"Could not migrate {json_path}, the file is not valid JSON: {e}")
+            return 0
+        if not isinstance(events, list):
+            logger.error(f"Could not migrate {json_path}, expected a list of events.")
+            return 0
+        self.append_many(events)
+        self.flush()
+        os.replace(json_path, json_path + ".migrated")
+        logger.info(f"Migrated {len(events)} events from {json_path} to {self}.")
+        return len(events)
+
+
+class JsonlEventStore(EventStore):
+    """
+    An append-only event log stored as numbered JSON Lines segments in a directory.
+
+    Each event is one line, so appending costs the size of the event rather than the size of the log,
+    and a crash can at worst leave one truncated line at the end of the last segment, which readers skip.
+    """
+    def __init__(self, directory: str, segment_max_bytes: int = SEGMENT_MAX_BYTES, fsync_interval_seconds: float = FSYNC_INTERVAL_SECONDS):
+        super().__init__()
+        self.directory = directory
+        self.segment_max_bytes = segment_max_bytes
+        self.fsync_interval_seconds = fsync_interval_seconds
+        self._lock = threading.RLock()
+        self._file = None
+        self._segment_number = None
+        self._last_sync = time.monotonic()
+        os.makedirs(directory, exist_ok=True)
+
+    def segment_paths(self) -> List[str]:
+        """The segment files, oldest first."""
+        names = [name for name in os.listdir(self.directory) if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)]
+        return [os.path.join(self.directory, name) for name in sorted(names)]
+
+    def _segment_path(self, number: int) -> str:
+        return os.path.join(self.directory, f"{SEGMENT_PREFIX}{number:06d}{SEGMENT_SUFFIX}")
+
+    def _open_writer(self):
+        segments = self.segment_paths()
+        if segments:
+            last = segments[-1]
+            self._segment_number = int(os.path.basename(last)[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+            if os.path.getsize(last) >= self.segment_max_bytes:
+                self._segment_number += 1
+        else:
+            self._segment_number = 1
+        path = self._segment_path(self._segment_number)
+        self._file = open(path, "a", encoding="utf-8")
+        if self._file.tell() > 0 and not self._ends_with_newline(path):
+            self._file.write("\n")  # Terminates a line truncated by a crash so the next event starts cleanly.
+
+    @staticmethod
+    def _ends_with_newline(path: str) -> bool:
+        with open(path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def _rotate(self):
+        self._sync()
+        self._file.close()
+        self._segment_number += 1
+        self._file = open(self._segment_path(self._segment_number), "a", encoding="utf-8")
+
+    def append_many(self, events: Iterable[Dict]) -> None:
+        """Appends events in order. The writes are buffered and synced to disk at most every fsync interval."""
+        with self._lock:
+            if self._file is None:
+                self._open_writer()
+            for event in events:
+                line = json.dumps(event, default=str) + "\n"
+                if self._file.tell() > 0 and self._file.tell() + len(line.encode("utf-8")) > self.segment_max_bytes:
+                    self._rotate()
+                self._file.write(line)
+            if time.monotonic() - self._last_sync >= self.fsync_interval_seconds:
+                self._sync()
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._last_sync = time.monotonic()
+
+    def flush(self) -> None:
+        """Writes buffered events to disk and syncs them."""
+        with self._lock:
+            if self._file is not None:
+                self._sync()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._sync()
+                self._file.close()
+                self._file = None
+
+    def iter_events(self) -> Iterator[Dict]:
+        """
+        Streams every event, oldest first. Segments are opened one at a time as the iterator reaches them,
+        so memory use does not grow with the size of the log.
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()  # Makes this process's buffered events visible to the reader.
+            segments = self.segment_paths()
+        for path in segments:
+            with open(path, "r", encoding="utf-8") as f:
+                for line_number, line in enumerate(f, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        logger.warning(f"Skipping unreadable event on line {line_number} of {path}.")
+
+    def _iter_from(self, position: Optional[Tuple[str, int]]) -> Iterator[Tuple[Optional[Dict], Tuple[str, int]]]:
+        """
+        Yields (event, position after the event) from a position onwards. Unreadable lines yield None so that
+        callers still advance past them. A line still being written by another process is not read.
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+            segments = self.segment_paths()
+        segment_name, offset = position or ("", 0)
+        for path in segments:
+            name = os.path.basename(path)
+            if name < segment_name:
+                continue
+            start = offset if name == segment_name else 0
+            with open(path, "rb") as f:
+                f.seek(start)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    start += len(line)
+                    if not line.strip():
+                        continue
+                    try:
+                        yield json.loads(line), (name, start)
+                    except json.JSONDecodeError:
+                        logger.warning(f"Skipping unreadable event at byte {start - len(line)} of {path}.")
+                        yield None, (name, start)
+
+    def read_since(self, position: Optional[Tuple[str, int]] = None) -> Tuple[List[Dict], Tuple[str, int]]:
+        """
+        Reads the events appended after a position returned by a previous call, for readers that follow the log.
+
+        Args:
+            position: (segment file name, byte offset), or None to read from the start.
+        Returns:
+            Tuple[List[Dict], Tuple[str, int]]: The new events and the position to continue from.
+        """
+        events = []
+        for event, next_position in self._iter_from(position):
+            position = next_position
+            if event is not None:
+                events.append(event)
+        return events, position
+
+    def read_page(self, position: Optional[Tuple[str, int]] = None, limit: int = 100, event_type: str = None,
+                  start_date: datetime.datetime = None, end_date: datetime.datetime = None) -> Tuple[List[Dict], Optional[Tuple[str, int]]]:
+        """
+        Reads up to limit matching events from a position, holding only that page in memory.
+
+        Returns:
+            Tuple[List[Dict], Optional[Tuple[str, int]]]: The page and the position of the next page, None at the end of the log.
+        """
+        events = []
+        for event, next_position in self._iter_from(position):
+            if event is not None and _matches(event, event_type, start_date, end_date):
+                events.append(event)
+                if len(events) == limit:
+                    return events, next_position
+        return events, None
+
+    def _count_by(self, key: Callable[[Dict], object], event_type: str = None, start_date: datetime.datetime = None,
+                  end_date: datetime.datetime = None) -> Dict:
+        return self.index().count_by(key, event_type=event_type, start_date=start_date, end_date=end_date)
+
+    def count_by_hour(self, event_type: str = None, start_date: datetime.datetime = None, end_date: datetime.datetime = None) -> Dict[str, int]:
+        """Events per hour, keyed by "YYYY-MM-DD HH:00"."""
+        return self._count_by(lambda event: event["timestamp"][:13].replace("T", " ") + ":00", event_type, start_date, end_date)
+
+    def count_by_user(self, event_type: str = None, start_date: datetime.datetime = None, end_date: datetime.datetime = None) -> Dict[int, int]:
+        """Events per staff user."""
+        return self._count_by(lambda event: event.get("user_id"), event_type, start_date, end_date)
+
+    def count_by_screening(self, event_type: str = None, start_date: datetime.datetime = None, end_date: datetime.datetime = None) -> Dict[int, int]:
+        """Events per screening, for events that record one."""
+        counts = self._count_by(lambda event: (event.get("event_data") or {}).get("screening_id"), event_type, start_date, end_date)
+        counts.pop(None, None)  # Events that are not about a screening.
+        return counts
+
+    def count_by_event_type(self, event_type: str = None, start_date: datetime.datetime = None, end_date: datetime.datetime = None) -> Dict[str, int]:
+        """Events per event type."""
+        return self._count_by(lambda event: event.get("event_type"), event_type, start_date, end_date)
+
+    def __repr__(self):
+        return f"<JsonlEventStore(directory={self.directory})>"
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_event_store(directory: str) -> JsonlEventStore:
+    """Returns the process-wide store for a directory, so every manager appends through the same writer."""
+    key = os.path.abspath(directory)
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = JsonlEventStore(directory)
+        return _stores[key]
+
+
+EVENT_QUEUE_SIZE = 10000  # Events waiting for the writer thread before log_event starts to block.
+WRITER_BATCH_SIZE = 256
+WRITER_BATCH_WAIT_SECONDS = 0.2  # How long the writer waits to fill a batch once it has one event.
+ENQUEUE_TIMEOUT_SECONDS = 1.0  # How long a full queue can block the caller before the event is dropped.
+
+
+class AsyncEventWriter:
+    """
+    Writes events to a store on a background thread, so callers on the Tk event loop never wait for the disk.
+
+    Events go through a bounded queue. When the disk falls behind and the queue fills up, submit blocks the
+    caller for up to ENQUEUE_TIMEOUT_SECONDS and then drops the event; both are counted in metrics().
+    Queued events are written when the process exits.
+    """
+    _STOP = object()
+
+    def __init__(self, store: EventStore, queue_size: int = EVENT_QUEUE_SIZE, batch_size: int = WRITER_BATCH_SIZE,
+                 batch_wait_seconds: float = WRITER_BATCH_WAIT_SECONDS, enqueue_timeout_seconds: float = ENQUEUE_TIMEOUT_SECONDS):
+        self.store = store
+        self.batch_size = batch_size
+        self.batch_wait_seconds = batch_wait_seconds
+        self.enqueue_timeout_seconds = enqueue_timeout_seconds
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._metrics_lock = threading.Lock()
+        self._metrics = {"submitted": 0, "written": 0, "dropped": 0, "blocked": 0, "blocked_seconds": 0.0,
+                         "max_queue_depth": 0, "batches": 0, "write_errors": 0}
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="event-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, event: Dict) -> bool:
+        """Queues an event for writing. Returns False if the event was dropped because the queue stayed full."""
+        if self._closed:
+            self.store.append(event)  # Late events after shutdown are written directly.
+            return True
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            started = time.monotonic()
+            try:
+                self._queue.put(event, timeout=self.enqueue_timeout_seconds)
+            except queue.Full:
+                self._record(dropped=1, blocked=1, blocked_seconds=time.monotonic() - started)
+                logger.error("Event queue is full, dropping a booking event.")
+                return False
+            self._record(blocked=1, blocked_seconds=time.monotonic() - started)
+        with self._metrics_lock:
+            self._metrics["submitted"] += 1
+            self._metrics["max_queue_depth"] = max(self._metrics["max_queue_depth"], self._queue.qsize())
+        return True
+
+    def _record(self, **increments):
+        with self._metrics_lock:
+            for name, value in increments.items():
+                self._metrics[name] += value
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            batch, stop = [], False
+            deadline = time.monotonic() + self.batch_wait_seconds
+            while True:
+                if item is self._STOP:
+                    stop = True
+                else:
+                    batch.append(item)
+                if stop or len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+            self._write(batch)
+            for _ in range(len(batch) + stop):
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, batch: List[Dict]):
+        if not batch:
+            return
+        try:
+            self.store.append_many(batch)
+            self._record(written=len(batch), batches=1)
+        except Exception as e:
+            self._record(write_errors=1)
+            logger.error(f"Failed to write {len(batch)} booking events: {e}")
+
+    def flush(self) -> None:
+        """Waits until every queued event has been written and synced."""
+        if not self._closed:
+            self._queue.join()
+        self.store.flush()
+
+    def close(self) -> None:
+        """Writes the remaining events and stops the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(self._STOP)
+        self._thread.join()
+        self.store.flush()
+        atexit.unregister(self.close)
+
+    def metrics(self) -> Dict:
+        """Counters describing the writer's throughput and back-pressure, plus the current queue depth."""
+        with self._metrics_lock:
+            return dict(self._metrics, queue_depth=self._queue.qsize())
+
+
+_writers = {}
+
+
+def get_event_writer(store: EventStore) -> AsyncEventWriter:
+    """Returns the process-wide background writer of a store."""
+    with _stores_lock:
+        writer = _writers.get(id(store))
+        if writer is None or writer._closed or writer.store is not store:
+            writer = _writers[id(store)] = AsyncEventWriter(store)
+        return writer
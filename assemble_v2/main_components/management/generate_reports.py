@@ -1,7 +1,10 @@
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, messagebox
+import datetime
 import json
 import os
+from main_components.models import Cinema, City, Film
+from main_components.services.reporting_service import ReportingService
 
 def display_json_report(filepath):
     """Displays the top-level content of a JSON file in a Tkinter Treeview with separators."""
@@ -39,6 +42,187 @@ def display_json_report(filepath):
         tk.messagebox.showerror("Error", f"An error occurred: {e}")
 
 
+EVENT_TYPES = ["All", "booking", "cancellation"]
+REPORT_PAGE_SIZE = 100
+
+
+class EventLogViewer(tk.Toplevel):
+    """
+    Shows the booking event log one page at a time. Pages are read from the event store on demand and the
+    date and event type filters are applied by the store, so only the visible page is ever held in memory.
+    """
+    def __init__(self, events_manager, page_size=REPORT_PAGE_SIZE, title="Events Log"):
+        super().__init__()
+        self.title(title)
+        self.events_manager = events_manager
+        self.page_size = page_size
+        self.page_starts = [None]  # Store positions of the pages visited so far, for Previous.
+        self.next_position = None
+        self.filters = {}
+        self.setup_ui()
+        self.apply_filters()
+
+    def setup_ui(self):
+        filter_frame = ttk.Frame(self)
+        filter_frame.pack(fill=tk.X, padx=10, pady=5)
+        ttk.Label(filter_frame, text="From (YYYY-MM-DD):").pack(side=tk.LEFT)
+        self.start_entry = ttk.Entry(filter_frame, width=12)
+        self.start_entry.pack(side=tk.LEFT, padx=5)
+        ttk.Label(filter_frame, text="To (YYYY-MM-DD):").pack(side=tk.LEFT)
+        self.end_entry = ttk.Entry(filter_frame, width=12)
+        self.end_entry.pack(side=tk.LEFT, padx=5)
+        ttk.Label(filter_frame, text="Event Type:").pack(side=tk.LEFT)
+        self.event_type_combo = ttk.Combobox(filter_frame, values=EVENT_TYPES, state="readonly", width=14)
+        self.event_type_combo.set("All")
+        self.event_type_combo.pack(side=tk.LEFT, padx=5)
+        ttk.Button(filter_frame, text="Filter", command=self.apply_filters).pack(side=tk.LEFT, padx=5)
+
+        columns = ("Timestamp", "Event Type", "User ID", "Booking ID", "Details")
+        self.tree = ttk.Treeview(self, columns=columns, show="headings")
+        for column in columns:
+            self.tree.heading(column, text=column)
+        self.tree.column("Details", width=400)
+        self.tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+        nav_frame = ttk.Frame(self)
+        nav_frame.pack(fill=tk.X, padx=10, pady=5)
+        self.prev_button = ttk.Button(nav_frame, text="Previous", command=self.previous_page)
+        self.prev_button.pack(side=tk.LEFT)
+        self.page_label = ttk.Label(nav_frame, text="")
+        self.page_label.pack(side=tk.LEFT, padx=10)
+        self.next_button = ttk.Button(nav_frame, text="Next", command=self.next_page)
+        self.next_button.pack(side=tk.LEFT)
+
+    @staticmethod
+    def parse_date(text, end_of_day=False):
+        if not text.strip():
+            return None
+        date = datetime.datetime.strptime(text.strip(), "%Y-%m-%d")
+        return date + datetime.timedelta(days=1, microseconds=-1) if end_of_day else date
+
+    def apply_filters(self):
+        try:
+            start_date = self.parse_date(self.start_entry.get())
+            end_date = self.parse_date(self.end_entry.get(), end_of_day=True)
+        except ValueError:
+            messagebox.showerror("Error", "Dates must be in YYYY-MM-DD format.")
+            return
+        event_type = self.event_type_combo.get()
+        self.filters = {"event_type": None if event_type == "All" else event_type, "start_date": start_date, "end_date": end_date}
+        self.page_starts = [None]
+        self.load_page()
+
+    def load_page(self):
+        try:
+            events, self.next_position = self.events_manager.read_page(self.page_starts[-1], self.page_size, **self.filters)
+        except Exception as e:
+            messagebox.showerror("Error", f"An error occurred: {e}")
+            return
+        self.tree.delete(*self.tree.get_children())
+        for event in events:
+            booking_id = event.get("booking_id")
+            if isinstance(booking_id, list):
+                booking_id = ", ".join(dict.fromkeys(booking_id))  # A booking lists its id once per seat.
+            self.tree.insert("", tk.END, values=(event.get("timestamp", ""), event.get("event_type", ""), event.get("user_id", ""),
+                                                 booking_id, str(event.get("event_data", ""))))
+        page = len(self.page_starts)
+        self.page_label.config(text=f"Page {page}" + ("" if events else " (no events)"))
+        self.prev_button.config(state=tk.NORMAL if page > 1 else tk.DISABLED)
+        self.next_button.config(state=tk.NORMAL if self.next_position is not None else tk.DISABLED)
+
+    def next_page(self):
+        if self.next_position is not None:
+            self.page_starts.append(self.next_position)
+            self.load_page()
+
+    def previous_page(self):
+        if len(self.page_starts) > 1:
+            self.page_starts.pop()
+            self.load_page()
+
+
+def display_events_report(events_manager, title="Events Log"):
+    """Opens the paginated viewer for a BookingEventsManager's log."""
+    return EventLogViewer(events_manager, title=title)
+
+
+SALES_GROUP_LABELS = {"Cinema": "cinema", "City": "city", "Film": "film", "Screening": "screening", "Day": "day"}
+
+
+class SalesReportViewer(tk.Toplevel):
+    """
+    Shows tickets sold and revenue grouped by cinema, city, film, screening or day for a range of sale dates.
+    Figures are read from the sales rollups, so a report costs one indexed GROUP BY over a small table.
+    """
+    def __init__(self, session, cinema_id=None, title="Sales Report"):
+        super().__init__()
+        self.title(title)
+        self.reporting_service = ReportingService(session)
+        self.session = session
+        self.cinema_id = cinema_id
+        self.setup_ui()
+        self.load_report()
+
+    def setup_ui(self):
+        filter_frame = ttk.Frame(self)
+        filter_frame.pack(fill=tk.X, padx=10, pady=5)
+        ttk.Label(filter_frame, text="Group By:").pack(side=tk.LEFT)
+        self.group_combo = ttk.Combobox(filter_frame, values=list(SALES_GROUP_LABELS), state="readonly", width=12)
+        self.group_combo.set("Cinema")
+        self.group_combo.pack(side=tk.LEFT, padx=5)
+        today = datetime.date.today()
+        ttk.Label(filter_frame, text="From (YYYY-MM-DD):").pack(side=tk.LEFT)
+        self.start_entry = ttk.Entry(filter_frame, width=12)
+        self.start_entry.insert(0, (today - datetime.timedelta(days=30)).isoformat())
+        self.start_entry.pack(side=tk.LEFT, padx=5)
+        ttk.Label(filter_frame, text="To (YYYY-MM-DD):").pack(side=tk.LEFT)
+        self.end_entry = ttk.Entry(filter_frame, width=12)
+        self.end_entry.insert(0, today.isoformat())
+        self.end_entry.pack(side=tk.LEFT, padx=5)
+        ttk.Button(filter_frame, text="Show", command=self.load_report).pack(side=tk.LEFT, padx=5)
+
+        columns = ("Group", "Tickets Sold", "Revenue")
+        self.tree = ttk.Treeview(self, columns=columns, show="headings")
+        for column in columns:
+            self.tree.heading(column, text=column)
+        self.tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        self.total_label = ttk.Label(self, text="")
+        self.total_label.pack(pady=5)
+
+    def label_for(self, group_by, keys):
+        """Names of the grouped cinemas, cities or films, looked up in one query."""
+        models = {"cinema": (Cinema, Cinema.cinema_id, Cinema.name), "city": (City, City.city_id, City.name), "film": (Film, Film.film_id, Film.name)}
+        if group_by not in models or not keys:
+            return {key: str(key) for key in keys}
+        _, id_column, name_column = models[group_by]
+        names = dict(self.session.query(id_column, name_column).filter(id_column.in_(keys)).all())
+        return {key: f"{names.get(key, 'Unknown')} ({key})" for key in keys}
+
+    def load_report(self):
+        try:
+            start_date = datetime.date.fromisoformat(self.start_entry.get().strip()) if self.start_entry.get().strip() else None
+            end_date = datetime.date.fromisoformat(self.end_entry.get().strip()) if self.end_entry.get().strip() else None
+        except ValueError:
+            messagebox.showerror("Error", "Dates must be in YYYY-MM-DD format.")
+            return
+        group_by = SALES_GROUP_LABELS[self.group_combo.get()]
+        try:
+            rows = self.reporting_service.get_sales(group_by, start_date, end_date, cinema_id=self.cinema_id)
+            labels = self.label_for(group_by, [row["key"] for row in rows])
+        except Exception as e:
+            messagebox.showerror("Error", f"An error occurred: {e}")
+            return
+        self.tree.delete(*self.tree.get_children())
+        for row in rows:
+            self.tree.insert("", tk.END, values=(labels[row["key"]], row["tickets_sold"], f"{row['revenue']:.2f}"))
+        self.total_label.config(text=f"Total: {sum(row['tickets_sold'] for row in rows)} tickets, {sum(row['revenue'] for row in rows):.2f} revenue")
+
+
+def display_sales_report(session, cinema_id=None):
+    """Opens the sales report viewer."""
+    return SalesReportViewer(session, cinema_id=cinema_id)
+
+
 if __name__ == "__main__":
     root = tk.Tk()
     root.withdraw() #hide the root window.
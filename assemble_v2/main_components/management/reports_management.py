@@ -1,6 +1,8 @@
 import tkinter as tk
 from tkinter import ttk
-from main_components.management.generate_reports import display_json_report  
+from main_components.management.generate_reports import display_events_report, display_sales_report
+from main_components.management.booking_events_manager import BookingEventsManager
+from database.database_settings import SessionLocal
 
 class ReportsManagement(tk.Frame):
     def __init__(self, parent, callback=None):
@@ -12,10 +14,14 @@ class ReportsManagement(tk.Frame):
         ttk.Label(self, text="Reports Management", font=("Arial", 20)).pack(pady=20)
 
         ttk.Button(self, text="View Events Log", command=self.view_events_log).pack(pady=10)
+        ttk.Button(self, text="View Sales Report", command=self.view_sales_report).pack(pady=10)
         ttk.Button(self, text="Back", command=self.go_back).pack(pady=10)
 
     def view_events_log(self):
-        display_json_report("booking_events.json")  # Display the events log
+        display_events_report(BookingEventsManager())  # Display the events log
+
+    def view_sales_report(self):
+        display_sales_report(SessionLocal())  # Tickets sold and revenue from the sales rollups
 
     def go_back(self):
         if self.callback:
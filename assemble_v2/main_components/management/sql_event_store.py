@@ -0,0 +1,164 @@
+import datetime
+import json
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from sqlalchemy import func, insert
+from main_components.models import BookingEvent
+from main_components.management.event_store import EventStore
+
+READ_BATCH_SIZE = 1000  # Rows fetched per round trip when streaming the log.
+# read_since re-reads this many ids below the last one it returned. With several processes writing, an event
+# can commit after events with higher AUTO_INCREMENT ids were read, and is picked up from the window.
+LATE_COMMIT_WINDOW = 500
+
+
+class SqlEventStore(EventStore):
+    """
+    Keeps the booking event log in the booking_events table, so every staff terminal shares one log.
+    Aggregates are computed by the database and only the grouped counts are loaded.
+    """
+    def __init__(self, session_factory):
+        super().__init__()
+        self.session_factory = session_factory
+
+    @staticmethod
+    def _row(event: Dict) -> Dict:
+        event_data = event.get("event_data")
+        screening_id = event_data.get("screening_id") if isinstance(event_data, dict) else None
+        timestamp = event.get("timestamp")
+        return {
+            "event_type": event["event_type"],
+            "user_id": event.get("user_id"),
+            "screening_id": int(screening_id) if screening_id not in (None, "") else None,
+            "booking_id": json.dumps(event.get("booking_id")),
+            "event_data": json.dumps(event_data, default=str),
+            "timestamp": datetime.datetime.fromisoformat(timestamp) if isinstance(timestamp, str) else (timestamp or datetime.datetime.now())
+        }
+
+    def append_many(self, events: Iterable[Dict]) -> None:
+        """Inserts the events with one multi-row INSERT."""
+        rows = [self._row(event) for event in events]
+        if not rows:
+            return
+        session = self.session_factory()
+        try:
+            session.execute(insert(BookingEvent).execution_options(render_nulls=True), rows)  # Keeps rows with NULLs in the same batch.
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def iter_events(self) -> Iterator[Dict]:
+        """Streams every event, oldest first, in batches by primary key."""
+        last_id = None
+        while True:
+            rows = self._read_rows(last_id, READ_BATCH_SIZE)
+            yield from (row.to_dict() for row in rows)
+            if len(rows) < READ_BATCH_SIZE:
+                return
+            last_id = rows[-1].event_id
+
+    def _read_rows(self, after_id: Optional[int], limit: int = None) -> List[BookingEvent]:
+        session = self.session_factory()
+        try:
+            query = session.query(BookingEvent).order_by(BookingEvent.event_id)
+            if after_id is not None:
+                query = query.filter(BookingEvent.event_id > after_id)
+            if limit is not None:
+                query = query.limit(limit)
+            return query.all()
+        finally:
+            session.close()
+
+    def read_since(self, position: Optional[Tuple[int, Tuple[int, ...]]] = None, limit: int = None) -> Tuple[List[Dict], Tuple[int, Tuple[int, ...]]]:
+        """
+        Reads the events committed since a position returned by a previous call.
+
+        The ids of the last LATE_COMMIT_WINDOW ids read are kept in the position, and that window is read again on
+        the next call: an event whose lower id committed after higher ids were read is returned then, and the
+        events already returned are skipped.
+
+        Args:
+            position: (last event_id read, ids read in the window below it), or None to read from the start.
+            limit: The maximum number of events to return.
+        Returns:
+            Tuple[List[Dict], Tuple[int, Tuple[int, ...]]]: The new events and the position to continue from.
+        """
+        last_id, seen = position or (None, ())
+        seen = set(seen)
+        after_id = last_id - LATE_COMMIT_WINDOW if last_id is not None else None
+        rows = self._read_rows(after_id, limit + len(seen) if limit is not None else None)
+        rows = [row for row in rows if row.event_id not in seen][:limit]
+        if rows:
+            last_id = max([row.event_id for row in rows] + ([last_id] if last_id is not None else []))
+            seen.update(row.event_id for row in rows)
+        window = tuple(sorted(event_id for event_id in seen if event_id > last_id - LATE_COMMIT_WINDOW)) if last_id is not None else ()
+        return [row.to_dict() for row in rows], (last_id, window)
+
+    def _filter(self, query, event_type: str = None, start_date: datetime.datetime = None, end_date: datetime.datetime = None):
+        if event_type:
+            query = query.filter(BookingEvent.event_type == event_type)
+        if start_date:
+            query = query.filter(BookingEvent.timestamp >= start_date)
+        if end_date:
+            query = query.filter(BookingEvent.timestamp <= end_date)
+        return query
+
+    def read_page(self, position: Optional[int] = None, limit: int = 100, event_type: str = None, start_date: datetime.datetime = None,
+                  end_date: datetime.datetime = None) -> Tuple[List[Dict], Optional[int]]:
+        """
+        Reads up to limit matching events after a position, filtered and limited in the database.
+
+        Returns:
+            Tuple[List[Dict], Optional[int]]: The page and the position of the next page, None at the end of the log.
+        """
+        session = self.session_factory()
+        try:
+            query = self._filter(session.query(BookingEvent), event_type, start_date, end_date)
+            if position is not None:
+                query = query.filter(BookingEvent.event_id > position)
+            rows = query.order_by(BookingEvent.event_id).limit(limit).all()
+            return [row.to_dict() for row in rows], (rows[-1].event_id if len(rows) == limit else None)
+        finally:
+            session.close()
+
+    def _count_by(self, column, event_type: str = None, start_date: datetime.datetime = None, end_date: datetime.datetime = None) -> Dict:
+        session = self.session_factory()
+        try:
+            query = self._filter(session.query(column, func.count(BookingEvent.event_id)), event_type, start_date, end_date)
+            query = query.group_by(column).order_by(column)
+            return {key: count for key, count in query.all()}
+        finally:
+            session.close()
+
+    def _hour_bucket(self, session):
+        if session.get_bind().dialect.name == "sqlite":
+            return func.strftime("%Y-%m-%d %H:00", BookingEvent.timestamp)
+        return func.date_format(BookingEvent.timestamp, "%Y-%m-%d %H:00")
+
+    def count_by_hour(self, event_type: str = None, start_date: datetime.datetime = None, end_date: datetime.datetime = None) -> Dict[str, int]:
+        """Events per hour, keyed by "YYYY-MM-DD HH:00"."""
+        session = self.session_factory()
+        try:
+            bucket = self._hour_bucket(session)
+        finally:
+            session.close()
+        return self._count_by(bucket, event_type, start_date, end_date)
+
+    def count_by_user(self, event_type: str = None, start_date: datetime.datetime = None, end_date: datetime.datetime = None) -> Dict[int, int]:
+        """Events per staff user."""
+        return self._count_by(BookingEvent.user_id, event_type, start_date, end_date)
+
+    def count_by_screening(self, event_type: str = None, start_date: datetime.datetime = None, end_date: datetime.datetime = None) -> Dict[int, int]:
+        """Events per screening, for events that record one."""
+        counts = self._count_by(BookingEvent.screening_id, event_type, start_date, end_date)
+        counts.pop(None, None)
+        return counts
+
+    def count_by_event_type(self, event_type: str = None, start_date: datetime.datetime = None, end_date: datetime.datetime = None) -> Dict[str, int]:
+        """Events per event type."""
+        return self._count_by(BookingEvent.event_type, event_type, start_date, end_date)
+
+    def __repr__(self):
+        return "<SqlEventStore(table=booking_events)>"
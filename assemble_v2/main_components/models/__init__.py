@@ -27,6 +27,11 @@ from .seat import Seat
 from .ticket import Ticket
 from .user import User
 from .seat_availability import SeatAvailability
+from .seat_hold import SeatHold
+from .booking_event import BookingEvent
+from .sales_rollup import SalesRollup
+from .training_snapshot import TrainingSnapshot
+from .training_checkpoint import TrainingCheckpoint
 
 # How "from .user import User" works? : a file "user.py" is a module named "user", a package is a folder that contains these modules and it becomes a package when an __init__.py is made.
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey,PrimaryKeyConstraint
+from sqlalchemy import Column, String, ForeignKey,PrimaryKeyConstraint, Index
 from sqlalchemy.orm import relationship
 from .import Base
 
@@ -21,6 +21,8 @@ class Booking(Base):
 
     __table_args__ = (
         PrimaryKeyConstraint('booking_id', 'seat_id'), #Composite primary key.
+        Index('ix_bookings_customer_name', 'customer_name'), # Customer lookups in booking management.
+        Index('ix_bookings_customer_email', 'customer_email'),
     )
 
     def __init__(self, booking_id: str, seat_id : str, customer_name:str, customer_email:str = None, customer_phone:str = None):
@@ -0,0 +1,58 @@
+import json
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from . import Base
+from datetime import datetime
+
+class BookingEvent(Base):
+    """
+    Represents one entry of the booking event log, when the log is kept in the database.
+    user_id and screening_id are stored in their own columns so that reports can group by them in SQL.
+    """
+    __tablename__ = 'booking_events'
+
+    event_id = Column(Integer, primary_key=True, autoincrement=True)
+    event_type = Column(String(50), nullable=False)
+    user_id = Column(Integer, nullable=True, index=True) # Not a foreign key, the log outlives deleted users.
+    screening_id = Column(Integer, nullable=True, index=True)
+    booking_id = Column(Text, nullable=True) # JSON, a list of ids for bookings and a single id for cancellations.
+    event_data = Column(Text, nullable=True) # JSON
+    timestamp = Column(DateTime, nullable=False, index=True)
+
+    __table_args__ = (
+        Index('ix_booking_events_type_timestamp', 'event_type', 'timestamp'),
+    )
+
+    def __init__(self, event_type: str, timestamp: datetime, user_id: int = None, screening_id: int = None, booking_id=None, event_data: dict = None):
+        """
+        Initializes a new BookingEvent object with the provided attributes.
+        """
+        self.event_type = event_type
+        self.timestamp = timestamp
+        self.user_id = user_id
+        self.screening_id = screening_id
+        self.booking_id = json.dumps(booking_id)
+        self.event_data = json.dumps(event_data, default=str)
+
+    def get_event_id(self) -> int:
+        return self.event_id
+    def get_event_type(self) -> str:
+        return self.event_type
+    def get_user_id(self) -> int:
+        return self.user_id
+    def get_screening_id(self) -> int:
+        return self.screening_id
+    def get_timestamp(self) -> datetime:
+        return self.timestamp
+
+    def to_dict(self) -> dict:
+        """The event in the format used by BookingEventsManager."""
+        return {
+            "booking_id": json.loads(self.booking_id) if self.booking_id else None,
+            "user_id": self.user_id,
+            "event_type": self.event_type,
+            "event_data": json.loads(self.event_data) if self.event_data else None,
+            "timestamp": self.timestamp.isoformat()
+        }
+
+    def __repr__(self) -> str:
+        return f"<BookingEvent(event_id={self.event_id}, event_type={self.event_type}, user_id={self.user_id}, timestamp={self.timestamp})>"
@@ -0,0 +1,50 @@
+from sqlalchemy import Column, Integer, Float, Date, ForeignKey, Index
+from . import Base
+from datetime import date
+
+class SalesRollup(Base):
+    """
+    Represents the tickets sold and revenue of one screening on one sale date.
+    Film, cinema and city are copied from the screening so that reports can group by them without joins.
+    Rows are kept up to date by the booking and ticket services as tickets are sold and refunded.
+    """
+    __tablename__ = 'sales_rollups'
+
+    sale_date = Column(Date, primary_key=True)
+    screening_id = Column(Integer, ForeignKey('screenings.screening_id', ondelete='CASCADE'), primary_key=True)
+    film_id = Column(Integer, nullable=False)
+    cinema_id = Column(Integer, nullable=False)
+    city_id = Column(Integer, nullable=False)
+    tickets_sold = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0)
+
+    __table_args__ = (
+        Index('ix_sales_rollups_cinema_date', 'cinema_id', 'sale_date'),
+        Index('ix_sales_rollups_city_date', 'city_id', 'sale_date'),
+        Index('ix_sales_rollups_film_date', 'film_id', 'sale_date'),
+        Index('ix_sales_rollups_screening', 'screening_id'),
+    )
+
+    def __init__(self, sale_date: date, screening_id: int, film_id: int, cinema_id: int, city_id: int, tickets_sold: int = 0, revenue: float = 0):
+        """
+        Initializes a new SalesRollup object with the provided attributes.
+        """
+        self.sale_date = sale_date
+        self.screening_id = screening_id
+        self.film_id = film_id
+        self.cinema_id = cinema_id
+        self.city_id = city_id
+        self.tickets_sold = tickets_sold
+        self.revenue = revenue
+
+    def get_sale_date(self) -> date:
+        return self.sale_date
+    def get_screening_id(self) -> int:
+        return self.screening_id
+    def get_tickets_sold(self) -> int:
+        return self.tickets_sold
+    def get_revenue(self) -> float:
+        return self.revenue
+
+    def __repr__(self) -> str:
+        return f"<SalesRollup(sale_date={self.sale_date}, screening_id={self.screening_id}, tickets_sold={self.tickets_sold}, revenue={self.revenue})>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, String,Time, Date
+from sqlalchemy import Column, Integer, ForeignKey, String,Time, Date, Index
 from sqlalchemy.orm import relationship
 from . import Base
 from .screen import Screen
@@ -26,6 +26,11 @@ class Screening(Base):
     film = relationship('Film', back_populates='screenings')
     seat_availability = relationship('SeatAvailability', back_populates='screening', cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index('ix_screenings_cinema_date', 'cinema_id', 'date'), # Screenings of a cinema on a day.
+        Index('ix_screenings_screen_date', 'screen_id', 'cinema_id', 'date'), # Screenings of a screen on a day, for schedule conflict checks.
+    )
+
     def __init__(self, film_id: str, screen_id: str, cinema_id: int, date: datetime, start_time: datetime, screening_availability: int = 1):
         """
         Initializes a new Screening object with the provided attributes.
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, String, Boolean
+from sqlalchemy import Column, Integer, ForeignKey, String, Boolean, Index
 from sqlalchemy.orm import relationship
 from . import Base
 
@@ -19,6 +19,10 @@ class Seat(Base):
     cinema = relationship('Cinema', back_populates='seats')
     seat_availability = relationship('SeatAvailability', back_populates='seat')
 
+    __table_args__ = (
+        Index('ix_seats_cinema_screen', 'cinema_id', 'screen_id'), # Seats of a screen.
+    )
+
     _seat_counters = {}  # Class-level dictionary to store counters
 
     def __init__(self, screen_id: str, cinema_id: int, seat_type: str):
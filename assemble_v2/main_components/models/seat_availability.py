@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, String
+from sqlalchemy import Column, Integer, ForeignKey, String, Index
 from sqlalchemy.orm import relationship
 from . import Base
 
@@ -18,6 +18,10 @@ class SeatAvailability(Base):
     seat = relationship('Seat', back_populates='seat_availability')
     booking = relationship('Booking', back_populates='seat_availability')
 
+    __table_args__ = (
+        Index('ix_seat_availability_booking_id', 'booking_id'), # Seats of a booking, used by cancellations and receipts.
+    )
+
     def __init__ (self, screening_id: int, seat_id: str, booking_id: str, seat_availability: int = 1):
         """
         Initializes a new SeatAvailability object with the provided attributes.
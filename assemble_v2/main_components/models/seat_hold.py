@@ -0,0 +1,43 @@
+from sqlalchemy import Column, Integer, ForeignKey, String, DateTime
+from sqlalchemy.orm import relationship
+from . import Base
+from datetime import datetime
+
+class SeatHold(Base):
+    """
+    Represents a temporary hold on a seat for a screening while a booking is being made.
+    A hold only blocks the seat until expires_at; expired holds are ignored and reaped in the background.
+    """
+    __tablename__ = 'seat_holds'
+
+    screening_id = Column(Integer, ForeignKey('screenings.screening_id', ondelete='CASCADE'), primary_key=True)
+    seat_id = Column(String(255), ForeignKey('seats.seat_id', ondelete='CASCADE'), primary_key=True)
+    hold_id = Column(String(255), nullable=False, index=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+    # Relationships
+    screening = relationship('Screening')
+    seat = relationship('Seat')
+
+    def __init__(self, screening_id: int, seat_id: str, hold_id: str, expires_at: datetime):
+        """
+        Initializes a new SeatHold object with the provided attributes.
+        """
+        self.screening_id = screening_id
+        self.seat_id = seat_id
+        self.hold_id = hold_id
+        self.expires_at = expires_at
+
+    def get_screening_id(self) -> int:
+        return self.screening_id
+    def get_seat_id(self) -> str:
+        return self.seat_id
+    def get_hold_id(self) -> str:
+        return self.hold_id
+    def get_expires_at(self) -> datetime:
+        return self.expires_at
+    def is_expired(self, now: datetime = None) -> bool:
+        return self.expires_at <= (now or datetime.now())
+
+    def __repr__(self) -> str:
+        return f"<SeatHold(screening_id={self.screening_id}, seat_id={self.seat_id}, hold_id={self.hold_id}, expires_at={self.expires_at})>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Float, DateTime, Enum
+from sqlalchemy import Column, Integer, String, ForeignKey, Float, DateTime, Enum, Index
 from sqlalchemy.orm import relationship
 from . import Base
 from main_components.enums import PaymentStatus
@@ -20,6 +20,10 @@ class Ticket(Base):
     booking = relationship('Booking', back_populates='tickets', lazy='select')
     seat = relationship('Seat', back_populates='tickets')
 
+    __table_args__ = (
+        Index('ix_tickets_booking_id', 'booking_id'), # Tickets of a booking.
+    )
+
 
     def __init__(self, booking_id: str, seat_id: str, ticket_price : float, qr_code: str = None,  payment_status: PaymentStatus = PaymentStatus.PENDING):
         self.booking_id = booking_id
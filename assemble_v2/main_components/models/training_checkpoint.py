@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, Date, DateTime
+from . import Base
+from datetime import date, datetime
+
+class TrainingCheckpoint(Base):
+    """
+    Represents how far an incremental job has read: the date and id of the last screening it processed.
+    Screenings are processed in (date, screening_id) order, so the next run starts right after the checkpoint.
+    """
+    __tablename__ = 'training_checkpoints'
+
+    name = Column(String(50), primary_key=True)
+    last_date = Column(Date, nullable=False)
+    last_screening_id = Column(Integer, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+
+    def __init__(self, name: str, last_date: date, last_screening_id: int, updated_at: datetime = None):
+        """
+        Initializes a new TrainingCheckpoint object with the provided attributes.
+        """
+        self.name = name
+        self.last_date = last_date
+        self.last_screening_id = last_screening_id
+        self.updated_at = updated_at or datetime.now()
+
+    def __repr__(self) -> str:
+        return f"<TrainingCheckpoint(name={self.name}, last_date={self.last_date}, last_screening_id={self.last_screening_id})>"
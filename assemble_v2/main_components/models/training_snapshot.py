@@ -0,0 +1,47 @@
+from sqlalchemy import Column, Integer, String, Float, Date, Time, DateTime
+from . import Base
+from datetime import date, datetime, time
+
+class TrainingSnapshot(Base):
+    """
+    Represents the features and the tickets sold of one screening that has been shown, as the demand model is trained on them.
+    Rows are extracted from the screenings and their booked seats by the retraining job and are not foreign keys,
+    so the training history outlives deleted screenings and films.
+    """
+    __tablename__ = 'training_snapshots'
+
+    screening_id = Column(Integer, primary_key=True, autoincrement=False)
+    date = Column(Date, nullable=False, index=True) # Sliding training windows are date ranges.
+    start_time = Column(Time, nullable=False)
+    cinema_id = Column(Integer, nullable=False)
+    screen_id = Column(String(255), nullable=False)
+    film_id = Column(Integer, nullable=False)
+    capacity = Column(Integer, nullable=False)
+    release_date = Column(Date, nullable=False)
+    rating = Column(Float, nullable=False)
+    show_time_category_Evening = Column(Integer, nullable=False)
+    ticket_price = Column(Float, nullable=False)
+    tickets_sold = Column(Integer, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+
+    def __init__(self, screening_id: int, date: date, start_time: time, cinema_id: int, screen_id: str, film_id: int, capacity: int,
+                 release_date: date, rating: float, show_time_category_Evening: int, ticket_price: float, tickets_sold: int, updated_at: datetime = None):
+        """
+        Initializes a new TrainingSnapshot object with the provided attributes.
+        """
+        self.screening_id = screening_id
+        self.date = date
+        self.start_time = start_time
+        self.cinema_id = cinema_id
+        self.screen_id = screen_id
+        self.film_id = film_id
+        self.capacity = capacity
+        self.release_date = release_date
+        self.rating = rating
+        self.show_time_category_Evening = show_time_category_Evening
+        self.ticket_price = ticket_price
+        self.tickets_sold = tickets_sold
+        self.updated_at = updated_at or datetime.now()
+
+    def __repr__(self) -> str:
+        return f"<TrainingSnapshot(screening_id={self.screening_id}, date={self.date}, tickets_sold={self.tickets_sold})>"
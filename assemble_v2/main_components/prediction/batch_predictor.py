@@ -0,0 +1,27 @@
+from typing import Dict, List
+import numpy as np
+import pandas as pd
+from main_components.prediction.feature_pipeline import FeaturePipeline, MODEL_COLUMNS, NUMERICAL_COLUMNS
+
+
+def model_input(model, pipeline: FeaturePipeline, matrix: np.ndarray):
+    """The matrix as the model expects it: wrapped with column names if the model was fitted on a DataFrame."""
+    if getattr(model, 'feature_names_in_', None) is not None:
+        return pd.DataFrame(matrix, columns=pipeline.model_columns, copy=False)
+    return matrix
+
+
+def predict_batch(model, pipeline: FeaturePipeline, rows: List[Dict]) -> np.ndarray:
+    """
+    Predicts the tickets sold for many screenings with one pipeline transform and one model predict.
+
+    Predictions are rounded and capped at each screen's capacity.
+
+    Returns:
+        np.ndarray: The predicted tickets sold, one integer per row, in the order of rows.
+    """
+    if not rows:
+        return np.zeros(0, dtype=np.int64)
+    predictions = model.predict(model_input(model, pipeline, pipeline.transform_rows(rows)))
+    capacities = np.array([row['capacity'] for row in rows], dtype=np.float64)
+    return np.minimum(np.rint(predictions), capacities).astype(np.int64)
@@ -0,0 +1,125 @@
+import datetime
+from typing import Dict, List, Sequence, Tuple
+import joblib
+import numpy as np
+
+PIPELINE_VERSION = 1
+PIPELINE_FILE = "feature_pipeline.joblib"
+
+# Columns the shipped scaler was fitted on, in order.
+NUMERICAL_COLUMNS = ['capacity', 'ticket_price', 'release_date', 'rating', 'date']
+
+DAYS_OF_WEEK = ['Friday', 'Monday', 'Saturday', 'Sunday', 'Thursday', 'Tuesday', 'Wednesday']
+
+# Columns the shipped model was trained on, in order.
+MODEL_COLUMNS = ['date', 'capacity', 'release_date', 'rating', 'show_time_category_Evening'] + \
+    [f'day_of_week_{day}' for day in DAYS_OF_WEEK]
+
+DATE_FIELDS = ['date', 'release_date']  # Encoded as proleptic Gregorian ordinals, like date.toordinal().
+WEEKDAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+ORDINAL_EPOCH = datetime.date(1970, 1, 1).toordinal()
+
+
+def to_ordinals(values: Sequence) -> np.ndarray:
+    """Ordinals of dates, datetimes, timestamps or ISO date strings, as date.toordinal() computes them."""
+    return np.asarray(values, dtype='datetime64[D]').astype(np.int64) + ORDINAL_EPOCH
+
+
+class FeaturePipeline:
+    """
+    Turns feature rows into the model's input matrix. The same pipeline object is fitted by the training
+    script, saved next to the model and loaded by the application, so training and inference cannot drift.
+
+    Dates are encoded as ordinals, the day of week is one-hot encoded from the screening date and the
+    scaled columns are min-max scaled. Column positions and scaling factors are computed once, so a
+    transform is a few NumPy operations over the whole batch.
+    """
+    def __init__(self, model_columns: List[str], scaling: Dict[str, Tuple[float, float]], version: int = PIPELINE_VERSION):
+        """
+        Args:
+            model_columns (List[str]): The model's input columns, in order.
+            scaling (Dict[str, Tuple[float, float]]): Per scaled column, the multiplier and offset of the min-max scaling.
+        """
+        if version > PIPELINE_VERSION:
+            raise ValueError(f"Feature pipeline version {version} is newer than the supported version {PIPELINE_VERSION}.")
+        self.version = version
+        self.model_columns = list(model_columns)
+        self.scaling = dict(scaling)
+
+        self._value_columns = [(index, column) for index, column in enumerate(self.model_columns) if not column.startswith('day_of_week_')]
+        # Position of each weekday (Monday first) among the model columns, -1 when the model does not use it.
+        self._weekday_positions = np.array([self.model_columns.index(f'day_of_week_{day}') if f'day_of_week_{day}' in self.model_columns else -1
+                                            for day in WEEKDAY_NAMES])
+        self._uses_weekday = bool((self._weekday_positions >= 0).any())
+        self._multiplier = np.ones(len(self.model_columns))
+        self._offset = np.zeros(len(self.model_columns))
+        for index, column in enumerate(self.model_columns):
+            if column in self.scaling:
+                self._multiplier[index], self._offset[index] = self.scaling[column]
+        fields = [column for _, column in self._value_columns]
+        if self._uses_weekday and 'date' not in fields:
+            fields.append('date')
+        self.input_fields = fields  # The feature row values the model's input is computed from.
+
+    def transform_columns(self, columns: Dict[str, Sequence], size: int) -> np.ndarray:
+        """Builds the model input from one array of raw values per input field."""
+        matrix = np.zeros((size, len(self.model_columns)), dtype=np.float64)
+        ordinals = {}
+        for field in DATE_FIELDS:
+            if field in columns:
+                ordinals[field] = to_ordinals(columns[field])
+        for index, column in self._value_columns:
+            matrix[:, index] = ordinals[column] if column in ordinals else np.asarray(columns[column], dtype=np.float64)
+        if self._uses_weekday and size:
+            positions = self._weekday_positions[(ordinals['date'] - 1) % 7]  # Ordinal 1, 0001-01-01, was a Monday.
+            used = positions >= 0
+            matrix[np.nonzero(used)[0], positions[used]] = 1
+        matrix *= self._multiplier
+        matrix += self._offset
+        return matrix
+
+    def transform_rows(self, rows: List[Dict]) -> np.ndarray:
+        """Builds the model input for feature rows, as built by load_screening_features."""
+        return self.transform_columns({field: [row[field] for row in rows] for field in self.input_fields}, len(rows))
+
+    def transform_frame(self, frame) -> np.ndarray:
+        """Builds the model input for a DataFrame with the raw training columns."""
+        return self.transform_columns({field: frame[field].to_numpy() for field in self.input_fields}, len(frame))
+
+    @classmethod
+    def fit(cls, frame, model_columns: List[str], scaled_columns: List[str] = NUMERICAL_COLUMNS) -> 'FeaturePipeline':
+        """Fits the min-max scaling of the scaled columns among model_columns on the raw training columns of a DataFrame."""
+        scaling = {}
+        for column in scaled_columns:
+            if column not in model_columns:
+                continue
+            values = to_ordinals(frame[column].to_numpy()) if column in DATE_FIELDS else frame[column].to_numpy(dtype=np.float64)
+            low, high = float(values.min()), float(values.max())
+            span = (high - low) or 1.0  # A constant column is left unscaled, as MinMaxScaler does.
+            scaling[column] = (1.0 / span, -low / span)
+        return cls(model_columns, scaling)
+
+    @classmethod
+    def from_scaler(cls, scaler, model_columns: List[str] = MODEL_COLUMNS) -> 'FeaturePipeline':
+        """The pipeline of a model trained before pipelines were saved, from its fitted MinMaxScaler."""
+        names = list(getattr(scaler, 'feature_names_in_', NUMERICAL_COLUMNS))
+        scaling = {name: (float(scale), float(offset)) for name, scale, offset in zip(names, scaler.scale_, scaler.min_) if name in model_columns}
+        return cls(model_columns, scaling)
+
+    def to_dict(self) -> Dict:
+        return {"version": self.version, "model_columns": self.model_columns, "scaling": self.scaling}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'FeaturePipeline':
+        return cls(data["model_columns"], {column: tuple(factors) for column, factors in data["scaling"].items()}, data.get("version", 1))
+
+    def save(self, path: str) -> None:
+        """Saves the pipeline as plain data, so loading it does not depend on this module's layout."""
+        joblib.dump(self.to_dict(), path)
+
+    @classmethod
+    def load(cls, path: str) -> 'FeaturePipeline':
+        return cls.from_dict(joblib.load(path))
+
+    def __repr__(self):
+        return f"<FeaturePipeline(version={self.version}, columns={len(self.model_columns)})>"
@@ -0,0 +1,89 @@
+import datetime
+from typing import Dict, Iterable, List
+from sqlalchemy import and_
+from sqlalchemy.orm import Session
+from main_components.models import Screening, Film, Screen, Cinema, City
+
+GENRES = ["Action", "Adventure", "Comedy", "Drama", "Horror", "Mystery", "Romance", "Sci-Fi", "Thriller"]
+LOCATIONS = ["Birmingham", "Bristol", "Cardiff", "London"]
+PLACEHOLDER_TICKET_PRICE = 1000  # Every seat in a screen has a different price, the model was trained on this value.
+
+
+def show_time_flags(start_time: datetime.time) -> Dict[str, int]:
+    """The show time one-hot columns for a start time."""
+    hour = start_time.hour
+    return {
+        'show_time_category_Evening': 1 if 17 <= hour <= 23 else 0,
+        'show_time_category_Morning': 1 if 8 <= hour < 12 else 0,
+        'show_time_category_Afternoon': 1 if 12 <= hour < 17 else 0,
+    }
+
+
+def feature_row(screening_id: int, cinema_id: int, screen_id: str, film_id: int, date: datetime.date, start_time: datetime.time,
+                capacity: int, release_date: datetime.date, rating: float, genre: str, city_name: str) -> Dict:
+    """
+    Builds the model's feature row for one screening. Besides the features, the row carries the
+    screening_id and start_time so that callers can match predictions back to screenings.
+    """
+    genres = genre.split(',') if genre else []
+    row = {
+        'screening_id': screening_id,
+        'start_time': start_time,
+        'capacity': capacity,
+        'release_date': release_date,
+        'date': date,
+        'rating': rating,
+        **show_time_flags(start_time),
+        'seat_type_Lower': 0,
+        'seat_type_Upper': 0,
+        'seat_type_VIP': 0,
+        'cinema_id': cinema_id,
+        'screen_id': screen_id,
+        'film_id': film_id,
+        'ticket_price': PLACEHOLDER_TICKET_PRICE,
+    }
+    row.update({f'cinema_location_{location}': 1 if city_name == location else 0 for location in LOCATIONS})
+    row.update({name: 1 if name in genres else 0 for name in GENRES})
+    return row
+
+
+def load_screening_features(session: Session, start_date: datetime.date = None, end_date: datetime.date = None,
+                            cinema_ids: Iterable[int] = None, screening_ids: Iterable[int] = None) -> List[Dict]:
+    """
+    Fetches the screenings in a date range with their film, screen, cinema and city in one query and
+    returns their feature rows, ordered by date, cinema and start time.
+
+    Args:
+        session (Session): The database session.
+        start_date (date): The first screening date, inclusive. None for no lower bound.
+        end_date (date): The last screening date, inclusive. Defaults to start_date.
+        cinema_ids (Iterable[int]): Only screenings of these cinemas, all cinemas if None.
+        screening_ids (Iterable[int]): Only these screenings, all screenings if None.
+    Returns:
+        List[Dict]: One feature row per screening, see feature_row. Each row also has film_name.
+    """
+    query = session.query(
+        Screening.screening_id, Screening.cinema_id, Screening.screen_id, Screening.film_id, Screening.date, Screening.start_time,
+        Screen.total_capacity, Film.release_date, Film.critic_rating, Film.genre, Film.name, City.name
+    ).join(Film, Film.film_id == Screening.film_id).join(
+        Screen, and_(Screen.screen_id == Screening.screen_id, Screen.cinema_id == Screening.cinema_id)
+    ).join(Cinema, Cinema.cinema_id == Screening.cinema_id).join(City, City.city_id == Cinema.city_id)
+
+    if end_date is None:
+        end_date = start_date
+    if start_date is not None:
+        query = query.filter(Screening.date >= start_date)
+    if end_date is not None:
+        query = query.filter(Screening.date <= end_date)
+    if cinema_ids is not None:
+        query = query.filter(Screening.cinema_id.in_(list(cinema_ids)))
+    if screening_ids is not None:
+        query = query.filter(Screening.screening_id.in_(list(screening_ids)))
+
+    rows = []
+    for (screening_id, cinema_id, screen_id, film_id, date, start_time, capacity,
+         release_date, rating, genre, film_name, city_name) in query.order_by(Screening.date, Screening.cinema_id, Screening.start_time):
+        row = feature_row(screening_id, cinema_id, screen_id, film_id, date, start_time, capacity, release_date, rating, genre, city_name)
+        row['film_name'] = film_name
+        rows.append(row)
+    return rows
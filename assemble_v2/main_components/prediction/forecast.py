@@ -0,0 +1,87 @@
+import datetime
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Sequence
+import numpy as np
+from main_components.prediction.batch_predictor import predict_batch
+from main_components.prediction.features import load_screening_features
+from main_components.prediction.forecast_cache import predict_with_cache
+from main_components.prediction.model_registry import get_model_registry
+
+MIN_ROWS_PER_PROCESS = 2000  # Below this, starting worker processes costs more than scoring in this one.
+
+
+def _score_rows(directory: str, rows: List[Dict]) -> np.ndarray:
+    """Runs in a worker process, which loads the model once through its own registry."""
+    loaded = get_model_registry(directory).get()
+    return predict_batch(loaded.model, loaded.pipeline, rows)
+
+
+def score_by_cinema(loaded, directory: str, rows: List[Dict], processes: int) -> np.ndarray:
+    """
+    Scores the rows in a process pool, one batch per cinema, and returns the predictions in the order of rows.
+    Falls back to a single batch with the loaded model in this process when there is too little work to share.
+    """
+    if processes is None or processes <= 1 or len(rows) < 2 * MIN_ROWS_PER_PROCESS:
+        return predict_batch(loaded.model, loaded.pipeline, rows)
+    positions: Dict[int, List[int]] = {}
+    for position, row in enumerate(rows):
+        positions.setdefault(row['cinema_id'], []).append(position)
+    predictions = np.zeros(len(rows), dtype=np.int64)
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        batches = {cinema_id: executor.submit(_score_rows, directory, [rows[position] for position in cinema_positions])
+                   for cinema_id, cinema_positions in positions.items()}
+        for cinema_id, batch in batches.items():
+            predictions[positions[cinema_id]] = batch.result()
+    return predictions
+
+
+def totals(keys: Sequence, predictions: np.ndarray) -> Dict:
+    """Sums the predictions per key, ordered by key."""
+    sums: Dict = {}
+    for key, prediction in zip(keys, predictions.tolist()):
+        sums[key] = sums.get(key, 0) + prediction
+    return {key: sums[key] for key in sorted(sums)}
+
+
+def forecast_range(start: datetime.date, end: datetime.date, cinema_ids: Iterable[int] = None, session=None,
+                   processes: int = None, registry=None) -> Dict:
+    """
+    Forecasts the tickets sold for every screening between two dates, inclusive.
+
+    The screenings are loaded in one query and scored in one batch, skipping forecasts already cached.
+    With processes, the uncached screenings are scored in a process pool, one batch per cinema.
+
+    Args:
+        start (date): The first screening date.
+        end (date): The last screening date.
+        cinema_ids (Iterable[int]): Only these cinemas, all cinemas if None.
+        session: The database session, the thread's application session by default.
+        processes (int): The number of worker processes, scores in this process if None.
+        registry (ModelRegistry): Where the model comes from, the application's registry by default.
+    Returns:
+        Dict: "total" and "screenings" counts, tickets "by_day", "by_cinema", "by_film" and "by_day_and_cinema"
+            (keyed by (date, cinema_id)), and the "film_names" of the forecast films.
+    """
+    if end < start:
+        raise ValueError("The end date must not be before the start date.")
+    registry = registry or get_model_registry()
+    if session is None:
+        from database.database_settings import SessionLocal, release_connection
+        try:
+            rows = load_screening_features(SessionLocal(), start, end, cinema_ids=cinema_ids)
+        finally:
+            release_connection()
+    else:
+        rows = load_screening_features(session, start, end, cinema_ids=cinema_ids)
+
+    loaded = registry.get()
+    predictions = predict_with_cache(loaded, rows, score=lambda uncached: score_by_cinema(loaded, registry.directory, uncached, processes))
+    return {
+        "total": int(predictions.sum()),
+        "screenings": len(rows),
+        "by_day": totals([row['date'] for row in rows], predictions),
+        "by_cinema": totals([row['cinema_id'] for row in rows], predictions),
+        "by_film": totals([row['film_id'] for row in rows], predictions),
+        "by_day_and_cinema": totals([(row['date'], row['cinema_id']) for row in rows], predictions),
+        "film_names": {row['film_id']: row['film_name'] for row in rows},
+    }
@@ -0,0 +1,221 @@
+import atexit
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+import numpy as np
+from main_components.prediction.batch_predictor import predict_batch
+from main_components.services.change_listeners import add_change_listener
+
+logging.basicConfig(level=logging.INFO)
+
+DEFAULT_MAX_ENTRIES = int(os.getenv("CINEMA_FORECAST_CACHE_SIZE", "50000"))
+DEFAULT_CACHE_PATH = os.getenv("CINEMA_FORECAST_CACHE")  # Unset keeps the cache in memory only.
+
+
+def fingerprint(row: Dict, model_version: str, fields: List[str]) -> str:
+    """A digest of the model version and the feature row values in fields, the ones a prediction depends on."""
+    values = [model_version] + [str(row.get(field)) for field in fields]
+    return hashlib.sha1("|".join(values).encode("utf-8")).hexdigest()
+
+
+def row_tags(row: Dict) -> Set[str]:
+    """The screening, film and screen a cached prediction must be dropped with."""
+    tags = set()
+    if row.get('screening_id') is not None:
+        tags.add(f"screening:{row['screening_id']}")
+    if row.get('film_id') is not None:
+        tags.add(f"film:{row['film_id']}")
+    if row.get('screen_id') is not None:
+        tags.add(f"screen:{row.get('cinema_id')}:{row['screen_id']}")
+    return tags
+
+
+class ForecastCache:
+    """
+    A least-recently-used cache of predicted tickets, keyed by the fingerprint of a feature row and model version.
+
+    Entries are tagged with their screening, film and screen so that editing one of them drops its forecasts.
+    All entries are dropped when a different model version is used. With a path, the entries are saved to
+    and restored from a JSON file, so forecasts survive restarts of the application.
+    """
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, path: str = None):
+        self.max_entries = max_entries
+        self.path = path
+        self.model_version: Optional[str] = None
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[int, Set[str]]]" = OrderedDict()
+        self._by_tag: Dict[str, Set[str]] = {}
+        self._dirty = False
+        if path and os.path.exists(path):
+            self.load()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _discard(self, key: str) -> None:
+        _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_tag[tag]
+
+    def use_model(self, model_version: str) -> None:
+        """Drops every entry if the forecasts were made by another model version."""
+        with self._lock:
+            if self.model_version != model_version:
+                self._entries.clear()
+                self._by_tag.clear()
+                self.model_version = model_version
+                self._dirty = True
+
+    def get(self, key: str) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, prediction: int, tags: Iterable[str] = ()) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._discard(key)
+            tags = set(tags)
+            self._entries[key] = (int(prediction), tags)
+            for tag in tags:
+                self._by_tag.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._discard(next(iter(self._entries)))
+            self._dirty = True
+
+    def invalidate(self, screening_id: int = None, film_id: int = None, screen_id: str = None, cinema_id: int = None) -> int:
+        """
+        Drops the forecasts of a screening, of a film, or of a screen (screen_id with its cinema_id).
+        Without arguments, drops every forecast. Returns the number of entries dropped.
+        """
+        with self._lock:
+            if screening_id is None and film_id is None and screen_id is None:
+                dropped = len(self._entries)
+                self._entries.clear()
+                self._by_tag.clear()
+            else:
+                tags = []
+                if screening_id is not None:
+                    tags.append(f"screening:{screening_id}")
+                if film_id is not None:
+                    tags.append(f"film:{film_id}")
+                if screen_id is not None:
+                    tags.append(f"screen:{cinema_id}:{screen_id}")
+                keys = set()
+                for tag in tags:
+                    keys |= self._by_tag.get(tag, set())
+                for key in keys:
+                    self._discard(key)
+                dropped = len(keys)
+            if dropped:
+                self._dirty = True
+            return dropped
+
+    def save(self) -> None:
+        """Writes the entries to the cache file, replacing it atomically. Does nothing without a path."""
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {
+                "model_version": self.model_version,
+                "entries": [[key, prediction, sorted(tags)] for key, (prediction, tags) in self._entries.items()]
+            }
+            self._dirty = False
+        temporary_path = self.path + ".tmp"
+        with open(temporary_path, "w") as file:
+            json.dump(data, file)
+        os.replace(temporary_path, self.path)
+
+    def load(self) -> None:
+        """Restores the entries saved in the cache file, oldest first. An unreadable file is ignored."""
+        try:
+            with open(self.path) as file:
+                data = json.load(file)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring the forecast cache {self.path}: {e}")
+            return
+        self.model_version = data.get("model_version")
+        for key, prediction, tags in data.get("entries", []):
+            self.put(key, prediction, tags)
+        self._dirty = False
+
+    def __repr__(self):
+        return f"<ForecastCache(entries={len(self._entries)}, model_version={self.model_version}, hits={self.hits}, misses={self.misses})>"
+
+
+def predict_with_cache(loaded, rows: List[Dict], cache: ForecastCache = None,
+                       score: Callable[[List[Dict]], np.ndarray] = None) -> np.ndarray:
+    """
+    predict_batch through the forecast cache: only the rows without a cached forecast are scored, in one batch.
+
+    Args:
+        loaded: The LoadedModel from the model registry.
+        rows (List[Dict]): Feature rows, see load_screening_features.
+        cache (ForecastCache): Defaults to the process-wide cache.
+        score: Scores the uncached rows with the loaded model, predict_batch in this process by default.
+    Returns:
+        np.ndarray: The predicted tickets sold, one per row, in the order of rows.
+    """
+    if cache is None:
+        cache = get_forecast_cache()
+    cache.use_model(loaded.version)
+    fields = sorted(set(loaded.pipeline.input_fields) | {'capacity'})  # The capacity also caps the prediction.
+    keys = [fingerprint(row, loaded.version, fields) for row in rows]
+    predictions = np.zeros(len(rows), dtype=np.int64)
+    missing = []
+    for position, key in enumerate(keys):
+        cached = cache.get(key)
+        if cached is None:
+            missing.append(position)
+        else:
+            predictions[position] = cached
+    if missing:
+        uncached = [rows[position] for position in missing]
+        scored = score(uncached) if score else predict_batch(loaded.model, loaded.pipeline, uncached)
+        for position, prediction in zip(missing, scored):
+            predictions[position] = prediction
+            cache.put(keys[position], prediction, row_tags(rows[position]))
+    return predictions
+
+
+_cache: Optional[ForecastCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_forecast_cache() -> ForecastCache:
+    """Returns the process-wide forecast cache, saved on exit when CINEMA_FORECAST_CACHE names a file."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ForecastCache(DEFAULT_MAX_ENTRIES, DEFAULT_CACHE_PATH)
+            if DEFAULT_CACHE_PATH:
+                atexit.register(_cache.save)
+        return _cache
+
+
+def invalidate_forecasts(screening_id: int = None, film_id: int = None, screen_id: str = None, cinema_id: int = None) -> None:
+    """Drops cached forecasts after a screening, film or screen changed, see ForecastCache.invalidate."""
+    with _cache_lock:
+        cache = _cache
+    if cache is not None:
+        cache.invalidate(screening_id=screening_id, film_id=film_id, screen_id=screen_id, cinema_id=cinema_id)
+
+
+add_change_listener(invalidate_forecasts)  # The services report screening, film and screen edits without importing the cache.
@@ -0,0 +1,200 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+import warnings
+from typing import Callable, Dict, List, Optional, Tuple
+import joblib
+from main_components.prediction.feature_pipeline import FeaturePipeline, MODEL_COLUMNS, NUMERICAL_COLUMNS, PIPELINE_FILE, PIPELINE_VERSION
+
+logging.basicConfig(level=logging.INFO)
+
+MODEL_FILE = "demand_model.joblib"  # Whichever model family the training search picked.
+LEGACY_MODEL_FILE = "gradient_boosting_model.joblib"  # The name models were saved under before.
+SCALER_FILE = "scaler.joblib"
+# The artifacts shipped with the application, CINEMA_MODEL_DIR points the registry elsewhere.
+DEFAULT_MODEL_DIR = os.getenv("CINEMA_MODEL_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "management"))
+RELOAD_CHECK_SECONDS = 5.0
+
+
+class ModelSchemaError(ValueError):
+    """Raised when a model or scaler artifact does not take the features the application builds."""
+
+
+class LoadedModel:
+    """A demand model and its feature pipeline, as loaded from one set of artifacts."""
+    def __init__(self, model, pipeline: FeaturePipeline, version: str, loaded_at: float):
+        self.model = model
+        self.pipeline = pipeline
+        self.version = version
+        self.loaded_at = loaded_at
+
+    def __repr__(self):
+        return f"<LoadedModel(version={self.version}, model={type(self.model).__name__})>"
+
+
+def check_schema(estimator, columns: List[str], name: str) -> None:
+    """Checks that an estimator was fitted on the given columns, in order."""
+    feature_names = getattr(estimator, "feature_names_in_", None)
+    if feature_names is not None and list(feature_names) != list(columns):
+        raise ModelSchemaError(f"The {name} expects the columns {list(feature_names)}, the application builds {columns}.")
+    n_features = getattr(estimator, "n_features_in_", None)
+    if n_features is not None and n_features != len(columns):
+        raise ModelSchemaError(f"The {name} expects {n_features} features, the application builds {len(columns)}.")
+
+
+def load_artifact(path: str):
+    """Loads a joblib artifact, memory-mapping its arrays when the file is not compressed."""
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", message=".*not compatible with compressed file.*")  # Compressed files are read into memory.
+        return joblib.load(path, mmap_mode="r")
+
+
+def save_model_artifacts(model, pipeline: FeaturePipeline, directory: str, model_file: str = MODEL_FILE) -> List[str]:
+    """
+    Saves a trained model and its feature pipeline together, as the registry loads them.
+
+    The schema is checked and both files are written to temporary names first, then moved into place one
+    right after the other. A registry never sees a half-written file, and one that loads between the two
+    moves reloads on its next check, as the pair's signature changes again.
+
+    Raises:
+        ModelSchemaError: If the model was not fitted on the pipeline's columns.
+    """
+    check_schema(model, pipeline.model_columns, "model")
+    os.makedirs(directory, exist_ok=True)
+    paths = [os.path.join(directory, PIPELINE_FILE), os.path.join(directory, model_file)]
+    pipeline.save(paths[0] + ".tmp")
+    joblib.dump(model, paths[1] + ".tmp")
+    for path in paths:
+        os.replace(path + ".tmp", path)
+    return paths
+
+
+class ModelRegistry:
+    """
+    Loads the demand model and its feature pipeline once per process and hands the same objects to every caller.
+
+    The model is read from demand_model.joblib, or from gradient_boosting_model.joblib where an older training run
+    saved it. The pipeline is read from feature_pipeline.joblib, saved with the model by the training script. Models
+    trained before pipelines were saved get a pipeline built from their scaler.joblib.
+
+    The artifacts are loaded on first use. Afterwards, at most every reload_check_seconds, get() compares the
+    files' modification time and size with the loaded ones and reloads them when a newer artifact was saved.
+    A new artifact that fails the schema check is logged and the loaded model is kept.
+    """
+    def __init__(self, directory: str = DEFAULT_MODEL_DIR, model_file: str = MODEL_FILE, scaler_file: str = SCALER_FILE,
+                 reload_check_seconds: float = RELOAD_CHECK_SECONDS):
+        self.directory = directory
+        self.model_path = os.path.join(directory, model_file)
+        self.legacy_model_path = os.path.join(directory, LEGACY_MODEL_FILE)
+        self.scaler_path = os.path.join(directory, scaler_file)
+        self.pipeline_path = os.path.join(directory, PIPELINE_FILE)
+        self.reload_check_seconds = reload_check_seconds
+        self._lock = threading.Lock()
+        self._loaded: Optional[LoadedModel] = None
+        self._signature: Optional[Tuple] = None
+        self._checked_at = 0.0
+        self._listeners: List[Callable[[LoadedModel], None]] = []
+
+    def _artifact_paths(self) -> List[str]:
+        model_path = self.model_path if os.path.exists(self.model_path) or not os.path.exists(self.legacy_model_path) else self.legacy_model_path
+        return [model_path, self.pipeline_path if os.path.exists(self.pipeline_path) else self.scaler_path]
+
+    def _file_signature(self) -> Tuple:
+        signature = ()
+        for path in self._artifact_paths():
+            stat = os.stat(path)
+            signature += (path, stat.st_mtime_ns, stat.st_size)
+        return signature
+
+    def _version(self, paths: List[str]) -> str:
+        """A digest of the artifacts and the pipeline code version, the same in every process that loads the same files."""
+        digest = hashlib.sha1(f"pipeline-{PIPELINE_VERSION}".encode("utf-8"))
+        for path in paths:
+            with open(path, "rb") as artifact:
+                for chunk in iter(lambda: artifact.read(1 << 20), b""):
+                    digest.update(chunk)
+        return digest.hexdigest()[:12]
+
+    def _load(self, signature: Tuple) -> LoadedModel:
+        paths = self._artifact_paths()
+        model = load_artifact(paths[0])
+        if paths[1] == self.pipeline_path:
+            pipeline = FeaturePipeline.load(self.pipeline_path)
+        else:
+            scaler = load_artifact(self.scaler_path)
+            check_schema(scaler, NUMERICAL_COLUMNS, "scaler")
+            pipeline = FeaturePipeline.from_scaler(scaler, MODEL_COLUMNS)
+        check_schema(model, pipeline.model_columns, "model")
+        loaded = LoadedModel(model, pipeline, self._version(paths), time.time())
+        self._loaded, self._signature = loaded, signature
+        logging.info(f"Loaded demand model {loaded.version} ({type(model).__name__}) from {paths[0]}.")
+        return loaded
+
+    def get(self) -> LoadedModel:
+        """
+        Returns the loaded model, loading it on first use and reloading it when the artifacts changed.
+
+        Raises:
+            FileNotFoundError: If the artifacts do not exist and no model was loaded before.
+            ModelSchemaError: If the first artifacts loaded do not match the application's features.
+        """
+        now = time.monotonic()
+        loaded = self._loaded
+        if loaded is not None and now - self._checked_at < self.reload_check_seconds:
+            return loaded
+        listeners = []
+        with self._lock:
+            self._checked_at = now
+            try:
+                signature = self._file_signature()
+            except OSError:
+                if self._loaded is None:
+                    raise
+                return self._loaded  # The artifacts are being replaced, keep serving the loaded model.
+            if self._loaded is None:
+                loaded = self._load(signature)
+                listeners = list(self._listeners)
+            elif signature != self._signature:
+                try:
+                    loaded = self._load(signature)
+                    listeners = list(self._listeners)
+                except Exception as e:
+                    self._signature = signature  # Do not retry the same broken artifacts on every call.
+                    logging.error(f"Keeping demand model {self._loaded.version}, the new artifacts could not be loaded: {e}")
+            loaded = self._loaded
+        for listener in listeners:
+            listener(loaded)
+        return loaded
+
+    def reload(self) -> LoadedModel:
+        """Forces the artifacts to be checked on the next get() and returns the current model."""
+        self._checked_at = 0.0
+        return self.get()
+
+    def add_reload_listener(self, listener: Callable[[LoadedModel], None]) -> None:
+        """Registers a callback run with the new LoadedModel whenever a model is loaded."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    @property
+    def version(self) -> Optional[str]:
+        return self._loaded.version if self._loaded else None
+
+    def __repr__(self):
+        return f"<ModelRegistry(directory={self.directory}, version={self.version})>"
+
+
+_registries: Dict[str, ModelRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_model_registry(directory: str = None) -> ModelRegistry:
+    """Returns the process-wide registry for an artifact directory, the application's own by default."""
+    directory = os.path.abspath(directory or DEFAULT_MODEL_DIR)
+    with _registries_lock:
+        if directory not in _registries:
+            _registries[directory] = ModelRegistry(directory)
+        return _registries[directory]
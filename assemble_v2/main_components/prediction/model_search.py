@@ -0,0 +1,200 @@
+import hashlib
+import json
+import logging
+import math
+import os
+import time
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from sklearn.base import clone
+from sklearn.metrics import mean_squared_error
+from sklearn.model_selection import KFold, ParameterSampler
+
+logging.basicConfig(level=logging.INFO)
+
+DEFAULT_FACTOR = 3  # Each rung keeps a third of the candidates and gives them three times the training rows.
+DEFAULT_MIN_SAMPLES = 500
+
+
+class SearchSpace:
+    """An estimator family and the hyperparameters to sample for it, as lists or scipy distributions."""
+    def __init__(self, name: str, estimator, parameters: Dict, candidates: int):
+        self.name = name
+        self.estimator = estimator
+        self.parameters = parameters
+        self.candidates = candidates
+
+    def sample(self, random_state: int) -> List[Dict]:
+        candidates = self.candidates
+        if all(isinstance(values, (list, tuple)) for values in self.parameters.values()):
+            candidates = min(candidates, math.prod(len(values) for values in self.parameters.values()))
+        return [plain_parameters(parameters) for parameters in ParameterSampler(self.parameters, candidates, random_state=random_state)]
+
+
+class SearchBudget:
+    """Stops the search after max_fits model fits or max_seconds of wall-clock time, whichever comes first."""
+    def __init__(self, max_fits: Optional[int] = None, max_seconds: Optional[float] = None):
+        self.max_fits = max_fits
+        self.max_seconds = max_seconds
+        self.fits = 0
+        self._started = None
+
+    def start(self) -> None:
+        self.fits = 0
+        self._started = time.monotonic()
+
+    def exhausted(self) -> bool:
+        if self.max_fits is not None and self.fits >= self.max_fits:
+            return True
+        return self.max_seconds is not None and time.monotonic() - self._started >= self.max_seconds
+
+
+class SearchLedger:
+    """
+    The results of every fit of a search, one JSON object per line. Evaluations already in the ledger are read
+    back instead of refitted, so an interrupted or repeated search only fits what it has not scored yet.
+    """
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._entries: Dict[str, Dict] = {}
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as ledger:
+                for line in ledger:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries[entry["key"]] = entry
+
+    def get(self, key: str) -> Optional[Dict]:
+        return self._entries.get(key)
+
+    def record(self, entry: Dict) -> None:
+        self._entries[entry["key"]] = entry
+        if self.path:
+            with open(self.path, "a", encoding="utf-8") as ledger:
+                ledger.write(json.dumps(entry, sort_keys=True) + "\n")
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SearchResult:
+    """The outcome of a search: the best candidate, refitted on every training row, and its fold scores."""
+    def __init__(self, family: str, parameters: Dict, estimator, fold_rmse: np.ndarray, samples: int, fits: int, reused: int):
+        self.family = family
+        self.parameters = parameters
+        self.estimator = estimator
+        self.fold_rmse = fold_rmse
+        self.samples = samples  # Training rows per fold the fold scores were measured with.
+        self.fits = fits
+        self.reused = reused
+
+    def __repr__(self):
+        return f"<SearchResult(family={self.family}, parameters={self.parameters}, rmse={self.fold_rmse.mean():.2f})>"
+
+
+def plain_parameters(parameters: Dict) -> Dict:
+    """Parameters with NumPy scalars turned into Python numbers, so they can be written to the ledger."""
+    return {name: value.item() if isinstance(value, np.generic) else value for name, value in parameters.items()}
+
+
+def data_fingerprint(X, y) -> str:
+    """A digest of the training data, so ledger entries are never reused for other data."""
+    digest = hashlib.sha1(repr(np.shape(X)).encode("utf-8"))
+    for values in (np.asarray(X), np.asarray(y)):
+        values = np.ascontiguousarray(values)
+        digest.update(memoryview(values.reshape(-1).view(np.uint8)))
+    return digest.hexdigest()[:16]
+
+
+class SuccessiveHalvingSearch:
+    """
+    Random search over one or more estimator families with successive halving.
+
+    Every candidate is first scored by cross-validation on a small sample of each fold's training rows. After
+    each rung, the best 1/factor of the candidates move on with factor times more rows, until one candidate is
+    left or the rungs use every row. The fold splits and each fold's row order are computed once, so every
+    candidate at a rung is fitted on the same rows and the scores compare.
+
+    The search stops early when the budget is spent. The best candidate of the last rung every remaining
+    candidate finished is then refitted on all the training rows.
+    """
+    def __init__(self, spaces: Sequence[SearchSpace], budget: SearchBudget = None, ledger: SearchLedger = None,
+                 folds: int = 5, factor: int = DEFAULT_FACTOR, min_samples: int = DEFAULT_MIN_SAMPLES, random_state: int = 42):
+        self.spaces = {space.name: space for space in spaces}
+        self.budget = budget if budget is not None else SearchBudget()
+        self.ledger = ledger if ledger is not None else SearchLedger()
+        self.folds = folds
+        self.factor = factor
+        self.min_samples = min_samples
+        self.random_state = random_state
+
+    def _fold_rows(self, size: int) -> List[tuple]:
+        """Per fold, the training rows in a fixed random order, and the validation rows."""
+        rng = np.random.default_rng(self.random_state)
+        splits = KFold(self.folds, shuffle=True, random_state=self.random_state).split(np.zeros((size, 1)))
+        return [(rng.permutation(train), validation) for train, validation in splits]
+
+    def _rung_samples(self, train_size: int, candidates: int) -> List[int]:
+        """Training rows per fold at each rung, a factor apart and ending with every row."""
+        rungs = max(1, math.ceil(math.log(max(candidates, 1), self.factor)) + 1)
+        return sorted({min(train_size, max(self.min_samples, train_size // self.factor ** rung)) for rung in range(rungs)})
+
+    def _evaluate(self, family: str, parameters: Dict, fold: int, samples: int, rows: tuple, X, y, data_key: str) -> Optional[float]:
+        """The validation RMSE of one candidate on one fold, from the ledger or from a new fit. None once the budget is spent."""
+        key = hashlib.sha1(json.dumps({"family": family, "parameters": parameters, "fold": fold, "folds": self.folds, "samples": samples,
+                                       "data": data_key, "random_state": self.random_state}, sort_keys=True).encode("utf-8")).hexdigest()
+        entry = self.ledger.get(key)
+        if entry is not None:
+            self._reused += 1
+            return entry["rmse"]
+        if self.budget.exhausted():
+            return None
+        train, validation = rows
+        train = np.sort(train[:samples])
+        started = time.perf_counter()
+        model = clone(self.spaces[family].estimator).set_params(**parameters).fit(X[train], y[train])
+        rmse = float(np.sqrt(mean_squared_error(y[validation], model.predict(X[validation]))))
+        self.budget.fits += 1
+        self.ledger.record({"key": key, "family": family, "parameters": parameters, "fold": fold, "samples": samples,
+                            "rmse": rmse, "fit_seconds": round(time.perf_counter() - started, 3), "data": data_key})
+        return rmse
+
+    def fit(self, X, y) -> SearchResult:
+        """
+        Searches the spaces on the training rows X, y and returns the best candidate refitted on all of them.
+
+        Raises:
+            ValueError: If the budget is spent before any candidate is scored on every fold.
+        """
+        X, y = np.asarray(X), np.asarray(y)
+        data_key = data_fingerprint(X, y)
+        self.budget.start()
+        self._reused = 0
+        candidates = [(name, parameters) for name, space in self.spaces.items() for parameters in space.sample(self.random_state)]
+        fold_rows = self._fold_rows(len(y))
+        train_size = min(len(train) for train, _ in fold_rows)
+
+        best = None  # The ranking of the last rung every remaining candidate finished.
+        for samples in self._rung_samples(train_size, len(candidates)):
+            scores = []
+            for family, parameters in candidates:
+                fold_rmse = [self._evaluate(family, parameters, fold, samples, rows, X, y, data_key) for fold, rows in enumerate(fold_rows)]
+                if None in fold_rmse:
+                    break
+                scores.append((float(np.mean(fold_rmse)), family, parameters, np.array(fold_rmse), samples))
+            if len(scores) < len(candidates):
+                logging.info(f"Search budget spent after {self.budget.fits} fits, at {samples} rows per fold.")
+                if best is None and scores:
+                    best = sorted(scores, key=lambda score: score[0])
+                break
+            best = sorted(scores, key=lambda score: score[0])
+            logging.info(f"Scored {len(candidates)} candidates on {samples} rows per fold, best RMSE {best[0][0]:.2f}.")
+            if len(candidates) == 1:
+                break
+            candidates = [(family, parameters) for _, family, parameters, _, _ in best[:max(1, math.ceil(len(best) / self.factor))]]
+        if not best:
+            raise ValueError("The search budget was spent before any candidate was scored on every fold.")
+
+        _, family, parameters, fold_rmse, samples = best[0]
+        estimator = clone(self.spaces[family].estimator).set_params(**parameters).fit(X, y)
+        return SearchResult(family, parameters, estimator, fold_rmse, samples, self.budget.fits, self._reused)
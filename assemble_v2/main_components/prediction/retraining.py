@@ -0,0 +1,155 @@
+import datetime
+import logging
+import os
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.ensemble import GradientBoostingRegressor
+from sklearn.metrics import mean_squared_error
+from sqlalchemy import and_, func, insert, or_
+from sqlalchemy.orm import Session
+from main_components.models import Screening, SeatAvailability, TrainingCheckpoint, TrainingSnapshot
+from main_components.prediction.batch_predictor import model_input
+from main_components.prediction.feature_pipeline import FeaturePipeline, MODEL_COLUMNS
+from main_components.prediction.features import load_screening_features
+from main_components.prediction.model_registry import ModelRegistry, ModelSchemaError, get_model_registry, save_model_artifacts
+
+logging.basicConfig(level=logging.INFO)
+
+SNAPSHOT_CHECKPOINT = "training_snapshots"
+EXTRACT_BATCH_SIZE = 2000  # Screenings read, labelled and written per transaction.
+# The model is retrained on the shown screenings of the last WINDOW_DAYS days. The last VALIDATION_DAYS of them are held
+# out to compare the new model with the one in use.
+WINDOW_DAYS = int(os.getenv("CINEMA_RETRAIN_WINDOW_DAYS", "365"))
+VALIDATION_DAYS = int(os.getenv("CINEMA_RETRAIN_VALIDATION_DAYS", "14"))
+SNAPSHOT_FIELDS = ['date', 'start_time', 'cinema_id', 'screen_id', 'film_id', 'capacity', 'release_date', 'rating',
+                   'show_time_category_Evening', 'ticket_price']
+
+
+def extract_training_snapshots(session: Session, until: datetime.date = None, batch_size: int = EXTRACT_BATCH_SIZE, full: bool = False) -> int:
+    """
+    Writes the features and tickets sold of the screenings shown since the last checkpoint to the training snapshots.
+
+    Screenings before until (today by default) are read in (date, screening_id) order, batch_size at a time. Each batch's
+    features are built by load_screening_features, its labels, the booked seats per screening, by one grouped query,
+    and the snapshot rows and the advanced checkpoint are committed together. An interrupted run resumes after the last
+    committed batch.
+
+    Args:
+        full (bool): Ignore the checkpoint and extract every shown screening again.
+    Returns:
+        int: The number of screenings written.
+    """
+    until = until or datetime.date.today()
+    checkpoint = session.get(TrainingCheckpoint, SNAPSHOT_CHECKPOINT)
+    written = 0
+    while True:
+        query = session.query(Screening.screening_id, Screening.date).filter(Screening.date < until)
+        if checkpoint is not None and not full:
+            query = query.filter(or_(Screening.date > checkpoint.last_date,
+                                     and_(Screening.date == checkpoint.last_date, Screening.screening_id > checkpoint.last_screening_id)))
+        batch = query.order_by(Screening.date, Screening.screening_id).limit(batch_size).all()
+        if not batch:
+            return written
+        full = False  # Later batches continue after the checkpoint written by the first one.
+        screening_ids = [screening_id for screening_id, _ in batch]
+
+        labels = dict(session.query(SeatAvailability.screening_id, func.count()).filter(
+            SeatAvailability.screening_id.in_(screening_ids), SeatAvailability.booking_id.isnot(None)
+        ).group_by(SeatAvailability.screening_id).all())
+        now = datetime.datetime.now()
+        snapshots = [{**{field: row[field] for field in SNAPSHOT_FIELDS}, 'screening_id': row['screening_id'],
+                      'tickets_sold': labels.get(row['screening_id'], 0), 'updated_at': now}
+                     for row in load_screening_features(session, screening_ids=screening_ids)]
+
+        session.query(TrainingSnapshot).filter(TrainingSnapshot.screening_id.in_(screening_ids)).delete(synchronize_session=False)
+        if snapshots:
+            session.execute(insert(TrainingSnapshot), snapshots)
+        last_id, last_date = batch[-1]
+        if checkpoint is None:
+            checkpoint = TrainingCheckpoint(SNAPSHOT_CHECKPOINT, last_date, last_id, now)
+            session.add(checkpoint)
+        else:
+            checkpoint.last_date, checkpoint.last_screening_id, checkpoint.updated_at = last_date, last_id, now
+        session.commit()  # The snapshots and the checkpoint move together.
+        written += len(snapshots)
+        logging.info(f"Extracted {written} training snapshots, up to {last_date}.")
+
+
+def load_training_frame(session: Session, start_date: datetime.date, end_date: datetime.date, batch_size: int = EXTRACT_BATCH_SIZE) -> pd.DataFrame:
+    """The training snapshots with a date from start_date, inclusive, to end_date, exclusive, streamed batch_size rows at a time."""
+    columns = ['screening_id', *SNAPSHOT_FIELDS, 'tickets_sold']
+    query = session.query(*[getattr(TrainingSnapshot, column) for column in columns]).filter(
+        TrainingSnapshot.date >= start_date, TrainingSnapshot.date < end_date).order_by(TrainingSnapshot.date, TrainingSnapshot.screening_id)
+    values: Dict[str, List] = {column: [] for column in columns}
+    for row in query.yield_per(batch_size):
+        for column, value in zip(columns, row):
+            values[column].append(value)
+    return pd.DataFrame(values, columns=columns)
+
+
+def rmse(model, pipeline: FeaturePipeline, frame: pd.DataFrame) -> float:
+    """The root mean squared error of a model on labelled snapshots."""
+    predictions = model.predict(model_input(model, pipeline, pipeline.transform_frame(frame)))
+    return float(np.sqrt(mean_squared_error(frame['tickets_sold'], predictions)))
+
+
+class RetrainResult:
+    """The outcome of a retraining run: the validation error of both models and whether the new one was saved."""
+    def __init__(self, trained_rows: int, validation_rows: int, current_rmse: Optional[float], new_rmse: float, promoted: bool, version: Optional[str]):
+        self.trained_rows = trained_rows
+        self.validation_rows = validation_rows
+        self.current_rmse = current_rmse
+        self.new_rmse = new_rmse
+        self.promoted = promoted
+        self.version = version  # The model in use after the run.
+
+    def __repr__(self):
+        return (f"<RetrainResult(trained_rows={self.trained_rows}, current_rmse={self.current_rmse}, new_rmse={self.new_rmse:.2f}, "
+                f"promoted={self.promoted})>")
+
+
+def retrain_model(session: Session, registry: ModelRegistry = None, today: datetime.date = None, window_days: int = WINDOW_DAYS,
+                  validation_days: int = VALIDATION_DAYS, tolerance: float = 0.0, estimator=None) -> RetrainResult:
+    """
+    Retrains the demand model on a sliding window of training snapshots and saves it only if it is not worse.
+
+    The snapshots of the window's last validation_days days are held out. A model with the hyperparameters of the one in
+    use, or the given estimator, is fitted on the rest with a pipeline fitted on the same rows. The new model replaces
+    the one in use only if its validation RMSE is at most (1 + tolerance) times the current model's; the registry then
+    loads it on its next check. Without a usable current model the new one is always saved.
+
+    Raises:
+        ValueError: If the window has no snapshots to train or validate on.
+    """
+    registry = registry or get_model_registry()
+    today = today or datetime.date.today()
+    validation_start = today - datetime.timedelta(days=validation_days)
+    training = load_training_frame(session, today - datetime.timedelta(days=window_days), validation_start)
+    validation = load_training_frame(session, validation_start, today)
+    if training.empty or validation.empty:
+        raise ValueError(f"Not enough training snapshots: {len(training)} to train on and {len(validation)} to validate on.")
+
+    try:
+        current = registry.get()
+    except (OSError, ModelSchemaError) as e:
+        logging.warning(f"No current demand model to compare with: {e}")
+        current = None
+    model_columns = current.pipeline.model_columns if current else MODEL_COLUMNS
+    if estimator is None:
+        estimator = clone(current.model) if current else GradientBoostingRegressor(random_state=42)
+
+    pipeline = FeaturePipeline.fit(training, model_columns)
+    model = clone(estimator).fit(pipeline.transform_frame(training), training['tickets_sold'].to_numpy())
+    new_rmse = rmse(model, pipeline, validation)
+    current_rmse = rmse(current.model, current.pipeline, validation) if current else None
+
+    promoted = current_rmse is None or new_rmse <= current_rmse * (1 + tolerance)
+    if promoted:
+        save_model_artifacts(model, pipeline, registry.directory)
+        registry.reload()
+        logging.info(f"Saved the retrained demand model, validation RMSE {new_rmse:.2f} against {current_rmse}.")
+    else:
+        logging.info(f"Kept demand model {current.version}, the retrained model's validation RMSE {new_rmse:.2f} is worse than {current_rmse:.2f}.")
+    return RetrainResult(len(training), len(validation), current_rmse, new_rmse, promoted, registry.version)
@@ -0,0 +1,174 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+from typing import Dict, Iterator, List, Optional, Sequence
+import numpy as np
+import pandas as pd
+from main_components.prediction.feature_pipeline import DATE_FIELDS, FeaturePipeline
+
+logging.basicConfig(level=logging.INFO)
+
+STORE_VERSION = 1
+MANIFEST_FILE = "store.json"
+FEATURES_DIR = "features"
+DEFAULT_CHUNK_SIZE = 1_000_000  # Rows parsed, converted or transformed at a time, bounds the memory used.
+INTEGER_TYPES = [np.int8, np.int16, np.int32, np.int64]
+
+
+def smallest_integer_type(low: int, high: int):
+    """The smallest signed integer type holding every value between low and high."""
+    for dtype in INTEGER_TYPES:
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+def source_signature(path: str) -> Dict:
+    stat = os.stat(path)
+    return {"path": os.path.abspath(path), "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+class TrainingStore:
+    """
+    The demand model's training data, converted once from the training CSV into one NumPy .npy file per column.
+
+    Columns are stored typed and as small as their values allow: dates as datetime64[D], flags as bool and
+    integers in the narrowest integer type. Columns are memory-mapped when read, so a read only touches the
+    rows and columns asked for.
+
+    Feature matrices built by a FeaturePipeline are cached in the store, keyed by the pipeline's parameters,
+    so retraining with the same pipeline does not transform the rows again.
+    """
+    def __init__(self, directory: str):
+        self.directory = directory
+        with open(os.path.join(directory, MANIFEST_FILE), "r", encoding="utf-8") as manifest:
+            self.manifest = json.load(manifest)
+        self.rows: int = self.manifest["rows"]
+        self.columns: List[str] = list(self.manifest["columns"])
+
+    @classmethod
+    def open(cls, csv_path: str, directory: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> 'TrainingStore':
+        """Opens the store of a training CSV, converting the CSV first if the store is missing or older than the CSV."""
+        try:
+            store = cls(directory)
+            if store.manifest.get("version") == STORE_VERSION and store.manifest.get("source") == source_signature(csv_path):
+                return store
+        except (OSError, ValueError, KeyError):
+            pass
+        return cls.build(csv_path, directory, chunk_size)
+
+    @classmethod
+    def build(cls, csv_path: str, directory: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> 'TrainingStore':
+        """
+        Converts a training CSV into a store, parsing chunk_size rows at a time.
+
+        Each chunk is appended to one raw file per column. Once every chunk is read, the raw files are copied
+        into .npy files of the narrowest type of each column, and the manifest is written last, so a store that
+        failed half-way is rebuilt by the next open().
+        """
+        signature = source_signature(csv_path)
+        if os.path.isdir(directory):
+            shutil.rmtree(directory)
+        os.makedirs(directory)
+
+        dtypes: Dict[str, np.dtype] = {}
+        ranges: Dict[str, List[int]] = {}
+        rows = 0
+        for chunk in pd.read_csv(csv_path, chunksize=chunk_size):
+            for column in chunk.columns:
+                values = chunk[column].to_numpy()
+                if column in DATE_FIELDS:
+                    values = pd.to_datetime(values).to_numpy().astype('datetime64[D]')
+                elif values.dtype.kind in "iu":
+                    values = values.astype(np.int64)
+                    low, high = ranges.get(column, [int(values.min()), int(values.max())])
+                    ranges[column] = [min(low, int(values.min())), max(high, int(values.max()))]
+                if dtypes.setdefault(column, values.dtype) != values.dtype:
+                    raise ValueError(f"The column {column} of {csv_path} holds {dtypes[column]} and {values.dtype} values.")
+                with open(cls._raw_path(directory, column), "ab") as raw:
+                    values.tofile(raw)
+            rows += len(chunk)
+            logging.info(f"Converted {rows} rows of {csv_path}.")
+
+        columns = {}
+        for column, dtype in dtypes.items():
+            target = smallest_integer_type(*ranges[column]) if column in ranges else dtype
+            raw_path = cls._raw_path(directory, column)
+            columns[column] = target.str
+            if not rows:  # An empty file cannot be memory-mapped.
+                np.save(cls._column_path(directory, column), np.zeros(0, dtype=target))
+                os.remove(raw_path)
+                continue
+            raw = np.memmap(raw_path, dtype=dtype, mode="r", shape=(rows,))
+            stored = np.lib.format.open_memmap(cls._column_path(directory, column), mode="w+", dtype=target, shape=(rows,))
+            for start in range(0, rows, chunk_size):
+                stored[start:start + chunk_size] = raw[start:start + chunk_size]
+            stored.flush()
+            del raw, stored
+            os.remove(raw_path)
+
+        manifest = {"version": STORE_VERSION, "source": signature, "rows": rows, "columns": columns}
+        temporary = os.path.join(directory, MANIFEST_FILE + ".tmp")
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(manifest, file, indent=2)
+        os.replace(temporary, os.path.join(directory, MANIFEST_FILE))
+        return cls(directory)
+
+    @staticmethod
+    def _raw_path(directory: str, column: str) -> str:
+        return os.path.join(directory, f"{column}.raw")
+
+    @staticmethod
+    def _column_path(directory: str, column: str) -> str:
+        return os.path.join(directory, f"{column}.npy")
+
+    def column(self, name: str) -> np.ndarray:
+        """A column as a read-only memory-mapped array."""
+        if name not in self.manifest["columns"]:
+            raise KeyError(f"The training store has no column {name}.")
+        if not self.rows:
+            return np.zeros(0, dtype=np.dtype(self.manifest["columns"][name]))
+        return np.load(self._column_path(self.directory, name), mmap_mode="r")
+
+    def to_frame(self, columns: Optional[Sequence[str]] = None, start: int = 0, stop: Optional[int] = None) -> pd.DataFrame:
+        """The rows from start to stop of the given columns, every column by default, read into a DataFrame."""
+        names = list(columns) if columns is not None else self.columns
+        return pd.DataFrame({name: np.array(self.column(name)[start:stop]) for name in names},
+                            index=pd.RangeIndex(start, min(stop if stop is not None else self.rows, self.rows)))
+
+    def iter_chunks(self, columns: Optional[Sequence[str]] = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+        """The rows as DataFrames of at most chunk_size rows, indexed by their row number in the store."""
+        for start in range(0, self.rows, chunk_size):
+            yield self.to_frame(columns, start, start + chunk_size)
+
+    def feature_matrix(self, pipeline: FeaturePipeline, chunk_size: int = DEFAULT_CHUNK_SIZE) -> np.ndarray:
+        """
+        The pipeline's model input for every row, memory-mapped. Built chunk by chunk on first use and cached
+        in the store, where every later call with a pipeline of the same parameters finds it.
+        """
+        key = hashlib.sha1(json.dumps(pipeline.to_dict(), sort_keys=True).encode("utf-8")).hexdigest()[:16]
+        path = os.path.join(self.directory, FEATURES_DIR, f"{key}.npy")
+        if not self.rows:
+            return np.zeros((0, len(pipeline.model_columns)), dtype=np.float64)
+        if os.path.exists(path):
+            return np.load(path, mmap_mode="r")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = path + ".tmp"
+        matrix = np.lib.format.open_memmap(temporary, mode="w+", dtype=np.float64, shape=(self.rows, len(pipeline.model_columns)))
+        columns = {field: self.column(field) for field in pipeline.input_fields}
+        for start in range(0, self.rows, chunk_size):
+            stop = min(start + chunk_size, self.rows)
+            matrix[start:stop] = pipeline.transform_columns({field: values[start:stop] for field, values in columns.items()}, stop - start)
+        matrix.flush()
+        del matrix
+        os.replace(temporary, path)
+        return np.load(path, mmap_mode="r")
+
+    def __len__(self):
+        return self.rows
+
+    def __repr__(self):
+        return f"<TrainingStore(directory={self.directory}, rows={self.rows}, columns={len(self.columns)})>"
@@ -3,101 +3,300 @@ import os
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(parent_dir)
 from sqlalchemy.orm import Session
-from main_components.models import Booking, Screening, Ticket, Seat, Cinema, City, SeatAvailability
-from main_components.enums import PaymentStatus
+from sqlalchemy import and_, or_, insert
+from sqlalchemy.exc import OperationalError, IntegrityError
+from main_components.models import Booking, Screening, Ticket, Seat, Cinema, City, SeatAvailability, SeatHold
+from main_components.enums import PaymentStatus, CancellationStatus
 import uuid
+import time
+import random
+import threading
 from datetime import datetime, timedelta
 from main_components.services.ticket_service import TicketService
+from main_components.services.seat_service import invalidate_availability_map
+from main_components.services.reporting_service import ReportingService
 import logging 
-from typing import List
+from typing import List, Dict, Tuple
 
 logging.basicConfig(level=logging.INFO)
 
+# Seat claim modes: "cas" relies on the conditional UPDATE alone (compare-and-set),
+# "lock" additionally takes row locks with SELECT ... FOR UPDATE before claiming.
+CLAIM_MODE_CAS = "cas"
+CLAIM_MODE_LOCK = "lock"
+MAX_CLAIM_RETRIES = 5
+RETRY_BACKOFF_SECONDS = 0.05
+RETRYABLE_MYSQL_ERRORS = (1205, 1213)  # Lock wait timeout, deadlock.
+HOLD_TTL_SECONDS = 300  # How long seats stay held while the booking dialog is open.
+HOLD_REAPER_INTERVAL_SECONDS = 30
+HOLD_REAPER_BATCH_SIZE = 500
+SEAT_TYPE_PRICE_MULTIPLIERS = {'Upper': 1.2, 'VIP': 1.2 * 1.2}  # Lower hall seats are charged the base city price.
+
 class BookingNotFoundError(Exception):
     pass
 
 class BookingTimeoutError(Exception):
     pass
 
+class SeatUnavailableError(ValueError):
+    pass
+
 
 class BookingService:
-    def __init__(self, session: Session, ticket_service: TicketService):
+    def __init__(self, session: Session, ticket_service: TicketService, claim_mode: str = CLAIM_MODE_CAS, max_retries: int = MAX_CLAIM_RETRIES):
+        if claim_mode not in (CLAIM_MODE_CAS, CLAIM_MODE_LOCK):
+            raise ValueError(f"Unknown seat claim mode: {claim_mode}")
         self.session = session
         self.ticket_service = ticket_service
+        self.claim_mode = claim_mode
+        self.max_retries = max_retries
 
-    def create_booking(self, seat_ids : List[str], customer_name:str, customer_email:str = None, customer_phone:str = None, screening_id : int = None) -> Booking:
-        """Creates a new booking."""
+    def create_booking(self, seat_ids : List[str], customer_name:str, customer_email:str = None, customer_phone:str = None, screening_id : int = None, hold_id: str = None) -> Booking:
+        """Creates a new booking. Seats held under hold_id may be booked, the hold is released on success."""
         bookings = []
         try:
             booking_id = str(uuid.uuid4())
 
             # Bookings can only be booked up to one week in advance of a screening.
-            # Validate screening date.
-            screening = self.session.query(Screening).filter_by(screening_id=screening_id).first()
-            if not screening:
+            # Validate screening date, and resolve the city prices of the screening's cinema in the same query.
+            result = self.session.query(Screening, City.city_id, City.price_morning, City.price_afternoon, City.price_evening).join(
+                Cinema, Cinema.cinema_id == Screening.cinema_id
+            ).join(City, City.city_id == Cinema.city_id).filter(Screening.screening_id == screening_id).first()
+            if not result:
                 raise ValueError(f"Screening with ID {screening_id} not found.")
+            screening = result.Screening
             one_week_ahead = datetime.now().date() + timedelta(days=7) # Get date one week ahead.
             if screening.date > one_week_ahead: # Meaning screening date is more than one week ahead.
                 raise ValueError("Bookings can only be made up to one week in advance.")
-            
-            for seat_id in seat_ids:
-                # Check if seat is available
-                seat_availability = self.session.query(SeatAvailability).filter_by(seat_id=seat_id, screening_id=screening_id).first()
-                if not seat_availability or seat_availability.seat_availability == 0:
-                    raise ValueError(f"Seat with ID {seat_id} is not available for screening {screening_id}.")
-
-                # Check for duplicate seat_id for the same booking_id
-                existing_booking = self.session.query(Booking).filter_by(booking_id=booking_id, seat_id=seat_id).first()
-                if existing_booking:
-                    raise ValueError(f"Seat {seat_id} already booked for booking {booking_id}")
-            
-                booking = Booking(booking_id=booking_id, seat_id=seat_id, customer_name=customer_name, customer_email=customer_email, customer_phone=customer_phone)
-                self.session.add(booking)
-                bookings.append(booking)
-
-            # Second loop: Update seat availability after all seats are checked.
-            for seat_id in seat_ids:
-                seat_availability = self.session.query(SeatAvailability).filter_by(seat_id=seat_id,screening_id=screening_id).first()
-                seat_availability.seat_availability = 0
-                seat_availability.booking_id = booking_id
-
-            self.session.commit()  # Commit after updating availability.
-
-
-            # Get cinema from seatid (using the first seat_id).
-            if seat_ids:
-                seat = self.session.query(Seat).filter_by(seat_id=seat_ids[0]).first()
-                if seat:
-                    seat_type = seat.seat_type
-                    cinema_id = seat.cinema_id
-                    cinema = self.session.query(Cinema).filter_by(cinema_id=cinema_id).first()
-                    if cinema:
-                        city = self.session.query(City).filter_by(city_id=cinema.city_id).first()
-                        if city:
-                            if datetime.now().hour < 12:
-                                ticket_price = city.price_morning
-                            elif datetime.now().hour < 18:
-                                ticket_price = city.price_afternoon
-                            else:
-                                ticket_price = city.price_evening
-
-                        if seat_type == 'Upper':
-                            ticket_price = ticket_price * 1.2
-                        elif seat_type == 'VIP':
-                            ticket_price = (ticket_price * 1.2) * 1.2
-                        # Create ticket for all seats from booking.
-                        for seat_id in seat_ids:
-                            ticket = Ticket(booking_id=booking_id, seat_id=seat_id, ticket_price=ticket_price, payment_status= PaymentStatus.PAID)
-                            self.session.add(ticket)
-                        self.session.commit()
+            base_price = self.get_base_price(screening.start_time, result.price_morning, result.price_afternoon, result.price_evening)
+
+            # Deadlocks and lock timeouts are transient when several terminals book the same screening, so retry them.
+            for attempt in range(self.max_retries + 1):
+                try:
+                    bookings, seat_types = self.reserve_seats(booking_id, seat_ids, screening_id, customer_name, customer_email, customer_phone, hold_id)
+                    tickets = self.issue_tickets(booking_id, seat_types, base_price)
+                    ReportingService(self.session).record_sales(
+                        ReportingService.sale_row(ticket["issue_date"], screening_id, screening.film_id, screening.cinema_id, result.city_id, ticket["ticket_price"])
+                        for ticket in tickets)
+                    self.session.commit()  # Seats, bookings, tickets and sales totals are committed together.
+                    invalidate_availability_map(screening_id)
+                    break
+                except OperationalError as e:
+                    self.session.rollback()
+                    if attempt == self.max_retries or not self._is_retryable(e):
+                        raise
+                    logging.warning(f"Seat claim for screening {screening_id} hit a lock conflict, retrying (attempt {attempt + 1}).")
+                    time.sleep(RETRY_BACKOFF_SECONDS * (2 ** attempt) * (1 + random.random()))
             return bookings
         except Exception as e:
             self.session.rollback()
+            invalidate_availability_map(screening_id) # The cached map may have missed a booking from another terminal.
             logging.error(f"Failed to create booking: {e}")
             print(f"Unexpected error occured : {e}")
             return None
         
 
+    def reserve_seats(self, booking_id: str, seat_ids: List[str], screening_id: int, customer_name: str, customer_email: str = None, customer_phone: str = None, hold_id: str = None) -> Tuple[List[Booking], Dict[str, str]]:
+        """
+        Claims every requested seat of a screening for one booking in a constant number of statements.
+
+        One IN-list SELECT checks that all seats are free, the booking rows are inserted in a single flush,
+        and one conditional UPDATE claims the seats. The UPDATE only touches rows that are still available,
+        so its affected row count proves that no seat was taken in the meantime, even by a concurrent
+        terminal. In "lock" claim mode the SELECT also locks the rows. Seats with a live hold are only
+        available to the owner of that hold, whose hold is released together with the claim. Does not commit.
+
+        Returns:
+            tuple: The new bookings, and the seat type of every claimed seat keyed by seat ID.
+        Raises:
+            SeatUnavailableError: If a seat is missing, already taken, or requested twice.
+        """
+        if not seat_ids:
+            raise ValueError("At least one seat must be selected.")
+        if len(set(seat_ids)) != len(seat_ids):
+            raise SeatUnavailableError(f"Duplicate seats requested for booking {booking_id}.")
+
+        availability_query = self.session.query(SeatAvailability.seat_id, Seat.seat_type).join(
+            Seat, Seat.seat_id == SeatAvailability.seat_id
+        ).outerjoin(SeatHold, and_(
+            SeatHold.screening_id == SeatAvailability.screening_id,
+            SeatHold.seat_id == SeatAvailability.seat_id,
+            SeatHold.expires_at > datetime.now()
+        )).filter(
+            SeatAvailability.screening_id == screening_id,
+            SeatAvailability.seat_id.in_(seat_ids),
+            SeatAvailability.seat_availability == 1,
+            or_(SeatHold.hold_id.is_(None), SeatHold.hold_id == hold_id)
+        )
+        if self.claim_mode == CLAIM_MODE_LOCK:
+            availability_query = availability_query.with_for_update()  # Row locks are held until commit or rollback.
+        seat_types = {row.seat_id: row.seat_type for row in availability_query}
+        unavailable = [seat_id for seat_id in seat_ids if seat_id not in seat_types]
+        if unavailable:
+            raise SeatUnavailableError(f"Seats {', '.join(unavailable)} are not available for screening {screening_id}.")
+
+        bookings = [
+            Booking(booking_id=booking_id, seat_id=seat_id, customer_name=customer_name, customer_email=customer_email, customer_phone=customer_phone)
+            for seat_id in seat_ids
+        ]
+        self.session.add_all(bookings)
+        self.session.flush()  # Booking rows must exist before seat_availability can reference them.
+
+        claimed = self.session.query(SeatAvailability).filter(
+            SeatAvailability.screening_id == screening_id,
+            SeatAvailability.seat_id.in_(seat_ids),
+            SeatAvailability.seat_availability == 1
+        ).update({SeatAvailability.seat_availability: 0, SeatAvailability.booking_id: booking_id}, synchronize_session=False)
+
+        if claimed != len(seat_ids):
+            raise SeatUnavailableError(f"Some seats were booked by another terminal for screening {screening_id}.")
+        if hold_id:
+            self.session.query(SeatHold).filter(SeatHold.hold_id == hold_id).delete(synchronize_session=False)
+        return bookings, seat_types
+
+    @staticmethod
+    def get_base_price(start_time, price_morning: float, price_afternoon: float, price_evening: float) -> float:
+        """Returns the city's lower hall price for a screening starting at start_time."""
+        if start_time.hour < 12:
+            return price_morning
+        elif start_time.hour < 18:
+            return price_afternoon
+        return price_evening
+
+    @staticmethod
+    def get_ticket_price(base_price: float, seat_type: str) -> float:
+        """Returns the price of a seat: Upper seats cost 20% more than Lower seats and VIP seats 20% more than Upper."""
+        return base_price * SEAT_TYPE_PRICE_MULTIPLIERS.get(seat_type, 1)
+
+    def issue_tickets(self, booking_id: str, seat_types: Dict[str, str], base_price: float) -> List[Dict]:
+        """Prices every seat by its own seat type and inserts all tickets with a single bulk INSERT. Does not commit. Returns the inserted rows."""
+        issue_date = datetime.now()
+        tickets = [
+            {
+                "booking_id": booking_id,
+                "seat_id": seat_id,
+                "ticket_price": self.get_ticket_price(base_price, seat_type),
+                "issue_date": issue_date,
+                "payment_status": PaymentStatus.PAID,
+            }
+            for seat_id, seat_type in seat_types.items()
+        ]
+        self.session.execute(insert(Ticket), tickets)
+        return tickets
+
+    def hold_seats(self, seat_ids: List[str], screening_id: int, hold_id: str = None, ttl_seconds: int = HOLD_TTL_SECONDS) -> str:
+        """
+        Temporarily holds seats for a screening so they cannot be booked by another terminal.
+
+        Passing an existing hold_id adds the seats to that hold and extends its expiry for all of its seats.
+
+        Returns:
+            str: The hold ID.
+        Raises:
+            SeatUnavailableError: If a seat is booked or held by someone else.
+        """
+        if not seat_ids:
+            raise ValueError("At least one seat must be selected.")
+        hold_id = hold_id or str(uuid.uuid4())
+        now = datetime.now()
+        expires_at = now + timedelta(seconds=ttl_seconds)
+        try:
+            # Expired holds on the requested seats no longer count, clear them so they can be re-inserted.
+            self.session.query(SeatHold).filter(
+                SeatHold.screening_id == screening_id,
+                SeatHold.seat_id.in_(seat_ids),
+                SeatHold.expires_at <= now
+            ).delete(synchronize_session=False)
+
+            rows = self.session.query(SeatAvailability.seat_id, SeatHold.hold_id).outerjoin(SeatHold, and_(
+                SeatHold.screening_id == SeatAvailability.screening_id,
+                SeatHold.seat_id == SeatAvailability.seat_id
+            )).filter(
+                SeatAvailability.screening_id == screening_id,
+                SeatAvailability.seat_id.in_(seat_ids),
+                SeatAvailability.seat_availability == 1
+            ).all()
+            current_holders = {row.seat_id: row.hold_id for row in rows}
+            unavailable = [seat_id for seat_id in seat_ids if seat_id not in current_holders or current_holders[seat_id] not in (None, hold_id)]
+            if unavailable:
+                raise SeatUnavailableError(f"Seats {', '.join(unavailable)} are not available for screening {screening_id}.")
+
+            self.session.query(SeatHold).filter(SeatHold.hold_id == hold_id).update({SeatHold.expires_at: expires_at}, synchronize_session=False)
+            self.session.add_all([
+                SeatHold(screening_id=screening_id, seat_id=seat_id, hold_id=hold_id, expires_at=expires_at)
+                for seat_id in seat_ids if current_holders[seat_id] is None
+            ])
+            self.session.commit()
+            invalidate_availability_map(screening_id)
+            return hold_id
+        except IntegrityError:
+            # Another terminal inserted a hold on one of the seats between our check and insert.
+            self.session.rollback()
+            invalidate_availability_map(screening_id)
+            raise SeatUnavailableError(f"Some seats were held by another terminal for screening {screening_id}.")
+        except Exception:
+            self.session.rollback()
+            raise
+
+    def release_hold(self, hold_id: str, seat_ids: List[str] = None) -> int:
+        """Releases a hold, or only the given seats of it. Returns the number of seats released."""
+        try:
+            query = self.session.query(SeatHold).filter(SeatHold.hold_id == hold_id)
+            if seat_ids is not None:
+                query = query.filter(SeatHold.seat_id.in_(seat_ids))
+            screening_ids = {row.screening_id for row in query.with_entities(SeatHold.screening_id).distinct()}
+            released = query.delete(synchronize_session=False)
+            self.session.commit()
+            for screening_id in screening_ids:
+                invalidate_availability_map(screening_id)
+            return released
+        except Exception as e:
+            self.session.rollback()
+            logging.error(f"Failed to release hold {hold_id}: {e}")
+            return 0
+
+    def convert_hold_to_booking(self, hold_id: str, customer_name: str, customer_email: str = None, customer_phone: str = None) -> List[Booking]:
+        """
+        Books every seat of a hold for the customer.
+
+        Raises:
+            BookingTimeoutError: If the hold does not exist or any of its seats has expired.
+        """
+        holds = self.session.query(SeatHold).filter(SeatHold.hold_id == hold_id).all()
+        now = datetime.now()
+        if not holds or any(hold.is_expired(now) for hold in holds):
+            self.release_hold(hold_id)
+            raise BookingTimeoutError(f"Hold {hold_id} has expired, please select the seats again.")
+        seat_ids = [hold.seat_id for hold in holds]
+        return self.create_booking(seat_ids, customer_name, customer_email, customer_phone, holds[0].screening_id, hold_id=hold_id)
+
+    def expire_holds(self, batch_size: int = HOLD_REAPER_BATCH_SIZE) -> int:
+        """Deletes up to batch_size expired holds. Returns the number of seats released."""
+        try:
+            now = datetime.now()
+            expired_hold_ids = [row.hold_id for row in self.session.query(SeatHold.hold_id).filter(
+                SeatHold.expires_at <= now
+            ).distinct().limit(batch_size)]
+            if not expired_hold_ids:
+                return 0
+            released = self.session.query(SeatHold).filter(
+                SeatHold.hold_id.in_(expired_hold_ids),
+                SeatHold.expires_at <= now
+            ).delete(synchronize_session=False)
+            self.session.commit()
+            return released
+        except Exception as e:
+            self.session.rollback()
+            logging.error(f"Failed to expire seat holds: {e}")
+            return 0
+
+    @staticmethod
+    def _is_retryable(error: OperationalError) -> bool:
+        """Returns True for deadlocks and lock timeouts (MySQL) or a busy database (SQLite)."""
+        args = getattr(error.orig, "args", None)
+        code = args[0] if args else None
+        return code in RETRYABLE_MYSQL_ERRORS or "database is locked" in str(error.orig)
+
     def get_all_bookings(self) -> list[Booking]:
         """Retrieves all bookings."""
         bookings = self.session.query(Booking).all()
@@ -114,6 +313,11 @@ class BookingService:
         """Retrieves all bookings for a customer."""
         bookings = self.session.query(Booking).filter_by(customer_name=customer_name).all()
         return bookings
+
+    def get_bookings_by_customer_email(self, customer_email: str) -> list[Booking]:
+        """Retrieves all bookings made with an email address."""
+        bookings = self.session.query(Booking).filter_by(customer_email=customer_email).all()
+        return bookings
     
     def get_bookings_by_screening(self, screening_id: int) -> list[Booking]:
         """Retrieves all bookings for a screening."""
@@ -140,57 +344,110 @@ class BookingService:
 
     def cancel_booking(self, booking_id: str) -> bool:
         """Cancels a booking by its ID."""
-        bookings = self.session.query(Booking).filter_by(booking_id=booking_id).all()
-        if not bookings:
+        try:
+            status = self.cancel_bookings([booking_id])[booking_id]
+        except Exception as e:
+            logging.error(f"Failed to cancel booking {booking_id}: {e}")
+            return False
+        if status == CancellationStatus.NOT_FOUND:
             raise BookingNotFoundError(f"Booking with ID {booking_id} not found.")
+        if status == CancellationStatus.ALREADY_STARTED:
+            raise ValueError("Booking cannot be cancelled as the screening has already started.")
+        if status == CancellationStatus.NO_SCREENING:
+            logging.error(f"Screening not found for booking {booking_id}.")
+            return False
+        return True
+
+    def cancel_bookings(self, booking_ids: List[str], allow_started: bool = False) -> Dict[str, CancellationStatus]:
+        """
+        Cancels many bookings at once and deletes their tickets, as cancelling a single booking does.
+
+        One query resolves the screening of every booking, then the sales totals are reduced, and the tickets deleted,
+        the seats freed and the bookings deleted with one set-based statement each, all in a single transaction. Bookings for
+        screenings that have already started are skipped unless allow_started is True.
+
+        Returns:
+            dict: The CancellationStatus of every requested booking ID.
+        """
+        booking_ids = list(dict.fromkeys(booking_ids))  # Remove duplicates, keep order.
+        if not booking_ids:
+            return {}
         try:
-            # Get seat_id from the first booking
-            seat_id = bookings[0].seat_id
-            # Get screening id from seat id and booking id from seat_availability table.
-            seat_availability = self.session.query(SeatAvailability).filter_by(booking_id=booking_id, seat_id=seat_id).first()
-            if not seat_availability:
-                logging.error(f"SeatAvailability not found for booking {booking_id} and seat {seat_id}")
-                return False
-            screening_id = seat_availability.screening_id
-            # Get screening from screening id
-            screening = self.session.query(Screening).filter_by(screening_id=screening_id).first()
-            if screening:
-                # collect date and start time of screening:
-                date = screening.date
-                start_time = screening.start_time
-                # collect date and time currently
-                current_date = datetime.now().date()
-                current_time = datetime.now().time()
-                # Current date and time should be less than screening date and time to cancel booking.
-                if current_date < date or (current_date == date and current_time < start_time):
-                    # Get all tickets for this booking once.
-                    tickets = self.ticket_service.get_tickets_by_booking(booking_id=booking_id)
-                    # Get ticket ids from tickets
-                    ticket_ids = [ticket.ticket_id for ticket in tickets]
-                    # Update payment status of tickets to refunded
-                    self.ticket_service.update_payment_status(ticket_ids, PaymentStatus.REFUNDED)
-                    for booking in bookings:
-                        booking_to_delete = self.session.query(Booking).filter_by(
-                        booking_id=booking.booking_id, seat_id=booking.seat_id).first()
-                        if booking_to_delete:
-                            self.session.delete(booking_to_delete)
-                    #Update SeatAvailability
-                    self.session.query(SeatAvailability).filter_by(booking_id=booking_id).update({SeatAvailability.seat_availability: 1})
-                    self.session.commit()
-                    logging.info(f"Booking {booking_id} cancelled successfully.")
-                    return True
+            rows = self.session.query(Booking.booking_id, Screening.screening_id, Screening.date, Screening.start_time).outerjoin(
+                SeatAvailability, and_(SeatAvailability.booking_id == Booking.booking_id, SeatAvailability.seat_id == Booking.seat_id)
+            ).outerjoin(Screening, Screening.screening_id == SeatAvailability.screening_id).filter(
+                Booking.booking_id.in_(booking_ids)
+            ).distinct().all()
+
+            now = datetime.now()
+            results = {booking_id: CancellationStatus.NOT_FOUND for booking_id in booking_ids}
+            screening_ids = set()
+            for row in rows:
+                if row.screening_id is None:
+                    results[row.booking_id] = CancellationStatus.NO_SCREENING
+                elif not allow_started and datetime.combine(row.date, row.start_time) <= now:
+                    results[row.booking_id] = CancellationStatus.ALREADY_STARTED
                 else:
-                    raise ValueError("Booking cannot be cancelled as the screening has already started.")
-            else:
-                logging.error(f"Screening not found for booking {booking_id}.")
-                return False
-        except ValueError as e: #Catch Value errors, and re raise them.
-            self.session.rollback()
-            raise e
+                    results[row.booking_id] = CancellationStatus.CANCELLED
+                    screening_ids.add(row.screening_id)
+
+            cancelled_ids = [booking_id for booking_id, status in results.items() if status == CancellationStatus.CANCELLED]
+            if cancelled_ids:
+                reporting_service = ReportingService(self.session)
+                reporting_service.record_sales(reporting_service.get_ticket_sales(Ticket.booking_id.in_(cancelled_ids)), sign=-1)
+                # Bulk deletes skip the Booking.tickets cascade, the tickets are deleted explicitly on every backend.
+                self.session.query(Ticket).filter(Ticket.booking_id.in_(cancelled_ids)).delete(synchronize_session=False)
+                self.session.query(SeatAvailability).filter(SeatAvailability.booking_id.in_(cancelled_ids)).update(
+                    {SeatAvailability.seat_availability: 1, SeatAvailability.booking_id: None}, synchronize_session=False)
+                self.session.query(Booking).filter(Booking.booking_id.in_(cancelled_ids)).delete(synchronize_session=False)
+                self.session.commit()
+                self.session.expire_all()  # Loaded bookings, tickets and seats are out of date after the bulk statements.
+                for screening_id in screening_ids:
+                    invalidate_availability_map(screening_id)
+                logging.info(f"Cancelled {len(cancelled_ids)} bookings.")
+            return results
         except Exception as e:
             self.session.rollback()
-            logging.error(f"Failed to cancel booking {booking_id}: {e}")
-            return False
+            logging.error(f"Failed to cancel bookings {booking_ids}: {e}")
+            raise
 
-        
-    
\ No newline at end of file
+    def cancel_bookings_for_screening(self, screening_id: int, allow_started: bool = True) -> Dict[str, CancellationStatus]:
+        """Cancels and refunds every booking for a screening, for example when the screening is pulled."""
+        booking_ids = [row.booking_id for row in self.session.query(SeatAvailability.booking_id).filter(
+            SeatAvailability.screening_id == screening_id,
+            SeatAvailability.booking_id.isnot(None)
+        ).distinct()]
+        return self.cancel_bookings(booking_ids, allow_started=allow_started)
+
+
+class SeatHoldReaper(threading.Thread):
+    """Background thread that periodically deletes expired seat holds in batches."""
+
+    def __init__(self, session_factory, interval_seconds: float = HOLD_REAPER_INTERVAL_SECONDS, batch_size: int = HOLD_REAPER_BATCH_SIZE):
+        super().__init__(name="SeatHoldReaper", daemon=True)
+        self.session_factory = session_factory
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            self.reap()
+            self._stop_event.wait(self.interval_seconds)
+
+    def reap(self) -> int:
+        """Expires batches until fewer than a full batch is left. Returns the number of seats released."""
+        session = self.session_factory()
+        try:
+            booking_service = BookingService(session, TicketService(session))
+            total = 0
+            while True:
+                released = booking_service.expire_holds(self.batch_size)
+                total += released
+                if released < self.batch_size:
+                    return total
+        finally:
+            session.close()
+
+    def stop(self):
+        self._stop_event.set()
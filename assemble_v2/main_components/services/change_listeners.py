@@ -0,0 +1,22 @@
+import threading
+from typing import Callable, List
+
+# Called with screening_id, film_id, screen_id and cinema_id keywords after a screening, film or screen changed.
+# Caches built on top of the services, like the forecast cache, register here so the services do not import them.
+_listeners: List[Callable[..., None]] = []
+_listeners_lock = threading.Lock()
+
+
+def add_change_listener(listener: Callable[..., None]) -> None:
+    """Registers a callback run after a screening, film or screen was changed or deleted."""
+    with _listeners_lock:
+        if listener not in _listeners:
+            _listeners.append(listener)
+
+
+def notify_changed(screening_id: int = None, film_id: int = None, screen_id: str = None, cinema_id: int = None) -> None:
+    """Tells the registered listeners that a screening, film or screen changed."""
+    with _listeners_lock:
+        listeners = list(_listeners)
+    for listener in listeners:
+        listener(screening_id=screening_id, film_id=film_id, screen_id=screen_id, cinema_id=cinema_id)
@@ -4,6 +4,7 @@ parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(parent_dir)
 from sqlalchemy.orm import Session
 from main_components.models import Cinema, Film
+from main_components.services.change_listeners import notify_changed
 from typing import List, Optional
 from datetime import datetime
 import logging 
@@ -81,6 +82,7 @@ class FilmService:
             if film:
                 self.session.delete(film)
                 self.session.commit()
+                notify_changed(film_id=film_id)
             else:
                 raise ValueError(f"Film with ID {film_id} not found.")
         except Exception as e:
@@ -113,5 +115,6 @@ class FilmService:
             if movie_poster:
                 film.movie_poster = movie_poster
             self.session.commit()
+            notify_changed(film_id=film_id) # The release date and rating are model features.
             return film
         return None
@@ -0,0 +1,166 @@
+import sys
+import os
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(parent_dir)
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, func, insert
+from main_components.models import Ticket, SeatAvailability, Screening, Cinema, SalesRollup
+from main_components.enums import PaymentStatus
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Tuple
+import logging
+
+logging.basicConfig(level=logging.INFO)
+
+# Columns a sales report can be grouped by.
+SALES_GROUPINGS = {
+    "screening": SalesRollup.screening_id,
+    "film": SalesRollup.film_id,
+    "cinema": SalesRollup.cinema_id,
+    "city": SalesRollup.city_id,
+    "day": SalesRollup.sale_date,
+}
+
+
+class ReportingService:
+    """
+    Maintains and reads the sales rollups: tickets sold and revenue per screening and sale date.
+
+    A ticket counts as sold while its payment status is PAID. The booking and ticket services call
+    record_sales in the same transaction as the sale or refund, so the rollups always agree with the tickets.
+    """
+
+    def __init__(self, session: Session):
+        """Initializes the ReportingService with a session."""
+        self.session = session
+
+    def get_ticket_sales(self, *criteria, paid_only: bool = True) -> List[Dict]:
+        """
+        Resolves the tickets matching the criteria, by default only PAID ones, to rollup rows with their screening,
+        film, cinema and city, in one query. Must run while the tickets' seats still reference their booking.
+        """
+        if paid_only:
+            criteria += (Ticket.payment_status == PaymentStatus.PAID,)
+        rows = self.session.query(
+            Ticket.issue_date, Ticket.ticket_price, Screening.screening_id, Screening.film_id, Screening.cinema_id, Cinema.city_id
+        ).join(
+            SeatAvailability, and_(SeatAvailability.booking_id == Ticket.booking_id, SeatAvailability.seat_id == Ticket.seat_id)
+        ).join(Screening, Screening.screening_id == SeatAvailability.screening_id).join(
+            Cinema, Cinema.cinema_id == Screening.cinema_id
+        ).filter(*criteria).all()
+        return [self.sale_row(row.issue_date, row.screening_id, row.film_id, row.cinema_id, row.city_id, row.ticket_price) for row in rows]
+
+    @staticmethod
+    def sale_row(issue_date: datetime, screening_id: int, film_id: int, cinema_id: int, city_id: int, ticket_price: float) -> Dict:
+        """The rollup contribution of one ticket."""
+        return {
+            "sale_date": issue_date.date() if isinstance(issue_date, datetime) else issue_date,
+            "screening_id": screening_id,
+            "film_id": film_id,
+            "cinema_id": cinema_id,
+            "city_id": city_id,
+            "tickets_sold": 1,
+            "revenue": ticket_price,
+        }
+
+    def record_sales(self, sales: Iterable[Dict], sign: int = 1) -> None:
+        """
+        Adds (sign=1) or removes (sign=-1) ticket sales from the rollups with a single upsert. Does not commit.
+
+        Args:
+            sales (Iterable[Dict]): Rows as returned by sale_row or get_ticket_sales.
+        """
+        totals: Dict[Tuple[date, int], Dict] = {}
+        for sale in sales:
+            key = (sale["sale_date"], sale["screening_id"])
+            if key not in totals:
+                totals[key] = dict(sale, tickets_sold=0, revenue=0.0)
+            totals[key]["tickets_sold"] += sign * sale["tickets_sold"]
+            totals[key]["revenue"] += sign * sale["revenue"]
+        if not totals:
+            return
+        rows = list(totals.values())
+
+        dialect = self.session.get_bind().dialect.name
+        if dialect == "mysql":
+            from sqlalchemy.dialects.mysql import insert as upsert
+            statement = upsert(SalesRollup).values(rows)
+            statement = statement.on_duplicate_key_update(
+                tickets_sold=SalesRollup.tickets_sold + statement.inserted.tickets_sold,
+                revenue=SalesRollup.revenue + statement.inserted.revenue)
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as upsert
+            statement = upsert(SalesRollup).values(rows)
+            statement = statement.on_conflict_do_update(
+                index_elements=[SalesRollup.sale_date, SalesRollup.screening_id],
+                set_={"tickets_sold": SalesRollup.tickets_sold + statement.excluded.tickets_sold,
+                      "revenue": SalesRollup.revenue + statement.excluded.revenue})
+        else:
+            for row in rows:
+                updated = self.session.query(SalesRollup).filter_by(sale_date=row["sale_date"], screening_id=row["screening_id"]).update(
+                    {SalesRollup.tickets_sold: SalesRollup.tickets_sold + row["tickets_sold"], SalesRollup.revenue: SalesRollup.revenue + row["revenue"]},
+                    synchronize_session=False)
+                if not updated:
+                    self.session.execute(insert(SalesRollup), [row])
+            return
+        self.session.execute(statement)
+
+    def rebuild_sales_rollups(self) -> int:
+        """
+        Recomputes every rollup from the tickets, for the first deployment or after tickets were edited by hand.
+
+        Returns:
+            int: The number of rollup rows written.
+        """
+        try:
+            sale_date = func.date(Ticket.issue_date)
+            rows = self.session.query(
+                sale_date, Screening.screening_id, Screening.film_id, Screening.cinema_id, Cinema.city_id,
+                func.count(Ticket.ticket_id), func.sum(Ticket.ticket_price)
+            ).join(
+                SeatAvailability, and_(SeatAvailability.booking_id == Ticket.booking_id, SeatAvailability.seat_id == Ticket.seat_id)
+            ).join(Screening, Screening.screening_id == SeatAvailability.screening_id).join(
+                Cinema, Cinema.cinema_id == Screening.cinema_id
+            ).filter(Ticket.payment_status == PaymentStatus.PAID).group_by(
+                sale_date, Screening.screening_id, Screening.film_id, Screening.cinema_id, Cinema.city_id
+            ).all()  # Aggregated in the database, one row per screening and day.
+            self.session.query(SalesRollup).delete(synchronize_session=False)
+            self.record_sales({
+                "sale_date": date.fromisoformat(day) if isinstance(day, str) else day,
+                "screening_id": screening_id, "film_id": film_id, "cinema_id": cinema_id, "city_id": city_id,
+                "tickets_sold": tickets, "revenue": revenue
+            } for day, screening_id, film_id, cinema_id, city_id, tickets, revenue in rows)
+            self.session.commit()
+            self.session.expire_all()
+            logging.info(f"Rebuilt {len(rows)} sales rollups.")
+            return len(rows)
+        except Exception as e:
+            self.session.rollback()
+            logging.error(f"Failed to rebuild sales rollups: {e}")
+            raise
+
+    def get_sales(self, group_by: str, start_date: date = None, end_date: date = None, cinema_id: int = None,
+                  city_id: int = None, film_id: int = None) -> List[Dict]:
+        """
+        Tickets sold and revenue grouped by screening, film, cinema, city or day, read from the rollups.
+        Both dates are inclusive sale dates.
+
+        Returns:
+            List[Dict]: {"key", "tickets_sold", "revenue"} rows, ordered by key.
+        """
+        if group_by not in SALES_GROUPINGS:
+            raise ValueError(f"Cannot group sales by {group_by}, expected one of {', '.join(SALES_GROUPINGS)}.")
+        column = SALES_GROUPINGS[group_by]
+        query = self.session.query(column, func.sum(SalesRollup.tickets_sold), func.sum(SalesRollup.revenue))
+        if start_date:
+            query = query.filter(SalesRollup.sale_date >= start_date)
+        if end_date:
+            query = query.filter(SalesRollup.sale_date <= end_date)
+        if cinema_id is not None:
+            query = query.filter(SalesRollup.cinema_id == cinema_id)
+        if city_id is not None:
+            query = query.filter(SalesRollup.city_id == city_id)
+        if film_id is not None:
+            query = query.filter(SalesRollup.film_id == film_id)
+        rows = query.group_by(column).order_by(column).all()
+        return [{"key": key, "tickets_sold": int(tickets or 0), "revenue": round(float(revenue or 0), 2)} for key, tickets, revenue in rows]
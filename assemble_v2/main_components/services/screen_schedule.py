@@ -0,0 +1,119 @@
+import os
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, time, timedelta
+from typing import Hashable, Iterable, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from main_components.models import Screening, Film
+
+# Minutes a screen needs between two screenings, for cleaning and letting the audience out.
+CLEANUP_MINUTES = int(os.getenv("CINEMA_CLEANUP_MINUTES", "15"))
+
+
+def screening_interval(date_obj: date, start_time, runtime: Optional[int], cleanup_minutes: int = CLEANUP_MINUTES) -> Tuple[datetime, datetime]:
+    """
+    The time a screening occupies its screen: from its start until its film ends and the screen is cleaned.
+    A screening without a film occupies the screen for the cleanup time only.
+    """
+    if isinstance(start_time, datetime):
+        start_time = start_time.time()
+    start = datetime.combine(date_obj, start_time or time(0, 0))
+    return start, start + timedelta(minutes=(runtime or 0) + cleanup_minutes)
+
+
+class ScreenSchedule:
+    """
+    The intervals booked on one screen, sorted by start, with an O(log n) overlap check.
+
+    Besides the starts and ends, the index keeps the running maximum of the ends. An interval [start, end)
+    overlaps a booked one exactly when some booked interval starts before end and ends after start, that is
+    when the running maximum at the last start before end is after start: one bisect and one lookup. The
+    running maximum keeps the check right for schedules that already hold overlapping screenings.
+    """
+    def __init__(self):
+        self._starts: List[datetime] = []
+        self._ends: List[datetime] = []
+        self._keys: List[Hashable] = []
+        self._max_ends: List[datetime] = []
+
+    def add(self, key: Hashable, start: datetime, end: datetime) -> None:
+        """Books an interval under a key, a screening id or any other identifier."""
+        position = bisect_right(self._starts, start)
+        self._starts.insert(position, start)
+        self._ends.insert(position, end)
+        self._keys.insert(position, key)
+        self._max_ends.insert(position, end)
+        self._update_max_ends(position)
+
+    def remove(self, key: Hashable) -> bool:
+        """Removes the interval booked under a key. Returns False if there is none."""
+        if key not in self._keys:
+            return False
+        position = self._keys.index(key)
+        for values in (self._starts, self._ends, self._keys, self._max_ends):
+            del values[position]
+        self._update_max_ends(position)
+        return True
+
+    def _update_max_ends(self, position: int) -> None:
+        running = self._max_ends[position - 1] if position > 0 else None
+        for index in range(position, len(self._ends)):
+            running = self._ends[index] if running is None or self._ends[index] > running else running
+            if self._max_ends[index] == running and index > position:
+                return  # The maxima from here on are unchanged.
+            self._max_ends[index] = running
+
+    def find_conflict(self, start: datetime, end: datetime) -> Optional[Hashable]:
+        """The key of a booked interval overlapping [start, end), None if the screen is free for it."""
+        position = bisect_left(self._starts, end) - 1
+        if position < 0 or self._max_ends[position] <= start:
+            return None
+        while self._ends[position] <= start:  # The overlapping interval is the one that set the running maximum.
+            position -= 1
+        return self._keys[position]
+
+    def __len__(self):
+        return len(self._starts)
+
+
+class ScheduleConflict:
+    """A timetable entry that overlaps an existing screening or another entry on the same screen."""
+    def __init__(self, entry_index: int, screen_id: str, cinema_id: int, start: datetime, end: datetime,
+                 screening_id: int = None, other_entry_index: int = None):
+        self.entry_index = entry_index
+        self.screen_id = screen_id
+        self.cinema_id = cinema_id
+        self.start = start
+        self.end = end
+        self.screening_id = screening_id  # The existing screening it overlaps, if any.
+        self.other_entry_index = other_entry_index  # The earlier timetable entry it overlaps, if any.
+
+    def __str__(self):
+        other = f"screening {self.screening_id}" if self.screening_id is not None else f"timetable entry {self.other_entry_index}"
+        return (f"Screen {self.screen_id} of cinema {self.cinema_id} is not free from {self.start:%Y-%m-%d %H:%M} "
+                f"to {self.end:%H:%M}, it overlaps {other}.")
+
+    def __repr__(self):
+        return f"<ScheduleConflict(entry_index={self.entry_index}, screening_id={self.screening_id}, other_entry_index={self.other_entry_index})>"
+
+
+def load_screen_schedule(session: Session, screen_id: str, cinema_id: int, dates: Iterable[date],
+                         cleanup_minutes: int = CLEANUP_MINUTES, exclude_screening_ids: Iterable[int] = ()) -> ScreenSchedule:
+    """
+    Loads the screenings of one screen that can overlap screenings on the given dates: the ones on those dates
+    and on the days either side, as late screenings run past midnight. One query, using the screen and date index.
+    Screenings in exclude_screening_ids, the ones being moved, are left out.
+    """
+    excluded = set(exclude_screening_ids)
+    days = set()
+    for day in dates:
+        days.update((day - timedelta(days=1), day, day + timedelta(days=1)))
+    schedule = ScreenSchedule()
+    if not days:
+        return schedule
+    query = session.query(Screening.screening_id, Screening.date, Screening.start_time, Film.runtime).outerjoin(
+        Film, Film.film_id == Screening.film_id
+    ).filter(Screening.screen_id == screen_id, Screening.cinema_id == cinema_id, Screening.date.in_(sorted(days)))
+    for screening_id, day, start_time, runtime in query:
+        if screening_id not in excluded:
+            schedule.add(screening_id, *screening_interval(day, start_time, runtime, cleanup_minutes))
+    return schedule
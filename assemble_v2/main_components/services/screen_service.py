@@ -4,6 +4,7 @@ parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(parent_dir)
 from sqlalchemy.orm import Session
 from main_components.models import Screen
+from main_components.services.change_listeners import notify_changed
 from typing import List, Optional
 
 
@@ -65,6 +66,7 @@ class ScreenService:
             if row_number is not None:
                 screen.row_number = row_number
             self.session.commit()
+            notify_changed(screen_id=screen_id, cinema_id=cinema_id) # The capacity caps the forecasts.
             return screen
         return None
 
@@ -74,5 +76,6 @@ class ScreenService:
         if screen:
             self.session.delete(screen)
             self.session.commit()
+            notify_changed(screen_id=screen_id, cinema_id=cinema_id)
             return True
         return False
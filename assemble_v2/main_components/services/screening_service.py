@@ -4,7 +4,9 @@ parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(parent_dir)
 from sqlalchemy.orm import Session
 from main_components.models import Screening,Film
-from typing import List, Optional
+from main_components.services.change_listeners import notify_changed
+from main_components.services.screen_schedule import CLEANUP_MINUTES, ScheduleConflict, load_screen_schedule, screening_interval
+from typing import Dict, List, Optional
 from datetime import datetime, date
 
 class ScreeningService:
@@ -17,22 +19,82 @@ class ScreeningService:
         self.session = session
 
     def create_screening(self, film_id : int, screen_id : str, cinema_id : int, date : datetime, start_time : datetime, screening_availability : int) -> Screening:
-        """Creates a new screening."""
+        """
+        Creates a new screening.
 
-        # Check for duplicate screenings
-        existing_screening = self.session.query(Screening).filter_by(
-            screen_id=screen_id,
-            cinema_id=cinema_id,
-        ).first()
-
-        if existing_screening:
-            raise ValueError("A screening with the same screen and cinema already exists.")
+        Raises:
+            ValueError: If the film does not exist or the screen is not free for the film's runtime and cleanup.
+        """
+        conflicts = self.validate_timetable([{"film_id": film_id, "screen_id": screen_id, "cinema_id": cinema_id, "date": date, "start_time": start_time}])
+        if conflicts:
+            raise ValueError(str(conflicts[0]))
 
         screening = Screening.create_screening(film_id, screen_id, cinema_id, date, start_time, screening_availability)
         self.session.add(screening)
         self.session.commit()
         return screening
 
+    def create_screenings(self, entries: List[Dict]) -> List[Screening]:
+        """
+        Creates every screening of a timetable, for example a week of screenings, or none of them.
+
+        Args:
+            entries (List[Dict]): One dict per screening with film_id, screen_id, cinema_id, date, start_time
+                and optionally screening_availability, 1 by default.
+        Raises:
+            ValueError: If a film does not exist or any entry conflicts, listing every conflict.
+        """
+        conflicts = self.validate_timetable(entries)
+        if conflicts:
+            raise ValueError("\n".join(str(conflict) for conflict in conflicts))
+        screenings = [Screening.create_screening(entry["film_id"], entry["screen_id"], entry["cinema_id"], entry["date"], entry["start_time"],
+                                                 entry.get("screening_availability", 1)) for entry in entries]
+        self.session.add_all(screenings)
+        self.session.commit()
+        return screenings
+
+    def validate_timetable(self, entries: List[Dict], cleanup_minutes: int = CLEANUP_MINUTES) -> List[ScheduleConflict]:
+        """
+        Checks timetable entries against the screenings already on their screens and against each other.
+
+        Each screen's screenings on the entries' dates are loaded with one query into a ScreenSchedule, then
+        every entry is checked with a bisect and booked, in order, so a later entry overlapping an earlier one
+        conflicts with it. An entry with a screening_id is the new time of that screening, which is left out.
+
+        Args:
+            entries (List[Dict]): One dict per screening with film_id, screen_id, cinema_id, date, start_time
+                and optionally the screening_id of the screening being moved.
+        Returns:
+            List[ScheduleConflict]: The conflicting entries, in the order of entries. Empty if the timetable fits.
+        Raises:
+            ValueError: If an entry's film does not exist.
+        """
+        film_ids = {entry["film_id"] for entry in entries if entry.get("film_id") is not None}
+        runtimes = dict(self.session.query(Film.film_id, Film.runtime).filter(Film.film_id.in_(film_ids)).all()) if film_ids else {}
+        for film_id in film_ids - set(runtimes):
+            raise ValueError(f"Film with ID {film_id} not found.")
+
+        by_screen: Dict[tuple, List[int]] = {}
+        for index, entry in enumerate(entries):
+            by_screen.setdefault((entry["screen_id"], entry["cinema_id"]), []).append(index)
+
+        conflicts = []
+        for (screen_id, cinema_id), indices in by_screen.items():
+            moved = {entries[index]["screening_id"] for index in indices if entries[index].get("screening_id") is not None}
+            schedule = load_screen_schedule(self.session, screen_id, cinema_id, {entries[index]["date"] for index in indices},
+                                            cleanup_minutes, exclude_screening_ids=moved)
+            for index in indices:
+                entry = entries[index]
+                start, end = screening_interval(entry["date"], entry["start_time"], runtimes.get(entry.get("film_id")), cleanup_minutes)
+                conflict = schedule.find_conflict(start, end)
+                if conflict is None:
+                    schedule.add(("entry", index), start, end)
+                elif isinstance(conflict, tuple):
+                    conflicts.append(ScheduleConflict(index, screen_id, cinema_id, start, end, other_entry_index=conflict[1]))
+                else:
+                    conflicts.append(ScheduleConflict(index, screen_id, cinema_id, start, end, screening_id=conflict))
+        return sorted(conflicts, key=lambda conflict: conflict.entry_index)
+
     def get_screening_by_id(self, screening_id: int) -> Optional[Screening]:
         """Retrieves a screening by ID."""
         return self.session.query(Screening).filter_by(screening_id=screening_id).first()
@@ -62,6 +124,7 @@ class ScreeningService:
             
             screening.film_id = film_id # Connect film to screening
             self.session.commit()
+            notify_changed(screening_id=screening_id)
             return screening
         except Exception as e:
             self.session.rollback()
@@ -76,15 +139,34 @@ class ScreeningService:
             
             screening.film_id = None # Disconnect film from screening
             self.session.commit()
+            notify_changed(screening_id=screening_id)
             return screening
         except Exception as e:
             self.session.rollback()
             raise ValueError(f"Failed to remove film from screening {screening_id}: {e}")
 
     def update_screening(self, screening_id: int, film_id: int = None, screen_id: str = None, cinema_id : int = None,  date: datetime = None, start_time: datetime = None, screening_availability : int = None) -> Optional[Screening]:
-        """Updates a screening's details."""
+        """
+        Updates a screening's details.
+
+        Raises:
+            ValueError: If the screen is not free at the screening's new time, for its film's runtime and cleanup.
+        """
         screening = self.get_screening_by_id(screening_id)
         if screening:
+            if any(value is not None for value in (film_id, screen_id, cinema_id, date, start_time)):
+                # Check the screening's new slot against the other screenings on its screen, before changing it.
+                conflicts = self.validate_timetable([{
+                    "screening_id": screening_id,
+                    "film_id": film_id if film_id is not None else screening.film_id,
+                    "screen_id": screen_id if screen_id is not None else screening.screen_id,
+                    "cinema_id": cinema_id if cinema_id is not None else screening.cinema_id,
+                    "date": date if date is not None else screening.date,
+                    "start_time": start_time if start_time is not None else screening.start_time,
+                }])
+                if conflicts:
+                    raise ValueError(str(conflicts[0]))
+
             if film_id:
                 screening.set_film_id(film_id)
             if screen_id:
@@ -97,18 +179,9 @@ class ScreeningService:
                 screening.set_start_time(start_time)
             if screening_availability:
                 screening.set_screening_availability(screening_availability)
-            
-            # Check for duplicate screenings (excluding the screening being updated)
-            existing_screening = self.session.query(Screening).filter(
-                Screening.screen_id == (screen_id if screen_id is not None else screening.screen_id),
-                Screening.cinema_id == (cinema_id if cinema_id is not None else screening.cinema_id),
-                Screening.screening_id != screening_id  # Exclude the current screening
-            ).first()
-
-            if existing_screening:
-                raise ValueError("A screening with the same screen and cinema already exists.")
-            
+
             self.session.commit()
+            notify_changed(screening_id=screening_id)
             return screening
         return None
 
@@ -118,6 +191,7 @@ class ScreeningService:
         if screening:
             self.session.delete(screening)
             self.session.commit()
+            notify_changed(screening_id=screening_id)
             return True
         return False
     
@@ -3,8 +3,72 @@ import os
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(parent_dir)
 from sqlalchemy.orm import Session
-from main_components.models import Seat, SeatAvailability
-from typing import List
+from sqlalchemy import and_
+from main_components.models import Seat, SeatAvailability, SeatHold, Screening
+from main_components.enums import SeatState
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional
+import threading
+
+AVAILABILITY_MAP_MAX_AGE_SECONDS = 10  # Picks up bookings made by other terminals.
+
+
+class SeatAvailabilityMap:
+    """
+    Compact availability of every seat in a screening's screen.
+
+    Seats are numbered by ordinal (their position when sorted by seat number) and availability is
+    stored as one bit per ordinal in a bytearray. Live holds are kept in a small dict, as only a
+    handful of seats are held at any time. All lookups are O(1) and never touch the database.
+    """
+
+    def __init__(self, screening_id: int, seat_ids: List[str], available_seat_ids: set, holds: Dict[str, str], hold_expiry: Optional[datetime], loaded_at: datetime):
+        self.screening_id = screening_id
+        self.seat_ids = seat_ids  # ordinal -> seat_id
+        self._ordinals = {seat_id: ordinal for ordinal, seat_id in enumerate(seat_ids)}
+        self._bits = bytearray((len(seat_ids) + 7) // 8)
+        for seat_id in available_seat_ids:
+            ordinal = self._ordinals[seat_id]
+            self._bits[ordinal >> 3] |= 1 << (ordinal & 7)
+        self._holds = holds  # seat_id -> hold_id, live holds only
+        self.expires_at = loaded_at + timedelta(seconds=AVAILABILITY_MAP_MAX_AGE_SECONDS)
+        if hold_expiry is not None:
+            self.expires_at = min(self.expires_at, hold_expiry)  # A hold running out changes the map.
+
+    def is_available(self, seat_id: str) -> bool:
+        """Returns True if the seat is not booked. Holds are not taken into account."""
+        ordinal = self._ordinals.get(seat_id)
+        if ordinal is None:
+            return False
+        return bool(self._bits[ordinal >> 3] & (1 << (ordinal & 7)))
+
+    def get_state(self, seat_id: str, hold_id: str = None) -> SeatState:
+        """Returns the seat's state as seen by the owner of hold_id."""
+        if not self.is_available(seat_id):
+            return SeatState.BOOKED
+        holder = self._holds.get(seat_id)
+        if holder is not None and holder != hold_id:
+            return SeatState.HELD
+        return SeatState.AVAILABLE
+
+    def count_available(self) -> int:
+        return sum(bin(byte).count("1") for byte in self._bits)
+
+    def is_stale(self, now: datetime = None) -> bool:
+        return (now or datetime.now()) >= self.expires_at
+
+
+_availability_maps: Dict[int, SeatAvailabilityMap] = {}  # Process-wide cache, keyed by screening_id.
+_availability_maps_lock = threading.Lock()
+
+
+def invalidate_availability_map(screening_id: int = None) -> None:
+    """Drops the cached availability map of a screening, or of every screening if screening_id is None."""
+    with _availability_maps_lock:
+        if screening_id is None:
+            _availability_maps.clear()
+        else:
+            _availability_maps.pop(screening_id, None)
 
 
 class SeatService:
@@ -58,14 +122,8 @@ class SeatService:
         return None
     
     def check_seat_availability(self, screening_id : int, seat_id: str) -> bool:
-        """Checks if a seat is available."""
-        availability = self.session.query(SeatAvailability).filter_by(
-            screening_id=screening_id,
-            seat_id=seat_id,
-            seat_availability=1
-        ).first()
-
-        return availability is not None
+        """Checks if a seat is available, using the cached availability map."""
+        return self.get_availability_map(screening_id).is_available(seat_id)
     
     def update_seat_availability(self, screening_id : int,  seat_id: str, seat_availability: int) -> SeatAvailability:
         """Updates a seat's availability."""
@@ -76,5 +134,55 @@ class SeatService:
         if availability:
             availability.seat_availability = seat_availability
             self.session.commit()
+            invalidate_availability_map(screening_id)
             return availability
         return None
+
+    def get_seat_availability_for_booking(self, booking_id: str) -> List[SeatAvailability]:
+        """Retrieves the seats claimed by a booking."""
+        return self.session.query(SeatAvailability).filter_by(booking_id=booking_id).all()
+
+    def get_availability_map(self, screening_id: int) -> SeatAvailabilityMap:
+        """
+        Returns the availability map of a screening, loading it with a single query on a cache miss.
+        Cached maps are invalidated by bookings, cancellations, holds and availability updates.
+        """
+        now = datetime.now()
+        with _availability_maps_lock:
+            availability_map = _availability_maps.get(screening_id)
+        if availability_map is not None and not availability_map.is_stale(now):
+            return availability_map
+
+        rows = self.session.query(Seat.seat_id, SeatAvailability.seat_availability, SeatHold.hold_id, SeatHold.expires_at).join(
+            Screening, and_(Screening.screen_id == Seat.screen_id, Screening.cinema_id == Seat.cinema_id)
+        ).outerjoin(SeatAvailability, and_(
+            SeatAvailability.screening_id == Screening.screening_id,
+            SeatAvailability.seat_id == Seat.seat_id
+        )).outerjoin(SeatHold, and_(
+            SeatHold.screening_id == Screening.screening_id,
+            SeatHold.seat_id == Seat.seat_id,
+            SeatHold.expires_at > now
+        )).filter(Screening.screening_id == screening_id).all()
+
+        rows.sort(key=lambda row: int(row.seat_id.split('_')[-1]))  # Sort by seat number.
+        holds = {row.seat_id: row.hold_id for row in rows if row.hold_id is not None}
+        hold_expiry = min((row.expires_at for row in rows if row.expires_at is not None), default=None)
+        availability_map = SeatAvailabilityMap(
+            screening_id,
+            [row.seat_id for row in rows],
+            {row.seat_id for row in rows if row.seat_availability == 1},
+            holds,
+            hold_expiry,
+            now
+        )
+        with _availability_maps_lock:
+            _availability_maps[screening_id] = availability_map
+        return availability_map
+
+    def get_seat_states(self, screening_id: int, hold_id: str = None) -> Dict[str, SeatState]:
+        """
+        Returns the state of every seat in the screening's screen, ordered by seat number.
+        Seats held under hold_id are reported as available to the owner of that hold.
+        """
+        availability_map = self.get_availability_map(screening_id)
+        return {seat_id: availability_map.get_state(seat_id, hold_id) for seat_id in availability_map.seat_ids}
@@ -5,6 +5,7 @@ sys.path.append(parent_dir)
 from sqlalchemy.orm import Session
 from main_components.models import Ticket, SeatAvailability, Screening
 from main_components.enums import PaymentStatus
+from main_components.services.reporting_service import ReportingService
 from datetime import datetime, timedelta
 import logging 
 
@@ -50,6 +51,9 @@ class TicketService:
                 raise ValueError("Tickets can only be cancelled at least one day before the screening.")
             
             # Otherwise, cancel ticket at 50% charge.
+            if ticket.payment_status == PaymentStatus.PAID:
+                reporting_service = ReportingService(self.session)
+                reporting_service.record_sales(reporting_service.get_ticket_sales(Ticket.ticket_id == ticket_id), sign=-1)
             ticket_price = ticket.ticket_price
             ticket.ticket_price = ticket_price / 2
             ticket.payment_status = PaymentStatus.REFUNDED
@@ -75,6 +79,7 @@ class TicketService:
             if qr_code:
                 ticket.qr_code = qr_code
             if payment_status:
+                self.record_payment_status_change([ticket_id], payment_status)
                 ticket.payment_status = payment_status
             self.session.commit()
             logging.info(f"Ticket details updated for ticket {ticket_id}.")
@@ -86,6 +91,7 @@ class TicketService:
     def update_payment_status(self, ticket_ids: list[int], payment_status: PaymentStatus) -> bool:
         """Updates the payment status of multiple tickets."""
         try:
+            self.record_payment_status_change(ticket_ids, payment_status)
             self.session.query(Ticket).filter(Ticket.ticket_id.in_(ticket_ids)).update({Ticket.payment_status: payment_status}, synchronize_session='fetch')
             self.session.commit()
             logging.info(f"Payment status updated for tickets {ticket_ids}.")
@@ -93,4 +99,13 @@ class TicketService:
         except Exception as e:
             self.session.rollback()
             logging.error(f"Failed to update payment status for tickets {ticket_ids}: {e}")
-            return False
\ No newline at end of file
+            return False
+
+    def record_payment_status_change(self, ticket_ids: list[int], payment_status: PaymentStatus) -> None:
+        """Keeps the sales totals in step before tickets move into or out of the PAID status. Does not commit."""
+        reporting_service = ReportingService(self.session)
+        if payment_status == PaymentStatus.PAID:
+            reporting_service.record_sales(reporting_service.get_ticket_sales(
+                Ticket.ticket_id.in_(ticket_ids), Ticket.payment_status != PaymentStatus.PAID, paid_only=False))
+        else:
+            reporting_service.record_sales(reporting_service.get_ticket_sales(Ticket.ticket_id.in_(ticket_ids)), sign=-1)
@@ -0,0 +1,119 @@
+import sys
+import os
+import pytest
+from datetime import datetime, timedelta, time
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+assemble_path = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if assemble_path not in sys.path:
+    sys.path.insert(0, assemble_path)  # Makes the main_components package importable.
+
+from main_components.models import Base, City, Cinema, Screen, Film, Screening, Seat, SeatAvailability
+from main_components.services.booking_service import BookingService
+from main_components.services.seat_service import invalidate_availability_map
+from main_components.services.ticket_service import TicketService
+
+
+@pytest.fixture(autouse=True)
+def clear_availability_maps():
+    # The availability map cache is process-wide, every test starts with a fresh database.
+    invalidate_availability_map()
+    yield
+    invalidate_availability_map()
+
+
+@pytest.fixture
+def engine():
+    # A single shared in-memory SQLite connection stands in for the MySQL database.
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def session(engine):
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.rollback()
+    session.close()
+
+
+@pytest.fixture
+def count_statements(engine):
+    """Calling count_statements() starts counting: it returns the list every later statement sent to the database is appended to."""
+    listeners = []
+
+    def start():
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(engine, "before_cursor_execute", listener)
+        listeners.append(listener)
+        return statements
+    yield start
+    for listener in listeners:
+        event.remove(engine, "before_cursor_execute", listener)
+
+
+@pytest.fixture
+def booking_service(session):
+    return BookingService(session, TicketService(session))
+
+
+@pytest.fixture
+def city(session):
+    city = City(name="Bristol", country="UK", price_morning=6, price_afternoon=7, price_evening=8)
+    session.add(city)
+    session.commit()
+    return city
+
+
+@pytest.fixture
+def cinema(session, city):
+    cinema = Cinema(city_id=city.city_id, name="Test Cinema", address="1 Test Street")
+    session.add(cinema)
+    session.commit()
+    return cinema
+
+
+@pytest.fixture
+def screen(session, cinema):
+    screen = Screen(screen_id="S1", cinema_id=cinema.cinema_id, total_capacity=10, row_number=2)
+    session.add(screen)
+    session.commit()
+    return screen
+
+
+@pytest.fixture
+def film(session):
+    film = Film(name="Test Film", genre=["Action"], cast=["Someone"], description="A test film.", age_rating="PG",
+                critic_rating=7.5, runtime=120, release_date=datetime(2024, 1, 1).date())
+    session.add(film)
+    session.commit()
+    return film
+
+
+@pytest.fixture
+def seats(session, screen, cinema):
+    seats = []
+    for index in range(10):
+        seat = Seat(screen_id=screen.screen_id, cinema_id=cinema.cinema_id, seat_type="VIP" if index >= 8 else "Lower")
+        seat.seat_id = f"{screen.screen_id}_C{cinema.cinema_id}_{index + 1}"  # Deterministic ids, independent of the class counter.
+        seats.append(seat)
+    session.add_all(seats)
+    session.commit()
+    return seats
+
+
+@pytest.fixture
+def screening(session, film, screen, cinema, seats):
+    screening = Screening(film_id=film.film_id, screen_id=screen.screen_id, cinema_id=cinema.cinema_id,
+                          date=(datetime.now() + timedelta(days=1)).date(), start_time=time(19, 0))
+    session.add(screening)
+    session.commit()
+    session.add_all([SeatAvailability(screening_id=screening.screening_id, seat_id=seat.seat_id, booking_id=None) for seat in seats])
+    session.commit()
+    return screening
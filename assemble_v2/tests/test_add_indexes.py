@@ -0,0 +1,16 @@
+from sqlalchemy import inspect, text
+from main_components.models import Base
+from database.add_indexes import create_missing_indexes
+
+
+def test_create_missing_indexes_adds_only_missing_ones(engine):
+    declared = {index.name for table in Base.metadata.sorted_tables for index in table.indexes}
+    with engine.begin() as connection:
+        connection.execute(text("DROP INDEX ix_screenings_cinema_date"))
+        connection.execute(text("DROP INDEX ix_tickets_booking_id"))
+
+    assert create_missing_indexes(engine) == ["ix_screenings_cinema_date", "ix_tickets_booking_id"]
+    assert create_missing_indexes(engine) == []  # Running the migration again is a no-op.
+    inspector = inspect(engine)
+    existing = {index["name"] for table in inspector.get_table_names() for index in inspector.get_indexes(table)}
+    assert declared <= existing
@@ -0,0 +1,51 @@
+from main_components.management import Analyse_Predictions
+from main_components.management.Analyse_Predictions import PredictionAnalysisPage
+from main_components.services.cinema_service import CinemaService
+
+
+class Entry:
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+class Label:
+    text = None
+
+    def config(self, text):
+        self.text = text
+
+
+class MissingModelRegistry:
+    def get(self):
+        raise FileNotFoundError("demand_model.joblib")
+
+
+def prediction_page(session, cinema, screening):
+    """A PredictionAnalysisPage with its day sales entries filled in, without a Tk root."""
+    page = PredictionAnalysisPage.__new__(PredictionAnalysisPage)
+    page.session = session
+    page.cinema_service = CinemaService(session)
+    page.model_registry = MissingModelRegistry()
+    page.day_prediction_date_entry = Entry(screening.date.isoformat())
+    page.specific_cinema_id_entry = Entry(str(cinema.cinema_id))
+    page.specific_cinema_date_entry = Entry(screening.date.isoformat())
+    page.day_sales_result_label = Label()
+    page.specific_cinema_sales_result_label = Label()
+    return page
+
+
+def test_day_sales_predictions_report_a_missing_model_and_release_the_connection(session, cinema, screening, monkeypatch):
+    errors, releases = [], []
+    monkeypatch.setattr(Analyse_Predictions.messagebox, "showerror", lambda title, message: errors.append(title))
+    monkeypatch.setattr(Analyse_Predictions, "release_connection", lambda: releases.append(True))
+    page = prediction_page(session, cinema, screening)
+
+    page.predict_total_day_sales_for_all_cinemas()
+    page.predict_total_day_sales_for_specific_cinema()
+
+    assert errors == ["Prediction Error", "Prediction Error"]
+    assert len(releases) == 2
+    assert page.day_sales_result_label.text is None and page.specific_cinema_sales_result_label.text is None
@@ -0,0 +1,114 @@
+import datetime
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import GradientBoostingRegressor
+from sklearn.preprocessing import MinMaxScaler
+
+from main_components.prediction.batch_predictor import predict_batch
+from main_components.prediction.feature_pipeline import FeaturePipeline, MODEL_COLUMNS, NUMERICAL_COLUMNS
+
+
+def feature_row(date, capacity=100, release_date="2024-01-01", rating=7.0, evening=1, ticket_price=1000):
+    return {'capacity': capacity, 'release_date': release_date, 'date': date, 'rating': rating,
+            'show_time_category_Evening': evening, 'ticket_price': ticket_price}
+
+
+def training_features(frame, scaler):
+    """The features as preprocessing.py built them before pipelines were saved, kept as the reference."""
+    frame = frame.copy()
+    frame['date'] = pd.to_datetime(frame['date'])
+    frame['day_of_week'] = frame['date'].dt.day_name()
+    frame = pd.get_dummies(frame, columns=['day_of_week'])
+    for day in ['Friday', 'Monday', 'Saturday', 'Sunday', 'Thursday', 'Tuesday', 'Wednesday']:
+        if f'day_of_week_{day}' not in frame:
+            frame[f'day_of_week_{day}'] = False
+    frame['date'] = frame['date'].apply(lambda x: x.toordinal())
+    frame['release_date'] = pd.to_datetime(frame['release_date']).apply(lambda x: x.toordinal()).astype('int64')
+    frame[NUMERICAL_COLUMNS] = scaler.transform(frame[NUMERICAL_COLUMNS])
+    return frame[MODEL_COLUMNS].astype(float)
+
+
+@pytest.fixture(scope="module")
+def training_frame():
+    rng = np.random.default_rng(0)
+    size = 300
+    start = datetime.date(2024, 1, 1)
+    return pd.DataFrame({
+        'capacity': rng.integers(40, 200, size),
+        'ticket_price': rng.integers(500, 2000, size),
+        'release_date': [(start - datetime.timedelta(days=int(days))).isoformat() for days in rng.integers(0, 900, size)],
+        'rating': rng.uniform(1, 10, size),
+        'date': [(start + datetime.timedelta(days=int(days))).isoformat() for days in rng.integers(0, 400, size)],
+        'show_time_category_Evening': rng.integers(0, 2, size),
+    })
+
+
+@pytest.fixture(scope="module")
+def scaler(training_frame):
+    encoded = training_frame[NUMERICAL_COLUMNS].copy()
+    for column in ('date', 'release_date'):
+        encoded[column] = pd.to_datetime(encoded[column]).apply(lambda x: x.toordinal())
+    return MinMaxScaler().fit(encoded)
+
+
+@pytest.fixture(scope="module")
+def model(training_frame, scaler):
+    features = training_features(training_frame, scaler)
+    target = training_frame['capacity'] * (0.4 + 0.5 * training_frame['show_time_category_Evening'])
+    return GradientBoostingRegressor(n_estimators=20, random_state=0).fit(features, target)
+
+
+def test_pipeline_matches_the_training_features(training_frame, scaler):
+    pipeline = FeaturePipeline.from_scaler(scaler)
+
+    expected = training_features(training_frame, scaler).to_numpy()
+
+    np.testing.assert_allclose(pipeline.transform_frame(training_frame), expected, atol=1e-9)
+    np.testing.assert_allclose(pipeline.transform_rows(training_frame.to_dict("records")), expected, atol=1e-9)
+
+
+def test_fitted_pipeline_scales_like_a_min_max_scaler(training_frame, scaler):
+    fitted = FeaturePipeline.fit(training_frame, MODEL_COLUMNS)
+
+    np.testing.assert_allclose(fitted.transform_frame(training_frame), FeaturePipeline.from_scaler(scaler).transform_frame(training_frame), atol=1e-9)
+
+
+def test_pipeline_survives_a_save(training_frame, scaler, tmp_path):
+    pipeline = FeaturePipeline.from_scaler(scaler)
+    pipeline.save(str(tmp_path / "feature_pipeline.joblib"))
+
+    restored = FeaturePipeline.load(str(tmp_path / "feature_pipeline.joblib"))
+
+    assert restored.model_columns == pipeline.model_columns
+    np.testing.assert_array_equal(restored.transform_frame(training_frame), pipeline.transform_frame(training_frame))
+
+
+def test_day_of_week_and_dates_are_encoded(scaler):
+    pipeline = FeaturePipeline(MODEL_COLUMNS, {})  # Unscaled.
+    matrix = pipeline.transform_rows([feature_row("2023-11-06"), feature_row(datetime.date(2023, 11, 12), evening=0)])
+    assert matrix[0, MODEL_COLUMNS.index('date')] == datetime.date(2023, 11, 6).toordinal()
+    assert matrix[0, MODEL_COLUMNS.index('release_date')] == datetime.date(2024, 1, 1).toordinal()
+    assert matrix[0, MODEL_COLUMNS.index('day_of_week_Monday')] == 1
+    assert matrix[1, MODEL_COLUMNS.index('day_of_week_Sunday')] == 1
+    assert matrix[:, 5:].sum(axis=1).tolist() == [1, 1]
+    assert matrix[1, MODEL_COLUMNS.index('show_time_category_Evening')] == 0
+
+
+def test_batch_matches_per_row_predictions(model, scaler):
+    pipeline = FeaturePipeline.from_scaler(scaler)
+    start = datetime.date(2024, 3, 1)
+    rows = [feature_row(start + datetime.timedelta(days=offset % 14), capacity=40 + offset, rating=1 + offset % 9, evening=offset % 2)
+            for offset in range(60)]
+    expected = [min(round(model.predict(training_features(pd.DataFrame([row]), scaler))[0]), row['capacity']) for row in rows]
+
+    assert predict_batch(model, pipeline, rows).tolist() == expected
+
+
+def test_predictions_are_capped_at_capacity(model, scaler):
+    rows = [feature_row("2024-03-01", capacity=1)]
+    assert predict_batch(model, FeaturePipeline.from_scaler(scaler), rows).tolist() == [1]
+
+
+def test_empty_batch():
+    assert predict_batch(None, None, []).tolist() == []
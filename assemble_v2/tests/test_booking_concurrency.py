@@ -0,0 +1,67 @@
+import random
+import threading
+import pytest
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+from main_components.models import Base, Booking, SeatAvailability, Ticket
+from main_components.services.booking_service import BookingService, CLAIM_MODE_CAS, CLAIM_MODE_LOCK
+from main_components.services.ticket_service import TicketService
+
+WORKERS = 16
+ATTEMPTS_PER_WORKER = 10
+
+
+@pytest.fixture
+def engine(tmp_path):
+    # A file database so that every worker gets its own connection, like separate staff terminals.
+    engine = create_engine(f"sqlite:///{tmp_path / 'cinema.db'}", connect_args={"check_same_thread": False, "timeout": 5},
+                           pool_size=WORKERS, max_overflow=0)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.mark.parametrize("claim_mode", [CLAIM_MODE_CAS, CLAIM_MODE_LOCK])
+def test_concurrent_bookings_never_double_sell(engine, session, screening, seats, claim_mode):
+    screening_id = screening.screening_id
+    seat_ids = [seat.seat_id for seat in seats]
+    SessionFactory = sessionmaker(bind=engine)
+    barrier = threading.Barrier(WORKERS)
+    successful = []
+    errors = []
+
+    def worker(worker_id):
+        rng = random.Random(worker_id)
+        worker_session = SessionFactory()
+        booking_service = BookingService(worker_session, TicketService(worker_session), claim_mode=claim_mode)
+        try:
+            barrier.wait()
+            for _ in range(ATTEMPTS_PER_WORKER):
+                requested = rng.sample(seat_ids, rng.randint(1, 3))
+                bookings = booking_service.create_booking(requested, f"Worker {worker_id}", screening_id=screening_id)
+                if bookings:
+                    successful.append((bookings[0].booking_id, requested))
+        except Exception as e:
+            errors.append(e)
+        finally:
+            worker_session.close()
+
+    threads = [threading.Thread(target=worker, args=(worker_id,)) for worker_id in range(WORKERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert successful
+    sold = [seat_id for _, requested in successful for seat_id in requested]
+    assert len(sold) == len(set(sold))  # No seat was sold twice.
+
+    session.expire_all()
+    seat_bookings = session.query(Booking.seat_id, func.count()).group_by(Booking.seat_id).all()
+    assert all(count == 1 for _, count in seat_bookings)
+    assert session.query(Booking).count() == len(sold)
+    assert session.query(Ticket).count() == len(sold)
+    for booking_id, requested in successful:
+        claimed = session.query(SeatAvailability.seat_id).filter_by(screening_id=screening_id, booking_id=booking_id, seat_availability=0).all()
+        assert sorted(row.seat_id for row in claimed) == sorted(requested)
@@ -0,0 +1,52 @@
+from main_components.management import booking_management
+from main_components.management.booking_management import BookingManagement
+from main_components.models import SeatHold
+from main_components.services.screening_service import ScreeningService
+
+
+class Entry:
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+class Window:
+    destroyed = False
+
+    def destroy(self):
+        self.destroyed = True
+
+
+def booking_window(booking_service, session, screening, seats):
+    """A BookingManagement with its create booking window filled in, without a Tk root."""
+    frame = BookingManagement.__new__(BookingManagement)
+    frame.cinema_id = "all"
+    frame.session = session
+    frame.booking_service = booking_service
+    frame.screening_service = ScreeningService(session)
+    frame.selected_seats = [seats[0].seat_id, seats[1].seat_id]
+    frame.hold_id = booking_service.hold_seats(frame.selected_seats, screening.screening_id)
+    frame.screening_combobox = Entry(f"{screening.film.name} ({screening.film_id}) - {screening.date.strftime('%Y-%m-%d')} "
+                                     f"{screening.start_time.strftime('%H:%M')} - Cinema {screening.cinema.name}")
+    frame.name_entry = Entry("Alice")
+    frame.email_entry = Entry("alice@example.com")
+    frame.phone_entry = Entry("0123456789")
+    frame.create_window = Window()
+    return frame
+
+
+def test_failed_booking_releases_the_hold_and_closes_the_window(booking_service, session, screening, seats, monkeypatch):
+    errors = []
+    monkeypatch.setattr(booking_management.messagebox, "askyesno", lambda *args: True)
+    monkeypatch.setattr(booking_management.messagebox, "showerror", lambda title, message: errors.append(message))
+    monkeypatch.setattr(booking_service, "create_booking", lambda *args, **kwargs: None)  # create_booking logs errors and returns None.
+    frame = booking_window(booking_service, session, screening, seats)
+
+    frame.confirm_booking()
+
+    assert errors == ["Booking creation failed. Please check the logs for details."]
+    assert frame.hold_id is None
+    assert frame.create_window.destroyed
+    assert session.query(SeatHold).count() == 0  # The seats are free again, not held until the hold expires.
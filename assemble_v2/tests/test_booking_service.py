@@ -0,0 +1,121 @@
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from main_components.models import Booking, SeatAvailability, SeatHold, Ticket
+from main_components.enums import SeatState, CancellationStatus
+from main_components.services.booking_service import BookingNotFoundError, BookingTimeoutError, SeatHoldReaper, SeatUnavailableError
+from main_components.services.seat_service import SeatService
+
+
+def test_create_booking_claims_all_seats(booking_service, session, screening, seats):
+    seat_ids = [seat.seat_id for seat in seats[:3]]
+    bookings = booking_service.create_booking(seat_ids, "Alice", "alice@example.com", "0123456789", screening.screening_id)
+
+    assert [booking.seat_id for booking in bookings] == seat_ids
+    booking_id = bookings[0].booking_id
+    claimed = session.query(SeatAvailability).filter_by(screening_id=screening.screening_id, booking_id=booking_id).all()
+    assert sorted(row.seat_id for row in claimed) == sorted(seat_ids)
+    assert all(row.seat_availability == 0 for row in claimed)
+    assert session.query(Ticket).filter_by(booking_id=booking_id).count() == 3
+
+
+def test_reserve_seats_uses_constant_number_of_statements(booking_service, session, count_statements, screening, seats):
+    seat_ids = [seat.seat_id for seat in seats]
+    screening_id = screening.screening_id
+    statements = count_statements()
+    booking_service.reserve_seats("b-small", seat_ids[:1], screening_id, "Alice")
+    small = len(statements)
+    statements.clear()
+    booking_service.reserve_seats("b-large", seat_ids[1:], screening_id, "Bob")
+    assert len(statements) == small
+
+
+def test_create_booking_rejects_taken_seat(booking_service, session, screening, seats):
+    booking_service.create_booking([seats[0].seat_id], "Alice", screening_id=screening.screening_id)
+    assert booking_service.create_booking([seats[1].seat_id, seats[0].seat_id], "Bob", screening_id=screening.screening_id) is None
+    # The free seat in the failed request must not be claimed.
+    assert session.query(SeatAvailability).filter_by(seat_id=seats[1].seat_id).one().seat_availability == 1
+    assert session.query(Booking).filter_by(customer_name="Bob").count() == 0
+
+
+def test_reserve_seats_rejects_duplicates(booking_service, screening, seats):
+    with pytest.raises(SeatUnavailableError):
+        booking_service.reserve_seats("b-dup", [seats[0].seat_id, seats[0].seat_id], screening.screening_id, "Alice")
+
+
+def test_held_seats_cannot_be_booked_by_others(booking_service, session, screening, seats):
+    hold_id = booking_service.hold_seats([seats[0].seat_id, seats[1].seat_id], screening.screening_id)
+    with pytest.raises(SeatUnavailableError):
+        booking_service.hold_seats([seats[1].seat_id], screening.screening_id)
+    assert booking_service.create_booking([seats[0].seat_id], "Bob", screening_id=screening.screening_id) is None
+
+    bookings = booking_service.convert_hold_to_booking(hold_id, "Alice")
+    assert sorted(booking.seat_id for booking in bookings) == sorted([seats[0].seat_id, seats[1].seat_id])
+    assert session.query(SeatHold).count() == 0
+
+
+def test_expired_hold_times_out_and_frees_seats(booking_service, session, screening, seats):
+    hold_id = booking_service.hold_seats([seats[0].seat_id], screening.screening_id, ttl_seconds=-1)
+    with pytest.raises(BookingTimeoutError):
+        booking_service.convert_hold_to_booking(hold_id, "Alice")
+    assert booking_service.hold_seats([seats[0].seat_id], screening.screening_id)
+
+
+def test_reaper_expires_holds_in_batches(booking_service, session, screening, seats):
+    for seat in seats[:5]:
+        booking_service.hold_seats([seat.seat_id], screening.screening_id, ttl_seconds=-1)
+    live_hold = booking_service.hold_seats([seats[5].seat_id], screening.screening_id)
+
+    reaper = SeatHoldReaper(lambda: session, batch_size=2)
+    assert reaper.reap() == 5
+    assert [hold.hold_id for hold in session.query(SeatHold).all()] == [live_hold]
+
+
+def test_seat_states_reflect_bookings_and_holds(booking_service, session, screening, seats):
+    booking_service.create_booking([seats[0].seat_id], "Alice", screening_id=screening.screening_id)
+    other_hold = booking_service.hold_seats([seats[1].seat_id], screening.screening_id)
+    own_hold = booking_service.hold_seats([seats[2].seat_id], screening.screening_id)
+
+    states = SeatService(session).get_seat_states(screening.screening_id, own_hold)
+    assert list(states) == [seat.seat_id for seat in seats]
+    assert states[seats[0].seat_id] == SeatState.BOOKED
+    assert states[seats[1].seat_id] == SeatState.HELD
+    assert states[seats[2].seat_id] == SeatState.AVAILABLE
+
+
+def test_create_booking_prices_each_seat_and_commits_once(booking_service, session, engine, screening, seats):
+    seat_ids = [seats[0].seat_id, seats[9].seat_id]  # A Lower and a VIP seat.
+    screening_id = screening.screening_id
+    commits = []
+    event.listen(engine, "commit", lambda connection: commits.append(connection))
+
+    bookings = booking_service.create_booking(seat_ids, "Alice", screening_id=screening_id)
+    assert len(commits) == 1
+
+    prices = {ticket.seat_id: ticket.ticket_price for ticket in session.query(Ticket).filter_by(booking_id=bookings[0].booking_id)}
+    assert prices[seat_ids[0]] == pytest.approx(8)  # Evening price in Bristol.
+    assert prices[seat_ids[1]] == pytest.approx(8 * 1.2 * 1.2)
+
+
+def test_cancel_bookings_in_bulk(booking_service, session, screening, seats):
+    first = booking_service.create_booking([seats[0].seat_id, seats[1].seat_id], "Alice", screening_id=screening.screening_id)[0].booking_id
+    second = booking_service.create_booking([seats[2].seat_id], "Bob", screening_id=screening.screening_id)[0].booking_id
+
+    results = booking_service.cancel_bookings([first, second, "missing"])
+    assert results == {first: CancellationStatus.CANCELLED, second: CancellationStatus.CANCELLED, "missing": CancellationStatus.NOT_FOUND}
+    assert session.query(Booking).count() == 0
+    assert session.query(Ticket).count() == 0  # Deleted with their bookings, as the cascade of a single delete does.
+    assert all(row.seat_availability == 1 and row.booking_id is None for row in session.query(SeatAvailability))
+
+
+def test_cancel_bookings_skips_started_screenings(booking_service, session, screening, seats):
+    booking_id = booking_service.create_booking([seats[0].seat_id], "Alice", screening_id=screening.screening_id)[0].booking_id
+    screening.date = (datetime.now() - timedelta(days=1)).date()
+    session.commit()
+
+    assert booking_service.cancel_bookings([booking_id]) == {booking_id: CancellationStatus.ALREADY_STARTED}
+    with pytest.raises(ValueError):
+        booking_service.cancel_booking(booking_id)
+    assert booking_service.cancel_bookings_for_screening(screening.screening_id) == {booking_id: CancellationStatus.CANCELLED}
+    with pytest.raises(BookingNotFoundError):
+        booking_service.cancel_booking(booking_id)
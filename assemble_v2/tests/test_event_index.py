@@ -0,0 +1,66 @@
+import time
+from datetime import datetime, timedelta
+from main_components.management.event_index import EventIndex
+from main_components.management.event_store import JsonlEventStore
+from main_components.management.booking_events_manager import BookingEventsManager
+
+START = datetime(2025, 1, 1)
+
+
+def make_event(number, booking_ids=None, event_type="booking", user_id=1, minutes=None):
+    return {"booking_id": booking_ids or [f"b{number}"], "user_id": user_id, "event_type": event_type, "event_data": {"number": number},
+            "timestamp": (START + timedelta(minutes=number if minutes is None else minutes)).isoformat()}
+
+
+def numbers(events):
+    return [event["event_data"]["number"] for event in events]
+
+
+def test_query_combines_date_range_and_hash_indexes():
+    index = EventIndex(make_event(n, event_type="cancellation" if n % 3 == 0 else "booking", user_id=n % 2) for n in range(30))
+    assert numbers(index.query(start_date=START + timedelta(minutes=10), end_date=START + timedelta(minutes=13))) == [10, 11, 12, 13]
+    assert numbers(index.query(event_type="cancellation", user_id=1)) == [3, 9, 15, 21, 27]
+    assert numbers(index.query(event_type="cancellation", start_date=START + timedelta(minutes=20))) == [21, 24, 27]
+    assert numbers(index.query(event_type="refund")) == []
+
+
+def test_booking_id_matches_every_event_of_the_booking():
+    index = EventIndex([make_event(0, ["a", "a", "b"]), make_event(1, "a", event_type="cancellation"), make_event(2, ["c"])])
+    assert numbers(index.query(booking_id="a")) == [0, 1]
+    assert numbers(index.query(booking_id=["a", "a", "b"])) == [0]
+
+
+def test_out_of_order_events_are_sorted():
+    index = EventIndex([make_event(0), make_event(2)])
+    index.add(make_event(1, event_type="cancellation"))
+    assert numbers(index.query()) == [0, 1, 2]
+    assert numbers(index.query(event_type="cancellation")) == [1]
+    assert numbers(index.query(booking_id="b2")) == [2]
+
+
+def test_pagination():
+    index = EventIndex(make_event(n) for n in range(25))
+    pages = list(index.iter_pages(page_size=10))
+    assert [len(page) for page in pages] == [10, 10, 5]
+    assert numbers(index.query(offset=20, limit=3)) == [20, 21, 22]
+
+
+def test_narrow_queries_on_a_large_log_are_fast():
+    index = EventIndex(make_event(n, user_id=n % 50) for n in range(100000))
+    started = time.perf_counter()
+    for _ in range(100):
+        events = list(index.query(user_id=7, start_date=START + timedelta(minutes=50000), end_date=START + timedelta(minutes=51000)))
+    assert len(events) == 20
+    assert (time.perf_counter() - started) / 100 < 0.01
+
+
+def test_manager_picks_up_events_written_by_other_terminals(tmp_path):
+    manager = BookingEventsManager(str(tmp_path / "booking_events.json"))
+    manager.log_event(["b0"], 1, "booking", {"number": 0})
+    assert numbers(manager.get_events()) == [0]
+
+    other_terminal = JsonlEventStore(str(tmp_path / "booking_events"))
+    other_terminal.append(make_event(1, minutes=10 ** 7))
+    other_terminal.close()
+    assert numbers(manager.get_events(booking_id="b1")) == [1]
+    assert [numbers(page) for page in manager.iter_event_pages(page_size=1)] == [[0], [1]]
@@ -0,0 +1,167 @@
+import json
+import os
+import threading
+import time
+import pytest
+from datetime import datetime, timedelta
+from main_components.management.event_store import AsyncEventWriter, EventStore, JsonlEventStore
+from main_components.management.booking_events_manager import BookingEventsManager
+
+
+def make_event(number, event_type="booking", timestamp=None):
+    return {"booking_id": [f"b{number}"], "user_id": 1, "event_type": event_type, "event_data": {"number": number},
+            "timestamp": (timestamp or datetime(2025, 1, 1)).isoformat()}
+
+
+def test_events_are_appended_and_streamed_in_order(tmp_path):
+    store = JsonlEventStore(str(tmp_path / "events"))
+    store.append_many([make_event(n) for n in range(5)])
+    store.append(make_event(5))
+    assert [event["event_data"]["number"] for event in store.iter_events()] == list(range(6))
+
+
+def test_segments_rotate_by_size(tmp_path):
+    store = JsonlEventStore(str(tmp_path / "events"), segment_max_bytes=400)
+    store.append_many([make_event(n) for n in range(20)])
+    store.close()
+
+    segments = store.segment_paths()
+    assert len(segments) > 1
+    assert all(os.path.getsize(path) <= 400 for path in segments)
+    reopened = JsonlEventStore(str(tmp_path / "events"), segment_max_bytes=400)
+    reopened.append(make_event(20))
+    assert [event["event_data"]["number"] for event in reopened.iter_events()] == list(range(21))
+
+
+def test_truncated_line_from_a_crash_is_skipped(tmp_path):
+    store = JsonlEventStore(str(tmp_path / "events"))
+    store.append(make_event(0))
+    store.close()
+    with open(store.segment_paths()[-1], "a") as f:
+        f.write('{"booking_id": ["b1"], "user')  # The process died mid-write.
+
+    reopened = JsonlEventStore(str(tmp_path / "events"))
+    reopened.append(make_event(2))
+    assert [event["event_data"]["number"] for event in reopened.iter_events()] == [0, 2]
+
+
+def test_legacy_json_file_is_migrated_once(tmp_path):
+    legacy = tmp_path / "booking_events.json"
+    legacy.write_text(json.dumps([make_event(0), make_event(1, "cancellation")], indent=4))
+
+    manager = BookingEventsManager(str(legacy))
+    assert not legacy.exists()
+    assert (tmp_path / "booking_events.json.migrated").exists()
+    manager.log_event(["b2"], 1, "booking", {"number": 2})
+    assert [event["event_data"]["number"] for event in BookingEventsManager(str(legacy)).get_events()] == [0, 1, 2]
+    assert len(manager.get_events(event_type="cancellation")) == 1
+
+
+def test_get_events_filters_by_date(tmp_path):
+    manager = BookingEventsManager(str(tmp_path / "booking_events.json"))
+    start = datetime(2025, 1, 1)
+    manager.store.append_many([make_event(n, timestamp=start + timedelta(days=n)) for n in range(10)])
+    events = manager.get_events(start_date=start + timedelta(days=3), end_date=start + timedelta(days=5))
+    assert [event["event_data"]["number"] for event in events] == [3, 4, 5]
+
+
+class SlowStore(EventStore):
+    """A store whose writes wait until the test releases them, like a stalled disk."""
+    def __init__(self, directory):
+        super().__init__()
+        self.store = JsonlEventStore(directory)
+        self.release = threading.Event()
+        self.batches = []
+
+    def append_many(self, events):
+        self.release.wait()
+        events = list(events)
+        self.batches.append(len(events))
+        self.store.append_many(events)
+
+    def iter_events(self):
+        return self.store.iter_events()
+
+    def read_since(self, position=None):
+        return self.store.read_since(position)
+
+    def read_page(self, position=None, limit=100, event_type=None, start_date=None, end_date=None):
+        return self.store.read_page(position, limit, event_type, start_date, end_date)
+
+    def count_by_hour(self, event_type=None, start_date=None, end_date=None):
+        return self.store.count_by_hour(event_type, start_date, end_date)
+
+    def count_by_user(self, event_type=None, start_date=None, end_date=None):
+        return self.store.count_by_user(event_type, start_date, end_date)
+
+    def count_by_screening(self, event_type=None, start_date=None, end_date=None):
+        return self.store.count_by_screening(event_type, start_date, end_date)
+
+    def count_by_event_type(self, event_type=None, start_date=None, end_date=None):
+        return self.store.count_by_event_type(event_type, start_date, end_date)
+
+    def flush(self):
+        self.store.flush()
+
+    def close(self):
+        self.store.close()
+
+
+def test_event_store_is_abstract():
+    class PartialStore(EventStore):
+        def append_many(self, events):
+            pass
+
+    with pytest.raises(TypeError):
+        PartialStore()
+
+
+def test_writer_batches_events_off_the_calling_thread(tmp_path):
+    store = SlowStore(str(tmp_path / "events"))
+    writer = AsyncEventWriter(store, batch_wait_seconds=0.05)
+    started = time.monotonic()
+    for n in range(50):
+        assert writer.submit(make_event(n))
+    assert time.monotonic() - started < 0.5  # The stalled disk did not slow the callers down.
+
+    store.release.set()
+    writer.flush()
+    assert [event["event_data"]["number"] for event in store.iter_events()] == list(range(50))
+    assert len(store.batches) < 50
+    assert writer.metrics()["written"] == 50
+    writer.close()
+
+
+def test_full_queue_blocks_then_drops_and_is_counted(tmp_path):
+    store = SlowStore(str(tmp_path / "events"))
+    writer = AsyncEventWriter(store, queue_size=2, batch_size=1, enqueue_timeout_seconds=0.05)
+    results = [writer.submit(make_event(n)) for n in range(5)]
+
+    metrics = writer.metrics()
+    assert results.count(False) == metrics["dropped"] > 0
+    assert metrics["blocked"] >= metrics["dropped"]
+    store.release.set()
+    writer.close()
+    assert len(list(store.iter_events())) == results.count(True)
+
+
+def test_close_writes_queued_events(tmp_path):
+    store = JsonlEventStore(str(tmp_path / "events"))
+    writer = AsyncEventWriter(store, batch_wait_seconds=1.0)
+    for n in range(3):
+        writer.submit(make_event(n))
+    writer.close()
+    assert len(list(JsonlEventStore(str(tmp_path / "events")).iter_events())) == 3
+
+
+def test_read_page_walks_the_filtered_log_page_by_page(tmp_path):
+    store = JsonlEventStore(str(tmp_path / "events"), segment_max_bytes=600)
+    store.append_many([make_event(n, "cancellation" if n % 2 else "booking", datetime(2025, 1, 1) + timedelta(hours=n)) for n in range(20)])
+
+    pages, position = [], None
+    while True:
+        page, position = store.read_page(position, limit=3, event_type="booking", start_date=datetime(2025, 1, 1, 4))
+        pages.append([event["event_data"]["number"] for event in page])
+        if position is None:
+            break
+    assert pages == [[4, 6, 8], [10, 12, 14], [16, 18]]
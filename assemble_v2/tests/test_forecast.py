@@ -0,0 +1,95 @@
+import os
+from datetime import date, time, timedelta
+import joblib
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+from sklearn.preprocessing import MinMaxScaler
+
+from main_components.models import Cinema, City, Film, Screen, Screening
+from main_components.prediction import forecast as forecast_module
+from main_components.prediction.feature_pipeline import MODEL_COLUMNS, NUMERICAL_COLUMNS
+from main_components.prediction.forecast import forecast_range
+from main_components.prediction.forecast_cache import get_forecast_cache
+from main_components.prediction.model_registry import ModelRegistry
+
+START = date(2025, 6, 2)
+
+
+@pytest.fixture
+def registry(tmp_path):
+    # Predicts 10 tickets plus 20 for evening shows.
+    features = pd.DataFrame(0.0, index=range(4), columns=MODEL_COLUMNS)
+    features['show_time_category_Evening'] = [0, 1, 0, 1]
+    model = LinearRegression().fit(features, 10 + 20 * features['show_time_category_Evening'])
+    scaler = MinMaxScaler().fit(pd.DataFrame([[0, 0, 40000, 0, 40000], [200, 2000, 50000, 10, 50000]], columns=NUMERICAL_COLUMNS))
+    joblib.dump(model, os.path.join(tmp_path, "gradient_boosting_model.joblib"))
+    joblib.dump(scaler, os.path.join(tmp_path, "scaler.joblib"))
+    return ModelRegistry(str(tmp_path))
+
+
+@pytest.fixture
+def timetable(session):
+    city = City(name="London", country="UK", price_morning=6, price_afternoon=7, price_evening=8)
+    session.add(city)
+    session.commit()
+    films = [Film(name=f"Film {index}", genre=["Drama"], cast=["Someone"], description="A film.", age_rating="PG",
+                  critic_rating=7.0, runtime=100, release_date=date(2025, 1, 1)) for index in range(2)]
+    session.add_all(films)
+    cinemas = [Cinema(city_id=city.city_id, name=f"Cinema {index}", address="1 Street") for index in range(2)]
+    session.add_all(cinemas)
+    session.commit()
+    for cinema in cinemas:
+        session.add(Screen(screen_id="S1", cinema_id=cinema.cinema_id, total_capacity=100, row_number=10))
+        for day in range(3):
+            session.add(Screening(film_id=films[0].film_id, screen_id="S1", cinema_id=cinema.cinema_id,
+                                  date=START + timedelta(days=day), start_time=time(11, 0)))
+            session.add(Screening(film_id=films[1].film_id, screen_id="S1", cinema_id=cinema.cinema_id,
+                                  date=START + timedelta(days=day), start_time=time(19, 0)))
+    session.commit()
+    return cinemas, films
+
+
+@pytest.fixture(autouse=True)
+def clear_forecast_cache():
+    get_forecast_cache().invalidate()
+    yield
+    get_forecast_cache().invalidate()
+
+
+def test_totals_per_day_cinema_and_film(session, registry, timetable):
+    cinemas, films = timetable
+
+    forecast = forecast_range(START, START + timedelta(days=1), session=session, registry=registry)
+
+    assert forecast["screenings"] == 8
+    assert forecast["total"] == 8 * 10 + 4 * 20
+    assert forecast["by_day"] == {START: 80, START + timedelta(days=1): 80}
+    assert forecast["by_cinema"] == {cinemas[0].cinema_id: 80, cinemas[1].cinema_id: 80}
+    assert forecast["by_film"] == {films[0].film_id: 40, films[1].film_id: 120}
+    assert forecast["by_day_and_cinema"][(START, cinemas[1].cinema_id)] == 40
+    assert forecast["film_names"][films[1].film_id] == "Film 1"
+
+
+def test_filters_by_cinema(session, registry, timetable):
+    cinemas, _ = timetable
+
+    forecast = forecast_range(START, START + timedelta(days=2), [cinemas[0].cinema_id], session=session, registry=registry)
+
+    assert list(forecast["by_cinema"]) == [cinemas[0].cinema_id]
+    assert forecast["total"] == 3 * 40
+
+
+def test_process_pool_matches_single_batch(session, registry, timetable, monkeypatch):
+    expected = forecast_range(START, START + timedelta(days=2), session=session, registry=registry)
+    get_forecast_cache().invalidate()
+    monkeypatch.setattr(forecast_module, "MIN_ROWS_PER_PROCESS", 1)
+
+    forecast = forecast_range(START, START + timedelta(days=2), session=session, registry=registry, processes=2)
+
+    assert forecast == expected
+
+
+def test_rejects_an_end_before_the_start(session, registry):
+    with pytest.raises(ValueError):
+        forecast_range(START, START - timedelta(days=1), session=session, registry=registry)
@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.preprocessing import MinMaxScaler
+
+from main_components.prediction.feature_pipeline import FeaturePipeline, NUMERICAL_COLUMNS
+from main_components.prediction.forecast_cache import ForecastCache, get_forecast_cache, predict_with_cache
+from main_components.prediction.model_registry import LoadedModel
+from main_components.services.film_service import FilmService
+
+
+class CountingModel:
+    """Predicts 25 tickets for every screening and records how many rows it scored."""
+    def __init__(self):
+        self.scored = []
+
+    def predict(self, features):
+        self.scored.append(len(features))
+        return np.full(len(features), 25.0)
+
+
+@pytest.fixture
+def loaded():
+    scaler = MinMaxScaler().fit(pd.DataFrame([[0, 0, 40000, 0, 40000], [200, 2000, 50000, 10, 50000]], columns=NUMERICAL_COLUMNS))
+    return LoadedModel(CountingModel(), FeaturePipeline.from_scaler(scaler), "v1", 0.0)
+
+
+def row(screening_id, date="2025-06-02", film_id=1, screen_id="S1", capacity=100):
+    return {'screening_id': screening_id, 'film_id': film_id, 'screen_id': screen_id, 'cinema_id': 1, 'capacity': capacity,
+            'release_date': "2025-01-01", 'date': date, 'rating': 7.0, 'show_time_category_Evening': 1, 'ticket_price': 1000}
+
+
+@pytest.fixture(autouse=True)
+def clear_process_cache():
+    get_forecast_cache().invalidate()
+    yield
+    get_forecast_cache().invalidate()
+
+
+def test_only_uncached_rows_are_scored(loaded):
+    cache = ForecastCache()
+    rows = [row(1), row(2, date="2025-06-03")]
+
+    assert predict_with_cache(loaded, rows, cache).tolist() == [25, 25]
+    assert predict_with_cache(loaded, rows + [row(3, date="2025-06-04")], cache).tolist() == [25, 25, 25]
+    assert loaded.model.scored == [2, 1]
+    assert cache.hits == 2
+
+
+def test_least_recently_used_entries_are_evicted(loaded):
+    cache = ForecastCache(max_entries=2)
+    predict_with_cache(loaded, [row(1, date="2025-06-01"), row(2, date="2025-06-02")], cache)
+    predict_with_cache(loaded, [row(1, date="2025-06-01")], cache)  # Touches the first entry.
+    predict_with_cache(loaded, [row(3, date="2025-06-03")], cache)  # Evicts the second one.
+    loaded.model.scored.clear()
+
+    predict_with_cache(loaded, [row(1, date="2025-06-01"), row(2, date="2025-06-02")], cache)
+
+    assert len(cache) == 2
+    assert loaded.model.scored == [1]
+
+
+def test_invalidation_by_screening_film_and_screen(loaded):
+    cache = ForecastCache()
+    predict_with_cache(loaded, [row(1, date="2025-06-01", film_id=1), row(2, date="2025-06-02", film_id=2, screen_id="S2"),
+                                row(3, date="2025-06-03", film_id=2)], cache)
+
+    assert cache.invalidate(screening_id=1) == 1
+    assert cache.invalidate(screen_id="S2", cinema_id=1) == 1
+    assert cache.invalidate(film_id=2) == 1
+    assert len(cache) == 0
+
+
+def test_a_new_model_version_drops_the_entries(loaded):
+    cache = ForecastCache()
+    predict_with_cache(loaded, [row(1)], cache)
+    newer = LoadedModel(loaded.model, loaded.pipeline, "v2", 1.0)
+
+    predict_with_cache(newer, [row(1)], cache)
+
+    assert loaded.model.scored == [1, 1]
+    assert cache.model_version == "v2"
+
+
+def test_entries_are_saved_and_restored(loaded, tmp_path):
+    path = str(tmp_path / "forecasts.json")
+    cache = ForecastCache(path=path)
+    predict_with_cache(loaded, [row(1), row(2, date="2025-06-03")], cache)
+    cache.save()
+
+    restored = ForecastCache(path=path)
+    predict_with_cache(loaded, [row(1), row(2, date="2025-06-03")], restored)
+
+    assert len(restored) == 2
+    assert loaded.model.scored == [2]
+    assert restored.invalidate(screening_id=2) == 1
+
+
+def test_editing_a_film_drops_its_forecasts(session, film, loaded):
+    predict_with_cache(loaded, [row(1, film_id=film.film_id)])
+
+    FilmService(session).update_film(film.film_id, critic_rating=9.0)
+
+    assert len(get_forecast_cache()) == 0
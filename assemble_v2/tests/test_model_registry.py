@@ -0,0 +1,103 @@
+import os
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.dummy import DummyRegressor
+from sklearn.linear_model import LinearRegression
+from sklearn.preprocessing import MinMaxScaler
+
+from main_components.prediction.batch_predictor import predict_batch
+from main_components.prediction.feature_pipeline import FeaturePipeline, MODEL_COLUMNS, NUMERICAL_COLUMNS, PIPELINE_FILE
+from main_components.prediction.model_registry import MODEL_FILE, ModelRegistry, ModelSchemaError, get_model_registry, save_model_artifacts
+
+
+def save_artifacts(directory, columns=MODEL_COLUMNS, intercept=0.0, mtime=None):
+    rng = np.random.default_rng(0)
+    features = pd.DataFrame(rng.uniform(size=(20, len(columns))), columns=columns)
+    model = LinearRegression().fit(features, features.iloc[:, 0] * 10 + intercept)
+    scaler = MinMaxScaler().fit(pd.DataFrame(rng.uniform(size=(20, len(NUMERICAL_COLUMNS))), columns=NUMERICAL_COLUMNS))
+    joblib.dump(model, os.path.join(directory, "gradient_boosting_model.joblib"))
+    joblib.dump(scaler, os.path.join(directory, "scaler.joblib"))
+    if mtime is not None:
+        for name in ("gradient_boosting_model.joblib", "scaler.joblib"):
+            os.utime(os.path.join(directory, name), (mtime, mtime))
+
+
+def test_loads_once_and_shares_the_model(tmp_path, monkeypatch):
+    save_artifacts(tmp_path)
+    loads = []
+    original = joblib.load
+    monkeypatch.setattr(joblib, "load", lambda *args, **kwargs: loads.append(args[0]) or original(*args, **kwargs))
+    registry = ModelRegistry(str(tmp_path), reload_check_seconds=0)
+
+    first = registry.get()
+    second = registry.get()
+
+    assert first is second
+    assert len(loads) == 2  # The model and the scaler, once.
+    assert registry.version == first.version
+    assert get_model_registry(str(tmp_path)) is get_model_registry(str(tmp_path))
+
+
+def test_reloads_when_a_newer_artifact_is_saved(tmp_path):
+    save_artifacts(tmp_path, mtime=1_000_000)
+    registry = ModelRegistry(str(tmp_path), reload_check_seconds=0)
+    reloaded = []
+    registry.add_reload_listener(reloaded.append)
+    first = registry.get()
+
+    save_artifacts(tmp_path, intercept=5.0, mtime=2_000_000)
+    second = registry.get()
+
+    assert second is not first
+    assert second.version != first.version
+    assert reloaded == [first, second]
+
+
+def test_keeps_the_loaded_model_when_the_new_one_has_another_schema(tmp_path):
+    save_artifacts(tmp_path, mtime=1_000_000)
+    registry = ModelRegistry(str(tmp_path), reload_check_seconds=0)
+    first = registry.get()
+
+    save_artifacts(tmp_path, columns=MODEL_COLUMNS[:-1], mtime=2_000_000)
+
+    assert registry.get() is first
+
+
+def test_rejects_a_model_with_another_schema(tmp_path):
+    save_artifacts(tmp_path, columns=list(reversed(MODEL_COLUMNS)))
+    with pytest.raises(ModelSchemaError):
+        ModelRegistry(str(tmp_path)).get()
+
+
+def test_missing_artifacts(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        ModelRegistry(str(tmp_path)).get()
+
+
+def test_a_saved_feature_pipeline_replaces_the_scaler(tmp_path):
+    save_artifacts(tmp_path)
+    columns = ['date', 'capacity', 'rating']
+    training = pd.DataFrame({'date': ["2025-01-01", "2025-03-01"], 'capacity': [50, 150], 'rating': [2.0, 9.0]})
+    pipeline = FeaturePipeline.fit(training, columns)
+    pipeline.save(os.path.join(tmp_path, PIPELINE_FILE))
+    joblib.dump(LinearRegression().fit(pipeline.transform_frame(training), [10, 20]), os.path.join(tmp_path, "gradient_boosting_model.joblib"))
+
+    loaded = ModelRegistry(str(tmp_path)).get()
+
+    assert loaded.pipeline.model_columns == columns
+    assert predict_batch(loaded.model, loaded.pipeline, training.to_dict("records")).tolist() == [10, 20]
+
+
+def test_prefers_the_demand_model_over_a_legacy_gradient_boosting_file(tmp_path):
+    save_artifacts(tmp_path)  # Saved under the old gradient_boosting_model.joblib name.
+    pipeline = FeaturePipeline.from_scaler(joblib.load(os.path.join(tmp_path, "scaler.joblib")), MODEL_COLUMNS)
+    model = DummyRegressor(strategy="constant", constant=42).fit(np.zeros((2, len(MODEL_COLUMNS))), [0, 0])
+    registry = ModelRegistry(str(tmp_path), reload_check_seconds=0)
+    assert isinstance(registry.get().model, LinearRegression)
+
+    save_model_artifacts(model, pipeline, str(tmp_path))
+
+    assert isinstance(registry.get().model, DummyRegressor)
+    assert os.path.exists(os.path.join(tmp_path, MODEL_FILE))
@@ -0,0 +1,87 @@
+import os
+import numpy as np
+import pytest
+from sklearn.tree import DecisionTreeRegressor
+
+from main_components.prediction.feature_pipeline import FeaturePipeline, PIPELINE_FILE
+from main_components.prediction.model_registry import MODEL_FILE, ModelRegistry, ModelSchemaError, save_model_artifacts
+from main_components.prediction.model_search import SearchBudget, SearchLedger, SearchSpace, SuccessiveHalvingSearch
+
+
+@pytest.fixture(scope="module")
+def training_data():
+    rng = np.random.default_rng(0)
+    X = rng.uniform(size=(900, 3))
+    y = 50 * X[:, 0] + 20 * (X[:, 1] > 0.5) + rng.normal(0, 1, 900)
+    return X, y
+
+
+def tree_space(candidates=9):
+    return SearchSpace('tree', DecisionTreeRegressor(random_state=0), {'max_depth': [1, 2, 4, 6, 8, 10, 12, 14, 16]}, candidates)
+
+
+def test_halving_keeps_the_best_candidates_and_refits_the_best(training_data):
+    X, y = training_data
+    search = SuccessiveHalvingSearch([tree_space()], folds=3, factor=3, min_samples=60)
+
+    result = search.fit(X, y)
+
+    # 9 candidates on 3 folds, then 3, then 1.
+    assert result.fits == 9 * 3 + 3 * 3 + 1 * 3
+    assert search._rung_samples(600, 9) == [66, 200, 600]
+    assert result.samples == 600
+    assert result.parameters['max_depth'] > 2
+    assert result.estimator.tree_.node_count > 1
+    assert len(result.fold_rmse) == 3
+
+
+def test_a_second_search_reads_the_ledger_instead_of_fitting(training_data, tmp_path):
+    X, y = training_data
+    path = str(tmp_path / "ledger.jsonl")
+    first = SuccessiveHalvingSearch([tree_space()], ledger=SearchLedger(path), folds=3, min_samples=60).fit(X, y)
+
+    second = SuccessiveHalvingSearch([tree_space()], ledger=SearchLedger(path), folds=3, min_samples=60).fit(X, y)
+
+    assert second.fits == 0
+    assert second.reused == first.fits
+    assert second.parameters == first.parameters
+    assert len(SearchLedger(path)) == first.fits
+
+
+def test_ledger_entries_are_not_reused_for_other_data(training_data, tmp_path):
+    X, y = training_data
+    path = str(tmp_path / "ledger.jsonl")
+    SuccessiveHalvingSearch([tree_space()], ledger=SearchLedger(path), folds=3, min_samples=60).fit(X, y)
+
+    result = SuccessiveHalvingSearch([tree_space()], ledger=SearchLedger(path), folds=3, min_samples=60).fit(X, y + 1)
+
+    assert result.reused == 0
+
+
+def test_stops_at_the_fit_budget(training_data):
+    X, y = training_data
+    search = SuccessiveHalvingSearch([tree_space()], budget=SearchBudget(max_fits=30), folds=3, min_samples=60)
+
+    result = search.fit(X, y)
+
+    assert result.fits == 30
+    assert result.samples == 66  # The second rung was not finished, the first rung's best is kept.
+
+
+def test_a_budget_too_small_for_one_candidate(training_data):
+    X, y = training_data
+    with pytest.raises(ValueError):
+        SuccessiveHalvingSearch([tree_space()], budget=SearchBudget(max_fits=2), folds=3).fit(X, y)
+
+
+def test_saves_the_model_and_pipeline_together(training_data, tmp_path):
+    X, y = training_data
+    pipeline = FeaturePipeline(['capacity', 'rating', 'show_time_category_Evening'], {})
+    model = DecisionTreeRegressor(max_depth=3).fit(X, y)
+
+    save_model_artifacts(model, pipeline, str(tmp_path))
+
+    assert sorted(os.listdir(tmp_path)) == sorted([PIPELINE_FILE, MODEL_FILE])
+    assert ModelRegistry(str(tmp_path)).get().pipeline.model_columns == pipeline.model_columns
+    with pytest.raises(ModelSchemaError):
+        save_model_artifacts(model, FeaturePipeline(['capacity'], {}), str(tmp_path / "other"))
@@ -0,0 +1,49 @@
+from datetime import date, time, timedelta
+
+from main_components.models import Cinema, City, Film, Screen, Screening
+from main_components.prediction.features import load_screening_features
+
+
+def test_feature_row_for_a_screening(session, screening, film, screen, cinema):
+    rows = load_screening_features(session, screening.date)
+
+    assert len(rows) == 1
+    row = rows[0]
+    assert row['screening_id'] == screening.screening_id
+    assert row['film_name'] == film.name
+    assert row['capacity'] == screen.total_capacity
+    assert row['rating'] == film.critic_rating
+    assert row['release_date'] == film.release_date
+    assert row['cinema_location_Bristol'] == 1 and row['cinema_location_London'] == 0
+    assert row['Action'] == 1 and row['Drama'] == 0
+    assert (row['show_time_category_Evening'], row['show_time_category_Morning'], row['show_time_category_Afternoon']) == (1, 0, 0)
+
+
+def test_date_range_is_one_query(count_statements, session, film):
+    london = City(name="London", country="UK", price_morning=6, price_afternoon=7, price_evening=8)
+    session.add(london)
+    session.commit()
+    start = date(2025, 6, 2)
+    for index in range(3):
+        cinema = Cinema(city_id=london.city_id, name=f"Cinema {index}", address="1 Street")
+        session.add(cinema)
+        session.commit()
+        session.add(Screen(screen_id=f"S{index}", cinema_id=cinema.cinema_id, total_capacity=50 + index, row_number=5))
+        for day in range(4):
+            session.add(Screening(film_id=film.film_id, screen_id=f"S{index}", cinema_id=cinema.cinema_id,
+                                  date=start + timedelta(days=day), start_time=time(10 + index, 0)))
+        session.commit()
+    session.expire_all()
+
+    statements = count_statements()
+    rows = load_screening_features(session, start, start + timedelta(days=1))
+
+    assert len(statements) == 1
+    assert len(rows) == 6
+    assert all(row['cinema_location_London'] == 1 for row in rows)
+    assert [row['date'] for row in rows] == sorted(row['date'] for row in rows)
+
+
+def test_filters_by_cinema_and_screening(session, screening, cinema):
+    assert load_screening_features(session, screening.date, cinema_ids=[cinema.cinema_id + 1]) == []
+    assert [row['screening_id'] for row in load_screening_features(session, screening_ids=[screening.screening_id])] == [screening.screening_id]
@@ -0,0 +1,57 @@
+import pytest
+from datetime import date
+from main_components.models import SalesRollup, Ticket
+from main_components.enums import PaymentStatus
+from main_components.services.reporting_service import ReportingService
+from main_components.services.ticket_service import TicketService
+
+
+def rollup_totals(session):
+    return {(row.sale_date, row.screening_id): (row.tickets_sold, pytest.approx(row.revenue)) for row in session.query(SalesRollup)}
+
+
+def test_rollups_follow_bookings_refunds_and_cancellations(booking_service, session, screening, seats, cinema, city, film):
+    today = date.today()
+    first = booking_service.create_booking([seats[0].seat_id, seats[9].seat_id], "Alice", screening_id=screening.screening_id)[0].booking_id
+    second = booking_service.create_booking([seats[1].seat_id, seats[2].seat_id], "Bob", screening_id=screening.screening_id)[0].booking_id
+    assert rollup_totals(session) == {(today, screening.screening_id): (4, pytest.approx(8 + 8 * 1.44 + 16))}
+
+    ticket = session.query(Ticket).filter_by(booking_id=second, seat_id=seats[1].seat_id).one()
+    assert TicketService(session).cancel_ticket(ticket.ticket_id)
+    assert rollup_totals(session) == {(today, screening.screening_id): (3, pytest.approx(8 + 8 * 1.44 + 8))}
+
+    booking_service.cancel_bookings([first, second])
+    assert rollup_totals(session) == {(today, screening.screening_id): (0, pytest.approx(0))}
+
+
+def test_rebuild_matches_incremental_rollups(booking_service, session, screening, seats):
+    booking_service.create_booking([seats[0].seat_id, seats[1].seat_id], "Alice", screening_id=screening.screening_id)
+    booking_service.create_booking([seats[9].seat_id], "Bob", screening_id=screening.screening_id)
+    incremental = rollup_totals(session)
+
+    assert ReportingService(session).rebuild_sales_rollups() == 1
+    assert rollup_totals(session) == incremental
+
+
+def test_payment_status_changes_update_rollups(booking_service, session, screening, seats):
+    booking_id = booking_service.create_booking([seats[0].seat_id, seats[1].seat_id], "Alice", screening_id=screening.screening_id)[0].booking_id
+    ticket_ids = [ticket.ticket_id for ticket in session.query(Ticket).filter_by(booking_id=booking_id)]
+    ticket_service = TicketService(session)
+
+    ticket_service.update_payment_status(ticket_ids, PaymentStatus.PENDING)
+    assert session.query(SalesRollup).one().tickets_sold == 0
+    ticket_service.update_payment_status(ticket_ids, PaymentStatus.PAID)
+    ticket_service.update_payment_status(ticket_ids, PaymentStatus.PAID)  # Already paid, nothing to add.
+    assert session.query(SalesRollup).one().tickets_sold == 2
+
+
+def test_get_sales_groups_rollups(booking_service, session, screening, seats, cinema, city, film):
+    booking_service.create_booking([seats[0].seat_id, seats[1].seat_id], "Alice", screening_id=screening.screening_id)
+    service = ReportingService(session)
+
+    assert service.get_sales("cinema") == [{"key": cinema.cinema_id, "tickets_sold": 2, "revenue": 16.0}]
+    assert service.get_sales("city", start_date=date.today()) == [{"key": city.city_id, "tickets_sold": 2, "revenue": 16.0}]
+    assert service.get_sales("day", end_date=date(2000, 1, 1)) == []
+    assert service.get_sales("film", cinema_id=cinema.cinema_id)[0]["key"] == film.film_id
+    with pytest.raises(ValueError):
+        service.get_sales("seat")
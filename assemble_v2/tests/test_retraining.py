@@ -0,0 +1,106 @@
+import datetime
+import numpy as np
+import pytest
+from sklearn.dummy import DummyRegressor
+from sklearn.tree import DecisionTreeRegressor
+
+from main_components.models import Screening, SeatAvailability, TrainingCheckpoint, TrainingSnapshot
+from main_components.prediction.feature_pipeline import FeaturePipeline, MODEL_COLUMNS
+from main_components.prediction.model_registry import ModelRegistry, save_model_artifacts
+from main_components.prediction.retraining import extract_training_snapshots, load_training_frame, retrain_model
+
+TODAY = datetime.date(2025, 6, 1)
+
+
+def add_shown_screening(session, film, screen, cinema, seats, date, booked, hour=19):
+    screening = Screening(film_id=film.film_id, screen_id=screen.screen_id, cinema_id=cinema.cinema_id, date=date, start_time=datetime.time(hour, 0))
+    session.add(screening)
+    session.commit()
+    session.add_all([SeatAvailability(screening_id=screening.screening_id, seat_id=seat.seat_id, booking_id=f"B{screening.screening_id}" if index < booked else None)
+                     for index, seat in enumerate(seats)])
+    session.commit()
+    return screening
+
+
+def test_extracts_shown_screenings_since_the_checkpoint(session, film, screen, cinema, seats):
+    shown = [add_shown_screening(session, film, screen, cinema, seats, TODAY - datetime.timedelta(days=days), booked=days) for days in (5, 3, 1)]
+    add_shown_screening(session, film, screen, cinema, seats, TODAY, booked=2)  # Not shown yet.
+
+    assert extract_training_snapshots(session, until=TODAY, batch_size=2) == 3
+
+    snapshots = {snapshot.screening_id: snapshot for snapshot in session.query(TrainingSnapshot)}
+    assert {screening_id: snapshot.tickets_sold for screening_id, snapshot in snapshots.items()} == \
+        {shown[0].screening_id: 5, shown[1].screening_id: 3, shown[2].screening_id: 1}
+    assert snapshots[shown[0].screening_id].capacity == 10
+    assert snapshots[shown[0].screening_id].show_time_category_Evening == 1
+    checkpoint = session.get(TrainingCheckpoint, "training_snapshots")
+    assert (checkpoint.last_date, checkpoint.last_screening_id) == (TODAY - datetime.timedelta(days=1), shown[2].screening_id)
+
+    assert extract_training_snapshots(session, until=TODAY) == 0
+    assert extract_training_snapshots(session, until=TODAY + datetime.timedelta(days=1)) == 1
+    assert extract_training_snapshots(session, until=TODAY + datetime.timedelta(days=1), full=True) == 4
+    assert session.query(TrainingSnapshot).count() == 4
+
+
+def add_snapshots(session, days=120, per_day=4):
+    rng = np.random.default_rng(0)
+    rows = []
+    for day in range(days):
+        for index in range(per_day):
+            capacity = int(rng.integers(50, 150))
+            evening = index % 2
+            rows.append({
+                'screening_id': day * per_day + index + 1, 'date': TODAY - datetime.timedelta(days=day + 1), 'start_time': datetime.time(19 if evening else 11),
+                'cinema_id': 1, 'screen_id': "S1", 'film_id': 1, 'capacity': capacity, 'release_date': datetime.date(2024, 1, 1),
+                'rating': float(rng.uniform(1, 10)), 'show_time_category_Evening': evening, 'ticket_price': 1000,
+                'tickets_sold': int(capacity * (0.2 + 0.6 * evening)), 'updated_at': datetime.datetime(2025, 6, 1),
+            })
+    session.bulk_insert_mappings(TrainingSnapshot, rows)
+    session.commit()
+
+
+@pytest.fixture
+def registry(tmp_path):
+    pipeline = FeaturePipeline(MODEL_COLUMNS, {})
+    save_model_artifacts(DummyRegressor().fit(np.zeros((2, len(MODEL_COLUMNS))), [0, 100]), pipeline, str(tmp_path))
+    return ModelRegistry(str(tmp_path), reload_check_seconds=0)
+
+
+def test_loads_a_window_of_snapshots(session):
+    add_snapshots(session, days=10, per_day=2)
+
+    frame = load_training_frame(session, TODAY - datetime.timedelta(days=3), TODAY - datetime.timedelta(days=1), batch_size=3)
+
+    assert len(frame) == 4
+    assert frame['date'].min() == TODAY - datetime.timedelta(days=3)
+
+
+def test_promotes_a_retrained_model_that_validates_better(session, registry):
+    add_snapshots(session)
+    first_version = registry.get().version
+
+    result = retrain_model(session, registry, today=TODAY, window_days=90, validation_days=14, estimator=DecisionTreeRegressor(max_depth=4, random_state=0))
+
+    assert result.promoted
+    assert result.trained_rows == 76 * 4
+    assert result.validation_rows == 14 * 4
+    assert result.new_rmse < result.current_rmse
+    assert result.version != first_version
+    assert isinstance(registry.get().model, DecisionTreeRegressor)
+
+
+def test_keeps_the_current_model_when_validation_regresses(session, registry):
+    add_snapshots(session)
+    retrain_model(session, registry, today=TODAY, estimator=DecisionTreeRegressor(max_depth=4, random_state=0))
+    version = registry.get().version
+
+    result = retrain_model(session, registry, today=TODAY, estimator=DummyRegressor(strategy="constant", constant=0))
+
+    assert not result.promoted
+    assert result.version == version
+
+
+def test_needs_snapshots_to_validate_on(session, registry):
+    add_snapshots(session, days=10)
+    with pytest.raises(ValueError):
+        retrain_model(session, registry, today=TODAY + datetime.timedelta(days=30), validation_days=14)
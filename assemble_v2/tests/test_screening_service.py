@@ -0,0 +1,109 @@
+from datetime import date, datetime, time, timedelta
+import pytest
+
+from main_components.models import Screen
+from main_components.services.screen_schedule import ScreenSchedule
+from main_components.services.screening_service import ScreeningService
+
+DAY = date(2025, 3, 3)
+
+
+def at(hour, minute=0, day=DAY):
+    return datetime.combine(day, time(hour, minute))
+
+
+def test_schedule_finds_overlaps_with_a_bisect():
+    schedule = ScreenSchedule()
+    schedule.add(1, at(10), at(12))
+    schedule.add(2, at(14), at(16))
+
+    assert schedule.find_conflict(at(12), at(14)) is None  # Back to back is allowed.
+    assert schedule.find_conflict(at(11), at(13)) == 1
+    assert schedule.find_conflict(at(13), at(15)) == 2
+    assert schedule.find_conflict(at(9), at(17)) == 2
+    assert schedule.find_conflict(at(16), at(18)) is None
+
+    schedule.remove(2)
+    assert schedule.find_conflict(at(13), at(15)) is None
+
+
+def test_schedule_handles_intervals_that_already_overlap():
+    schedule = ScreenSchedule()
+    schedule.add(1, at(9), at(18))  # A long screening covering the shorter ones after it.
+    schedule.add(2, at(10), at(11))
+    schedule.add(3, at(12), at(13))
+
+    assert schedule.find_conflict(at(14), at(15)) == 1
+    schedule.remove(1)
+    assert schedule.find_conflict(at(14), at(15)) is None
+    assert len(schedule) == 2
+
+
+def test_allows_several_screenings_a_day_on_one_screen(session, film, screen, cinema):
+    service = ScreeningService(session)
+
+    service.create_screening(film.film_id, screen.screen_id, cinema.cinema_id, DAY, time(10, 0), 1)
+    # The film runs 120 minutes, plus 15 minutes of cleanup: the screen is free again at 12:15.
+    service.create_screening(film.film_id, screen.screen_id, cinema.cinema_id, DAY, time(12, 15), 1)
+    service.create_screening(film.film_id, screen.screen_id, cinema.cinema_id, DAY + timedelta(days=1), time(10, 0), 1)
+
+    with pytest.raises(ValueError, match="overlaps screening"):
+        service.create_screening(film.film_id, screen.screen_id, cinema.cinema_id, DAY, time(14, 0), 1)
+    assert len(service.get_all_screenings()) == 3
+
+
+def test_checks_screenings_running_past_midnight(session, film, screen, cinema):
+    service = ScreeningService(session)
+    service.create_screening(film.film_id, screen.screen_id, cinema.cinema_id, DAY, time(23, 0), 1)
+
+    with pytest.raises(ValueError):
+        service.create_screening(film.film_id, screen.screen_id, cinema.cinema_id, DAY + timedelta(days=1), time(0, 30), 1)
+    with pytest.raises(ValueError):
+        service.create_screening(film.film_id, screen.screen_id, cinema.cinema_id, DAY, time(21, 0), 1)
+
+
+def test_other_screens_are_independent(session, film, screen, cinema):
+    session.add(Screen(screen_id="S2", cinema_id=cinema.cinema_id, total_capacity=10, row_number=2))
+    session.commit()
+    service = ScreeningService(session)
+
+    service.create_screening(film.film_id, screen.screen_id, cinema.cinema_id, DAY, time(10, 0), 1)
+    service.create_screening(film.film_id, "S2", cinema.cinema_id, DAY, time(10, 0), 1)
+
+    assert len(service.get_all_screenings()) == 2
+
+
+def test_validates_a_week_timetable_at_once(session, film, screen, cinema):
+    service = ScreeningService(session)
+    existing = service.create_screening(film.film_id, screen.screen_id, cinema.cinema_id, DAY, time(18, 0), 1)
+    entry = lambda day, hour: {"film_id": film.film_id, "screen_id": screen.screen_id, "cinema_id": cinema.cinema_id,
+                               "date": DAY + timedelta(days=day), "start_time": time(hour, 0)}
+    timetable = [entry(day, hour) for day in range(7) for hour in (10, 14)]
+
+    assert service.validate_timetable(timetable) == []
+
+    conflicts = service.validate_timetable(timetable + [entry(0, 19), entry(3, 15)])
+    assert [(conflict.entry_index, conflict.screening_id, conflict.other_entry_index) for conflict in conflicts] == \
+        [(14, existing.screening_id, None), (15, None, 7)]
+
+    with pytest.raises(ValueError):
+        service.create_screenings(timetable + [entry(3, 15)])
+    assert len(service.get_all_screenings()) == 1  # Nothing of a conflicting timetable is created.
+    assert len(service.create_screenings(timetable)) == 14
+
+
+def test_unknown_film(session, screen, cinema):
+    with pytest.raises(ValueError, match="not found"):
+        ScreeningService(session).create_screening(999, screen.screen_id, cinema.cinema_id, DAY, time(10, 0), 1)
+
+
+def test_update_checks_the_new_slot_and_ignores_the_screening_itself(session, film, screen, cinema):
+    service = ScreeningService(session)
+    first = service.create_screening(film.film_id, screen.screen_id, cinema.cinema_id, DAY, time(10, 0), 1)
+    second = service.create_screening(film.film_id, screen.screen_id, cinema.cinema_id, DAY, time(15, 0), 1)
+
+    assert service.update_screening(first.screening_id, start_time=time(11, 0)).start_time == time(11, 0)
+    with pytest.raises(ValueError):
+        service.update_screening(second.screening_id, start_time=time(12, 0))
+    assert service.get_screening_by_id(second.screening_id).start_time == time(15, 0)
+    assert service.update_screening(second.screening_id, screening_availability=0) is second
@@ -0,0 +1,51 @@
+import pytest
+from main_components.enums import SeatState
+from main_components.services.seat_service import SeatService
+
+
+@pytest.fixture
+def seat_service(session):
+    return SeatService(session)
+
+
+def test_availability_map_is_loaded_once(seat_service, count_statements, screening, seats):
+    seat_ids = [seat.seat_id for seat in seats]
+    screening_id = screening.screening_id
+    statements = count_statements()
+
+    availability_map = seat_service.get_availability_map(screening_id)
+    assert len(statements) == 1
+    assert availability_map.seat_ids == seat_ids
+    assert availability_map.count_available() == len(seat_ids)
+    assert all(seat_service.check_seat_availability(screening_id, seat_id) for seat_id in seat_ids)
+    assert seat_service.get_seat_states(screening_id)
+    assert len(statements) == 1  # Every later lookup is served from the cached bitmap.
+
+
+def test_availability_map_is_invalidated_on_booking_and_cancel(seat_service, booking_service, screening, seats):
+    seat_id = seats[0].seat_id
+    screening_id = screening.screening_id
+    assert seat_service.check_seat_availability(screening_id, seat_id)
+
+    bookings = booking_service.create_booking([seat_id], "Alice", screening_id=screening_id)
+    assert not seat_service.check_seat_availability(screening_id, seat_id)
+    assert seat_service.get_availability_map(screening_id).count_available() == len(seats) - 1
+
+    booking_service.cancel_booking(bookings[0].booking_id)
+    assert seat_service.check_seat_availability(screening_id, seat_id)
+
+
+def test_availability_map_is_invalidated_on_update_and_hold(seat_service, booking_service, screening, seats):
+    screening_id = screening.screening_id
+    seat_service.update_seat_availability(screening_id, seats[0].seat_id, 0)
+    assert seat_service.get_seat_states(screening_id)[seats[0].seat_id] == SeatState.BOOKED
+
+    hold_id = booking_service.hold_seats([seats[1].seat_id], screening_id)
+    assert seat_service.get_seat_states(screening_id)[seats[1].seat_id] == SeatState.HELD
+    assert seat_service.get_seat_states(screening_id, hold_id)[seats[1].seat_id] == SeatState.AVAILABLE
+    booking_service.release_hold(hold_id)
+    assert seat_service.get_seat_states(screening_id)[seats[1].seat_id] == SeatState.AVAILABLE
+
+
+def test_unknown_seat_is_not_available(seat_service, screening):
+    assert not seat_service.check_seat_availability(screening.screening_id, "missing")
@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta
+from sqlalchemy import event, insert
+from sqlalchemy.orm import sessionmaker
+from main_components.management.booking_events_manager import BookingEventsManager
+from main_components.management.sql_event_store import SqlEventStore
+from main_components.models import BookingEvent
+
+START = datetime(2025, 1, 1, 9, 0)
+
+
+def make_event(number, event_type="booking", user_id=1, screening_id=None, minutes=0):
+    return {"booking_id": [f"b{number}"], "user_id": user_id, "event_type": event_type,
+            "event_data": {"screening_id": screening_id} if screening_id else {"cancellation_reason": "Test"},
+            "timestamp": (START + timedelta(minutes=minutes)).isoformat()}
+
+
+def sample_events():
+    return [make_event(0, user_id=1, screening_id=4, minutes=0), make_event(1, user_id=2, screening_id=4, minutes=30),
+            make_event(2, user_id=2, screening_id=5, minutes=70), make_event(3, "cancellation", user_id=1, minutes=80)]
+
+
+def test_events_are_inserted_in_one_batch_and_read_back(engine):
+    store = SqlEventStore(sessionmaker(bind=engine))
+    inserts = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, statement, *args: inserts.append(statement) if statement.startswith("INSERT") else None)
+    store.append_many(sample_events())
+    assert len(inserts) == 1
+
+    assert list(store.iter_events()) == sample_events()
+    first, position = store.read_since(None, limit=3)
+    rest, _ = store.read_since(position)
+    assert first + rest == sample_events()
+
+
+def test_read_since_picks_up_events_that_commit_late(engine, session):
+    store = SqlEventStore(sessionmaker(bind=engine))
+    store.append_many(sample_events())
+    late = session.get(BookingEvent, 2)
+    row = {column.name: getattr(late, column.name) for column in BookingEvent.__table__.columns}
+    session.delete(late)  # Event 2 has its id, but another process has not committed it yet.
+    session.commit()
+
+    events, position = store.read_since()
+    assert events == [sample_events()[0]] + sample_events()[2:]
+    session.execute(insert(BookingEvent), [row])
+    session.commit()
+    events, position = store.read_since(position)
+    assert events == [sample_events()[1]]
+    assert store.read_since(position)[0] == []
+
+
+def test_aggregates_are_computed_in_the_database(engine):
+    store = SqlEventStore(sessionmaker(bind=engine))
+    store.append_many(sample_events())
+    assert store.count_by_hour() == {"2025-01-01 09:00": 2, "2025-01-01 10:00": 2}
+    assert store.count_by_user() == {1: 2, 2: 2}
+    assert store.count_by_screening(event_type="booking") == {4: 2, 5: 1}
+    assert store.count_by_event_type(start_date=START + timedelta(minutes=60)) == {"booking": 1, "cancellation": 1}
+    assert store.count_by_event_type(event_type="cancellation") == {"cancellation": 1}
+
+
+def test_manager_gives_the_same_answers_for_both_stores(engine, tmp_path):
+    sql_manager = BookingEventsManager(str(tmp_path / "sql.json"), store=SqlEventStore(sessionmaker(bind=engine)))
+    file_manager = BookingEventsManager(str(tmp_path / "file.json"))
+    for manager in (sql_manager, file_manager):
+        for sample in sample_events():
+            manager.writer.submit(sample)
+
+    for manager in (sql_manager, file_manager):
+        assert manager.events_per_hour() == {"2025-01-01 09:00": 2, "2025-01-01 10:00": 2}
+        assert manager.events_per_user(event_type="booking") == {1: 1, 2: 2}
+        assert manager.events_per_screening() == {4: 2, 5: 1}
+        assert manager.events_per_type() == {"booking": 3, "cancellation": 1}
+    assert sql_manager.get_events(booking_id="b2") == file_manager.get_events(booking_id="b2")
+
+
+def test_read_page_filters_in_the_database(engine):
+    store = SqlEventStore(sessionmaker(bind=engine))
+    store.append_many(sample_events())
+    page, position = store.read_page(limit=1, event_type="booking", start_date=START + timedelta(minutes=10))
+    assert page == [sample_events()[1]]
+    page, position = store.read_page(position, limit=1, event_type="booking", start_date=START + timedelta(minutes=10))
+    assert page == [sample_events()[2]]
+    assert store.read_page(position, limit=1, event_type="booking") == ([], None)
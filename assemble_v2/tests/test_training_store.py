@@ -0,0 +1,70 @@
+import os
+import numpy as np
+import pandas as pd
+
+from main_components.prediction.feature_pipeline import FeaturePipeline, MODEL_COLUMNS
+from main_components.prediction.training_store import TrainingStore
+
+
+def write_training_csv(path, size=250):
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame({
+        'screen_id': rng.integers(1, 30, size),
+        'date': (np.datetime64('2024-01-01') + rng.integers(0, 400, size)).astype(str),
+        'capacity': rng.integers(50, 121, size),
+        'ticket_price': rng.integers(500, 1500, size),
+        'tickets_sold': rng.integers(0, 50, size),
+        'release_date': (np.datetime64('2020-01-01') + rng.integers(0, 1500, size)).astype(str),
+        'rating': np.round(rng.uniform(1, 10, size), 1),
+        'show_time_category_Evening': rng.integers(0, 2, size).astype(bool),
+        'Action': rng.integers(0, 2, size),
+    })
+    frame.to_csv(path, index=False)
+    return frame
+
+
+def test_converts_the_csv_into_typed_columns(tmp_path):
+    csv_path = str(tmp_path / "training.csv")
+    frame = write_training_csv(csv_path)
+
+    store = TrainingStore.open(csv_path, str(tmp_path / "store"), chunk_size=64)
+
+    assert len(store) == len(frame)
+    assert store.column('date').dtype == np.dtype('datetime64[D]')
+    assert store.column('capacity').dtype == np.int8
+    assert store.column('ticket_price').dtype == np.int16
+    assert store.column('show_time_category_Evening').dtype == bool
+    restored = store.to_frame()
+    pd.testing.assert_frame_equal(restored.drop(columns=['date', 'release_date']), frame.drop(columns=['date', 'release_date']), check_dtype=False)
+    assert (restored['date'].dt.strftime('%Y-%m-%d') == frame['date']).all()
+    chunks = list(store.iter_chunks(['rating'], chunk_size=100))
+    assert [len(chunk) for chunk in chunks] == [100, 100, 50]
+    assert chunks[2].index[0] == 200
+
+
+def test_reuses_the_store_until_the_csv_changes(tmp_path):
+    csv_path = str(tmp_path / "training.csv")
+    write_training_csv(csv_path)
+    directory = str(tmp_path / "store")
+    TrainingStore.open(csv_path, directory)
+    built_at = os.stat(os.path.join(directory, "store.json")).st_mtime_ns
+
+    TrainingStore.open(csv_path, directory)
+    assert os.stat(os.path.join(directory, "store.json")).st_mtime_ns == built_at
+
+    write_training_csv(csv_path, size=10)
+    assert len(TrainingStore.open(csv_path, directory)) == 10
+
+
+def test_feature_matrix_is_the_pipeline_transform_and_is_cached(tmp_path):
+    csv_path = str(tmp_path / "training.csv")
+    frame = write_training_csv(csv_path)
+    store = TrainingStore.open(csv_path, str(tmp_path / "store"))
+    pipeline = FeaturePipeline.fit(frame, MODEL_COLUMNS)
+
+    features = store.feature_matrix(pipeline, chunk_size=64)
+
+    np.testing.assert_allclose(features, pipeline.transform_frame(frame))
+    assert len(os.listdir(tmp_path / "store" / "features")) == 1
+    np.testing.assert_array_equal(store.feature_matrix(pipeline), features)
+    assert len(os.listdir(tmp_path / "store" / "features")) == 1
@@ -1,151 +1,170 @@
-import pandas as pd
-import numpy as np
-from faker import Faker
-import random
+import argparse
 import datetime
+import time
+import numpy as np
+import pandas as pd
 
-random.seed(42)  # Set random seed for reproducity
-np.random.seed(42)
-fake = Faker()
-def generate_film_data(num_films):
-    films = []
-    all_genres = ['Action', 'Comedy', 'Drama', 'Sci-Fi', 'Thriller', 'Romance', 'Adventure', 'Horror', 'Mystery']
-    for film_id in range(1, num_films + 1):
-        num_genres = random.randint(1,3) # Randomly select 1 to 3 genres per film.
-        film_genres = random.sample(all_genres, num_genres)
-        films.append({
-            'film_id': film_id,
-            'genre': film_genres,
-            'release_date': fake.date_between(start_date='-10y', end_date='today'),
-            'rating': round(random.uniform(1, 10), 1) # Generates float number between 1 and 10, round its to 1 decimal place.
-        })
-    return pd.DataFrame(films) # makes each film a row.
-
-films_df = generate_film_data(20) #generate 20 films.
-
-num_rows = 5000
-
-cities_population = { # 2025 Population
+# Generates the synthetic screenings the demand model is trained on.
+# Every screening of a chunk is drawn at once as NumPy arrays and its tickets_sold computed with array math,
+# so the cost per row is constant and datasets of millions of rows are written chunk by chunk.
+
+SEED = 42  # Set random seed for reproducity
+DEFAULT_OUTPUT = 'program/cinema_booking_prediction/cinema_data_booking_prediction_essential.csv'
+DEFAULT_ROWS = 5000
+DEFAULT_CHUNK_SIZE = 1_000_000  # Rows generated and written at a time, bounds the memory used.
+
+ALL_GENRES = ['Action', 'Comedy', 'Drama', 'Sci-Fi', 'Thriller', 'Romance', 'Adventure', 'Horror', 'Mystery']
+GENRE_POPULARITY = { # The weight of each genre.
+    'Action': 1.2,
+    'Sci-Fi': 1.1,
+    'Comedy': 1.05,
+    'Drama': 0.95,
+    'Thriller': 1.0,
+    'Romance': 0.9,
+    'Adventure': 1.1,
+    'Horror': 1.0,
+    'Mystery': 0.95
+}
+CITIES_POPULATION = { # 2025 Population
     'Birmingham': 2704620,
     'Bristol': 720052,
     'Cardiff': 495378,
     'London': 9840740
 }
+CITIES = list(CITIES_POPULATION)
+SHOW_TIMES = ['Morning', 'Afternoon', 'Evening']
+SEAT_TYPES = ['Lower', 'Upper', 'VIP']
+LOWER_HALL_PRICES = np.array([ # Per city, the lower hall price for each show time.
+    [500, 600, 700], # Birmingham, $5, $6, $7
+    [600, 700, 800], # Bristol, $6, $7, $8
+    [500, 600, 700], # Cardiff
+    [1000, 1100, 1200] # London
+])
+VIP_SEATS = 10 # 10 vip seats always
+
+# Column order of the training CSV.
+OUTPUT_COLUMNS = ['screen_id', 'cinema_id', 'film_id', 'date', 'capacity', 'ticket_price', 'tickets_sold', 'release_date', 'rating'] + \
+    [f'cinema_location_{city}' for city in sorted(CITIES)] + [f'seat_type_{seat}' for seat in sorted(SEAT_TYPES)] + \
+    [f'show_time_category_{show}' for show in sorted(SHOW_TIMES)] + sorted(ALL_GENRES)
+
+
+def generate_film_data(num_films, rng, today):
+    """Films with 1 to 3 genres, a release date in the last 10 years and a rating between 1 and 10."""
+    genres = np.zeros((num_films, len(ALL_GENRES)), dtype=np.int8)
+    for film in range(num_films):
+        genres[film, rng.choice(len(ALL_GENRES), size=rng.integers(1, 4), replace=False)] = 1 # Randomly select 1 to 3 genres per film.
+    popularity = np.array([GENRE_POPULARITY[genre] for genre in ALL_GENRES])
+    return {
+        'film_id': np.arange(1, num_films + 1),
+        'genres': genres,
+        'genre_multiplier': genres @ popularity / genres.sum(axis=1), # The average weight of the film's genres.
+        'release_date': np.datetime64(today, 'D') - rng.integers(0, 3653, num_films),
+        'rating': np.round(rng.uniform(1, 10, num_films), 1),
+    }
+
 
-def generate_cinema_data(cities_population):
-    cinema_data = [] # Add cinema data.
-    cinema_id_counter = 1 
-    for city, population in cities_population.items():
-        # Generate number of cinemas based on population
-        num_cinemas = int(population / 1000000) + random.randint(1, 3) # adds some randomness to number  of cinemas in different cities.
-        num_cinemas = max(2, num_cinemas) #ensure minimum is 2.
-        for _ in range(num_cinemas):
-            cinema_data.append({'cinema_id': cinema_id_counter, 'cinema_location': city})
-            cinema_id_counter += 1
-    return pd.DataFrame(cinema_data)
-
-cinema_df = generate_cinema_data(cities_population)
-
-screen_data = [] # To store screens
-screen_id_counter = 1
-for cinema_id in cinema_df['cinema_id']:
-    num_screens = random.randint(1, 6) # Create randomly between 1 to 6 screens per cinema.
-    for _ in range(num_screens):
-        num_seats = random.randint(50, 120) # Create randomly between 50 and 120 seats per screen.
-        screen_data.append({
-            'screen_id': screen_id_counter,
-            'cinema_id': cinema_id,
-            'capacity': num_seats
-        })
-        screen_id_counter += 1
-screen_df = pd.DataFrame(screen_data)
-
-
-showing_data = [] # Store each screening.
-for _ in range(num_rows):
-    screen_id = random.choice(screen_df['screen_id']) # Picks a random screen.
-    cinema_id = screen_df[screen_df['screen_id'] == screen_id]['cinema_id'].values[0] # Gets cinema corresponding to chosen screen. so filters to find the screenid in the screen df, then accesses the cinema_id column and gets its value.
-    city = cinema_df[cinema_df['cinema_id'] == cinema_id]['cinema_location'].values[0] # Gets city corresponding to cinema.
-    film_row = films_df.sample(1).iloc[0] # Randomly selects 1 row from the films_df , illoc[0] extracts the first row.
-    film_id = film_row['film_id']
-    genres = film_row['genre']
-    release_date = film_row['release_date']
-    rating = film_row['rating']
-    date = datetime.date.today() + datetime.timedelta(days=random.randint(-365, 365))
-    show_time_category = random.choice(['Morning', 'Afternoon', 'Evening'])
-    capacity = screen_df[screen_df['screen_id'] == screen_id]['capacity'].values[0]
-
-    lower_hall_count = int(capacity * 0.3) # 30 % of total seats
-    vip_count = 10 # 10 vip seats always
-    upper_hall_count = capacity - lower_hall_count - vip_count # Calculates upper hall seats.
-    seats = ['Lower'] * lower_hall_count + ['Upper'] * upper_hall_count + ['VIP'] * vip_count # create the seats.
-    seat_type = random.choice(seats) # Randomly select seat types.
-
-    lower_hall_price = {
-        'Birmingham': [500, 600, 700], # $5, $6, $7
-        'Bristol': [600, 700, 800], # $6, $7, $8
-        'Cardiff': [500, 600, 700],
-        'London': [1000, 1100, 1200]
-    }[city][['Morning', 'Afternoon', 'Evening'].index(show_time_category)] # .index returns either 0 1 or 2, we can then decide what price to retrieve.
-
-    ticket_price = lower_hall_price
-    if seat_type == 'Upper':
-        ticket_price = int(lower_hall_price * 1.2)
-    elif seat_type == 'VIP':
-        ticket_price = int(lower_hall_price * 1.2 * 1.2)
-
-    # Genre Influence
-    genre_popularity = { # The weight of each genre.
-        'Action': 1.2,
-        'Sci-Fi': 1.1,
-        'Comedy': 1.05,
-        'Drama': 0.95,
-        'Thriller': 1.0,
-        'Romance': 0.9,
-        'Adventure': 1.1,
-        'Horror': 1.0,
-        'Mystery': 0.95
+def generate_cinema_data(cities_population, rng):
+    """Cinemas per city, more in larger cities and at least 2 per city. Returns the city index of each cinema."""
+    counts = [max(2, int(population / 1000000) + int(rng.integers(1, 4))) for population in cities_population.values()]
+    return np.repeat(np.arange(len(counts)), counts)
+
+
+def generate_screen_data(cinema_cities, rng):
+    """1 to 6 screens per cinema with 50 to 120 seats. Returns each screen's cinema index and capacity."""
+    screens_per_cinema = rng.integers(1, 7, len(cinema_cities))
+    screen_cinemas = np.repeat(np.arange(len(cinema_cities)), screens_per_cinema)
+    return screen_cinemas, rng.integers(50, 121, len(screen_cinemas))
+
+
+def generate_showings(num_rows, films, cinema_cities, screen_cinemas, screen_capacities, rng, today):
+    """Draws num_rows screenings and their tickets sold, returned as a DataFrame in the training CSV's layout."""
+    screen = rng.integers(0, len(screen_cinemas), num_rows) # Picks a random screen.
+    cinema = screen_cinemas[screen]
+    city = cinema_cities[cinema]
+    film = rng.integers(0, len(films['film_id']), num_rows)
+    date = np.datetime64(today, 'D') + rng.integers(-365, 366, num_rows)
+    show_time = rng.integers(0, len(SHOW_TIMES), num_rows)
+    capacity = screen_capacities[screen]
+
+    # A seat picked at random among the screen's seats: 30 % lower hall, 10 VIP, the rest upper hall.
+    seat_position = np.floor(rng.random(num_rows) * capacity)
+    seat_type = np.where(seat_position < np.floor(capacity * 0.3), 0, np.where(seat_position >= capacity - VIP_SEATS, 2, 1))
+
+    lower_hall_price = LOWER_HALL_PRICES[city, show_time]
+    ticket_price = np.select([seat_type == 1, seat_type == 2],
+                             [np.floor(lower_hall_price * 1.2), np.floor(lower_hall_price * 1.2 * 1.2)], lower_hall_price).astype(np.int64)
+
+    days = date.astype(np.int64)
+    weekend = (days + 3) % 7 >= 5 # 1970-01-01 was a Thursday, so Saturday and Sunday are 5 and 6.
+    month = date.astype('datetime64[M]').astype(np.int64) % 12 + 1
+    days_since_release = (date - films['release_date'][film]).astype(np.int64)
+    release_decay = np.maximum(0.5, 1 - days_since_release / 180) # Linear decay over 180 days, never below 0.5.
+
+    tickets_sold = np.trunc(
+        np.minimum(films['rating'][film] * 5, 50) + # Higher ratings tend to sell more.
+        capacity * 0.007 - # Only a fraction of the seats are sold as its rare for all seats to be sold.
+        ticket_price / 200 + # Higher ticket prices result in fewer tickets sold.
+        np.where(weekend, 40, 0) + # Weekends are more popular.
+        np.where(show_time == 2, 50, 0) + # Evening shows are more popular.
+        np.where(np.isin(month, [12, 1, 7, 8]), 60, 0) + # December, January, July, August are popular months.
+        np.minimum(films['genre_multiplier'][film] * 10, 30) + # Genre of movie plays a huge role in number of tickets as preference.
+        release_decay * 30 + # Many people may have already seen an older movie.
+        rng.normal(0, 20, num_rows) # Add some random noise to the tickets sold to make it more realistic.
+    ).astype(np.int64)
+    tickets_sold = np.clip(tickets_sold, 0, capacity) # Tickets sold is never higher than capacity.
+
+    columns = {
+        'screen_id': screen + 1,
+        'cinema_id': cinema + 1,
+        'film_id': films['film_id'][film],
+        'date': date,
+        'capacity': capacity,
+        'ticket_price': ticket_price,
+        'tickets_sold': tickets_sold,
+        'release_date': films['release_date'][film],
+        'rating': films['rating'][film],
     }
-    genre_multipliers = [genre_popularity[g] for g in genres]
-    genre_multiplier = sum(genre_multipliers) / len(genre_multipliers) # Calculates average genre multiplier.
-
-    # Time Since Release, decay weight the longer it has been released.
-    days_since_release = (date - release_date).days 
-    release_decay = max(0.5, 1 - (days_since_release / 180)) # create a value that decreases as days_since_release increases. Simulates a linear decay over 180 days. Ensures release_decay is never less than 0.5 so film doesnt lose its influence.
-
-    tickets_sold = int(
-        min(rating * 5, 50) + # Higher ratings tend to sell more.
-        (capacity * 0.007) - # Simulate that only a fraction of the cinema seats are sold as its rare for all seats to be sold.
-        (ticket_price / 200) + # Higher ticket prices result in fewer tickets sold, so a - is done. Also its divided by 100 to reduce its magnitude so that its in the range of the other factors.
-        (40 if date.weekday() >= 5 else 0) + # Weekends are more popular so more tickets are sold on weekends, so adds 40 tickets sold.
-        (50 if show_time_category == 'Evening' else 0) + # Evening shows are more popular so more tickets are sold in the evening, adds 50 tickets.
-        (60 if date.month in [12, 1, 7, 8] else 0) + # December, January, July, August are popular months so more tickets are sold in these months, adds 60 tickets.
-        min(genre_multiplier * 10, 30)+ # Genre of movie plays a huge role in number of tickets as preference.
-        (release_decay * 30)+ # days since release plays a huge role as many people may have already seen the movie.
-        np.random.normal(0, 20) # Add some random noise to the tickets sold to make it more realistic.
-    )
-    print(f"Calculated tickets_sold before min/max: {tickets_sold}")
-    tickets_sold = max(0, min(tickets_sold, capacity)) # Ensures ticket sold is not higher than capacity as it would not make sense otherwise.
-    print(f"Calculated tickets_sold after min/max: {tickets_sold}")
-    showing_data.append({
-            'screen_id': screen_id,
-            'cinema_id': cinema_id,
-            'cinema_location': city,
-            'film_id': film_id,
-            'date': date,
-            'show_time_category': show_time_category,
-            'capacity': capacity,
-            'seat_type': seat_type,
-            'ticket_price': ticket_price,
-            'tickets_sold': tickets_sold
-        })
-        
-showing_df = pd.DataFrame(showing_data)
-
-final_df = pd.merge(showing_df, films_df, on='film_id', how='left') # Combines the film df and showing df based on film_id with a left join.
-
-final_df = pd.get_dummies(final_df, columns=['cinema_location', 'seat_type', 'show_time_category']) # Performs one hot encoding on the string types.
-genre_dummies = pd.get_dummies(final_df['genre'].apply(pd.Series).stack()).groupby(level=0).sum() # One hot encodes the genre strings. Converts each genre into a panda series, creating a df where each genre is in a seperate column.
-final_df = pd.concat([final_df, genre_dummies], axis=1).drop('genre', axis=1) # removes the original genre column.
-
-final_df.to_csv('program/cinema_booking_prediction/cinema_data_booking_prediction_essential.csv', index=False)
+    for index, name in enumerate(CITIES):
+        columns[f'cinema_location_{name}'] = city == index
+    for index, name in enumerate(SEAT_TYPES):
+        columns[f'seat_type_{name}'] = seat_type == index
+    for index, name in enumerate(SHOW_TIMES):
+        columns[f'show_time_category_{name}'] = show_time == index
+    genres = films['genres'][film]
+    for index, name in enumerate(ALL_GENRES):
+        columns[name] = genres[:, index]
+    return pd.DataFrame(columns)[OUTPUT_COLUMNS]
+
+
+def generate_dataset(output=DEFAULT_OUTPUT, num_rows=DEFAULT_ROWS, chunk_size=DEFAULT_CHUNK_SIZE, num_films=20, seed=SEED, today=None):
+    """
+    Writes num_rows synthetic screenings to a CSV file, generating and appending chunk_size rows at a time.
+    The same seed and date always produce the same file.
+    """
+    rng = np.random.default_rng(seed)
+    today = today or datetime.date.today()
+    films = generate_film_data(num_films, rng, today)
+    cinema_cities = generate_cinema_data(CITIES_POPULATION, rng)
+    screen_cinemas, screen_capacities = generate_screen_data(cinema_cities, rng)
+
+    written = 0
+    while written < num_rows:
+        size = min(chunk_size, num_rows - written)
+        chunk = generate_showings(size, films, cinema_cities, screen_cinemas, screen_capacities, rng, today)
+        chunk.to_csv(output, mode='w' if written == 0 else 'a', header=written == 0, index=False, date_format='%Y-%m-%d')
+        written += size
+        print(f"Wrote {written}/{num_rows} rows to {output}")
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generates synthetic screenings for training the demand model.")
+    parser.add_argument('--rows', type=int, default=DEFAULT_ROWS)
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--seed', type=int, default=SEED)
+    arguments = parser.parse_args()
+
+    started = time.perf_counter()
+    generate_dataset(arguments.output, arguments.rows, arguments.chunk_size, seed=arguments.seed)
+    print(f"Done in {time.perf_counter() - started:.1f}s")
@@ -1,97 +1,27 @@
 import pandas as pd
 import numpy as np
-import joblib  # For loading the 
-from datetime import datetime
+import os
+import sys
 
-def datetime_to_excel(datetime_obj):
-    """Converts datetime object to Excel serial date."""
-    origin = datetime(1900, 1, 1)
-    return (datetime_obj - origin).days + 2
+# The assemble_v2 application provides the database access and the shared prediction code.
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'assemble_v2'))
+from main_components.prediction.model_registry import get_model_registry
+from main_components.prediction.batch_predictor import predict_batch
+
+MODEL_DIR = os.path.dirname(os.path.abspath(__file__)) # Where preprocessing.py saves the model and its feature pipeline.
 
 def predict_tickets_sold(input_data):
     """
-    Predicts the number of tickets sold using the saved Gradient Boosting model.
+    Predicts the number of tickets sold using the saved demand model, whichever family the training search picked.
 
     Args:
         input_data (dict): A dictionary containing the input features.
 
     Returns:
-        float: The predicted number of tickets sold.
+        int: The predicted number of tickets sold.
     """
-
-    # Load the saved model
-    model = joblib.load('program/cinema_booking_prediction/gradient_boosting_model.joblib')
-
-    # Convert the input dictionary to a DataFrame
-    input_df = pd.DataFrame([input_data])
-
-    # Convert release_date and date from string to Excel serial number
-    input_df['release_date'] = pd.to_datetime(input_df['release_date']).apply(datetime_to_excel)
-    input_df['date'] = pd.to_datetime(input_df['date']).apply(datetime_to_excel)
-
-    # Convert boolean columns to 0/1
-    boolean_cols = input_df.select_dtypes(include='bool').columns
-    input_df[boolean_cols] = input_df[boolean_cols].astype(int)
-
-    # Remove duplicates
-    input_df.drop_duplicates(inplace=True)
-
-    # Scale the numerical features (same as in training)
-    numerical_cols = ['capacity', 'ticket_price', 'release_date', 'rating', 'date']
-    scaler = joblib.load('program/cinema_booking_prediction/scaler.joblib') #Load scaler here.
-    input_df[numerical_cols] = scaler.transform(input_df[numerical_cols])
-
-
-    # Drop low importance features (same as in training)
-    low_importance_features = [
-        'ticket_price',
-        'screen_id',
-        'film_id',
-        'show_time_category_Morning',
-        'Romance',
-        'Comedy',
-        'Sci-Fi',
-        'cinema_location_Cardiff',
-        'show_time_category_Afternoon',
-        'Drama',
-        'Adventure',
-        'Action',
-        'seat_type_Lower',
-        'cinema_id',
-        'cinema_location_Bristol',
-        'seat_type_VIP',
-        'Mystery',
-        'seat_type_Upper',
-        'Horror',
-        'cinema_location_London',
-        'cinema_location_Birmingham',
-        'Thriller'
-    ]
-
-    input_df_reduced = input_df.drop(low_importance_features, axis=1)
-
-    # Reorder columns to match training data order.
-    # Reorder columns to match training data order.
-    training_columns = ['date', 'capacity', 'release_date', 'rating', 'show_time_category_Evening',
-                       'day_of_week_Friday', 'day_of_week_Monday', 'day_of_week_Saturday',
-                       'day_of_week_Sunday', 'day_of_week_Thursday', 'day_of_week_Tuesday',
-                       'day_of_week_Wednesday']
-    
-     # Create the day of week columns.
-    day_name = pd.to_datetime(input_data['date']).day_name() # Extracts day of week from date.
-    for day in ['Friday', 'Monday', 'Saturday', 'Sunday', 'Thursday', 'Tuesday', 'Wednesday']:
-        input_df_reduced[f'day_of_week_{day}'] = 1 if day == day_name else 0 # Creates each column day 
-    
-    input_df_reduced = input_df_reduced[training_columns]
-
-    # Make the prediction
-    prediction = round(model.predict(input_df_reduced)[0])
-
-    # Enforce the capacity constraint.
-    capacity = input_data['capacity']
-    prediction = min(prediction, capacity) #ensure prediction is not higher than capacity.
-
-    return prediction
+    loaded = get_model_registry(MODEL_DIR).get() # Loaded once, reloaded only when the artifacts change.
+    return int(predict_batch(loaded.model, loaded.pipeline, [input_data])[0])
 
 test_data_monday = {
     'capacity': 120,
@@ -314,9 +244,6 @@ test_data_mapping = {
 }
 
 
-for day, data in test_data_mapping.items():
-    prediction = predict_tickets_sold(data)
-    print(f"Tickets sold on {day}: {prediction}")
 
 
 
@@ -383,9 +310,42 @@ def predict_cinema_sales_with_caps(date):
 
     return total_sales
 
-# Example usage
-date_to_predict = "2023-11-12"
-total_cinema_sales = predict_cinema_sales_with_caps(date_to_predict)
-# Get the day name
-day_name = pd.to_datetime(date_to_predict).day_name()
-print(f"Total predicted sales for the cinema on {day_name}: {total_cinema_sales}")
+
+def predict_screenings_from_database(start_date, end_date=None, cinema_ids=None):
+    """
+    Predicts the tickets sold for the screenings stored in the cinema database.
+
+    The screenings are fetched with their films, screens and cities in one query and scored in one batch,
+    with the same feature rows as the predictions page.
+
+    Args:
+        start_date: The first screening date.
+        end_date: The last screening date, defaults to start_date.
+        cinema_ids: Only screenings of these cinemas, all cinemas if None.
+
+    Returns:
+        list: (feature row, predicted tickets) pairs, one per screening.
+    """
+    from database.database_settings import SessionLocal, release_connection
+    from main_components.prediction.features import load_screening_features
+
+    session = SessionLocal()
+    try:
+        rows = load_screening_features(session, start_date, end_date, cinema_ids=cinema_ids)
+    finally:
+        release_connection()
+    loaded = get_model_registry(MODEL_DIR).get()
+    return list(zip(rows, predict_batch(loaded.model, loaded.pipeline, rows).tolist()))
+
+
+if __name__ == "__main__":
+    for day, data in test_data_mapping.items():
+        prediction = predict_tickets_sold(data)
+        print(f"Tickets sold on {day}: {prediction}")
+
+    # Example usage
+    date_to_predict = "2023-11-12"
+    total_cinema_sales = predict_cinema_sales_with_caps(date_to_predict)
+    # Get the day name
+    day_name = pd.to_datetime(date_to_predict).day_name()
+    print(f"Total predicted sales for the cinema on {day_name}: {total_cinema_sales}")
@@ -1,19 +1,29 @@
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
-from sklearn.model_selection import train_test_split, GridSearchCV, cross_val_score
-from sklearn.preprocessing import MinMaxScaler
+from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LinearRegression
 from sklearn.tree import DecisionTreeRegressor
 from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
 from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
 import numpy as np
 import catboost as cb
-import joblib  # Import joblib for model saving
+import os
+import sys
+
+# The feature pipeline is shared with the assemble_v2 application, which runs it at prediction time.
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'assemble_v2'))
+from main_components.prediction.feature_pipeline import FeaturePipeline, PIPELINE_FILE, to_ordinals
+from main_components.prediction.training_store import TrainingStore
+from main_components.prediction.model_search import SearchBudget, SearchLedger, SearchSpace, SuccessiveHalvingSearch
+from main_components.prediction.model_registry import MODEL_FILE, save_model_artifacts
 
 
 # 1. Load the data
-df = pd.read_csv('program/cinema_booking_prediction/cinema_data_booking_prediction_essential.csv') # load the data from the csv file.
+# The CSV is converted once into a typed, column per file store, later runs read the store until the CSV changes.
+store = TrainingStore.open('program/cinema_booking_prediction/cinema_data_booking_prediction_essential.csv',
+                           'program/cinema_booking_prediction/training_store')
+df = store.to_frame() # Indexed by row number in the store.
 
 # 2. Handle missing values and duplicates
 #print(df.isnull().sum())  # Check for missing values in each column, we have already checked it, no null values.
@@ -22,6 +32,7 @@ df.drop_duplicates(inplace=True) # remove duplicate rows
 # 3. Convert False, True one-hot encoded columns to binary 0/1
 boolean_cols = df.select_dtypes(include='bool').columns
 df[boolean_cols] = df[boolean_cols].astype(int)
+raw_df = df.copy() # The raw columns, which the feature pipeline is fitted on and transforms.
 
 # Convert the 'date' column to datetime64[ns]
 df['date'] = pd.to_datetime(df['date'])
@@ -30,7 +41,7 @@ df['date'] = pd.to_datetime(df['date'])
 
 df['day_of_week'] = df['date'].dt.day_name()
 df = pd.get_dummies(df, columns=['day_of_week'])
-df['date'] = df['date'].apply(lambda x: x.toordinal())  # Convert to ordinal directly.
+df['date'] = to_ordinals(df['date'])  # Convert to ordinal directly.
 
 # 5. Remove rows where tickets_sold is 0.
 df = df[df['tickets_sold'] != 0]
@@ -42,20 +53,12 @@ y = df['tickets_sold']
 # 8. Split the data into training and test sets
 X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42) # split the data into training and test sets.
 
-# 9. Select numerical columns to scale
-numerical_cols = ['capacity', 'ticket_price', 'release_date', 'rating', 'date']
-
-# Convert release_date to ordinal, and scale.
-X_train['release_date'] = pd.to_datetime(X_train['release_date']).apply(lambda x: x.toordinal()).astype('int64')
-X_test['release_date'] = pd.to_datetime(X_test['release_date']).apply(lambda x: x.toordinal()).astype('int64')
-
-scaler = MinMaxScaler()
-X_train[numerical_cols] = scaler.fit_transform(X_train[numerical_cols]) # Scale the training data
-X_test[numerical_cols] = scaler.transform(X_test[numerical_cols]) # Scale the test data using the same scaler
-
-# Save the scaler
-joblib.dump(scaler, 'program/cinema_booking_prediction/scaler.joblib') 
-print('Scaler saved as scaler.joblib')
+# 9. Build the baseline features with the feature pipeline the application runs, fitted on the training rows only.
+# It encodes the dates as ordinals and min-max scales the numerical columns, no separate scaler is fitted or saved.
+baseline_pipeline = FeaturePipeline.fit(raw_df.loc[X_train.index], list(X.columns))
+baseline_features = store.feature_matrix(baseline_pipeline) # Cached in the store, like the reduced features below.
+X_train = pd.DataFrame(baseline_features[X_train.index.to_numpy()], columns=X.columns, index=X_train.index)
+X_test = pd.DataFrame(baseline_features[X_test.index.to_numpy()], columns=X.columns, index=X_test.index)
 
 # 10. Train and evaluate baseline models
 models = {
@@ -83,8 +86,7 @@ for name, model in models.items():
 
 
 # 11. Feature Importance (Gradient Boosting)
-gb_model = GradientBoostingRegressor(random_state=42)
-gb_model.fit(X_train, y_train)
+gb_model = models['Gradient Boosting Regressor'] # Already fitted on the training set with the baselines.
 
 feature_importance = gb_model.feature_importances_ # get the feature importance from the model.
 feature_importance_df = pd.DataFrame({'Feature': X_train.columns, 'Importance': feature_importance}) # create a dataframe with the feature importance.
@@ -125,77 +127,58 @@ low_importance_features = ['ticket_price',
     'cinema_location_Birmingham',
     'Thriller']
 
-X_train_reduced = X_train.drop(low_importance_features, axis=1)
-X_test_reduced = X_test.drop(low_importance_features, axis=1)
-
-print(X_train_reduced.columns)
-
-param_grid = {
-    'n_estimators': [100, 200, 300],
-    'learning_rate': [0.01, 0.05, 0.1],
-    'max_depth': [3, 4, 5],
-    'min_samples_split': [2, 5, 10],
-    'min_samples_leaf': [1, 2, 4]
-}
-
-grid_search_reduced = GridSearchCV(GradientBoostingRegressor(random_state=42), param_grid, cv=5, scoring='neg_mean_squared_error', n_jobs=-1)
-grid_search_reduced.fit(X_train_reduced, y_train)
-
-best_gb_reduced = grid_search_reduced.best_estimator_
-y_pred_best_gb_reduced = best_gb_reduced.predict(X_test_reduced)
-
-mse_best_gb_reduced = mean_squared_error(y_test, y_pred_best_gb_reduced)
-rmse_best_gb_reduced = np.sqrt(mse_best_gb_reduced)
-mae_best_gb_reduced = mean_absolute_error(y_test, y_pred_best_gb_reduced)
-r2_best_gb_reduced = r2_score(y_test, y_pred_best_gb_reduced)
-
-print(f'Gradient Boosting Regressor (Reduced Features, Tuned): MSE={mse_best_gb_reduced:.2f}, RMSE={rmse_best_gb_reduced:.2f}, MAE={mae_best_gb_reduced:.2f}, R2={r2_best_gb_reduced:.2f}')
-print(f'Best Parameters (Reduced Features): {grid_search_reduced.best_params_}')
-
-
-
-# Hyperparameter tuning for CatBoost
-param_grid_catboost = {
-    'iterations': [100, 200, 300],
-    'learning_rate': [0.01, 0.05, 0.1],
-    'depth': [3, 4, 5]
-}
-grid_search_catboost = GridSearchCV(cb.CatBoostRegressor(random_state=42, verbose=0), param_grid_catboost, cv=5, scoring='neg_mean_squared_error', n_jobs=-1)
-grid_search_catboost.fit(X_train_reduced, y_train)
-
-best_catboost = grid_search_catboost.best_estimator_
-y_pred_best_catboost = best_catboost.predict(X_test_reduced)
-
-mse_best_catboost = mean_squared_error(y_test, y_pred_best_catboost)
-rmse_best_catboost = np.sqrt(mse_best_catboost)
-mae_best_catboost = mean_absolute_error(y_test, y_pred_best_catboost)
-r2_best_catboost = r2_score(y_test, y_pred_best_catboost)
-
-print(f'\nCatBoost (Tuned): MSE={mse_best_catboost:.2f}, RMSE={rmse_best_catboost:.2f}, MAE={mae_best_catboost:.2f}, R2={r2_best_catboost:.2f}')
-print(f'Best Parameters (CatBoost): {grid_search_catboost.best_params_}')
-
-
-
-# Cross-validation for Gradient Boosting
-gb_cv_scores = cross_val_score(best_gb_reduced, X_train_reduced, y_train, cv=5, scoring='neg_mean_squared_error')
-gb_cv_rmse_scores = np.sqrt(-gb_cv_scores)
-
-print("\nGradient Boosting Cross-Validation Results:")
-print(f"RMSE Scores: {gb_cv_rmse_scores}")
-print(f"Mean RMSE: {gb_cv_rmse_scores.mean()}")
-print(f"Std RMSE: {gb_cv_rmse_scores.std()}")
-
-# Cross-validation for CatBoost
-catboost_cv_scores = cross_val_score(best_catboost, X_train_reduced, y_train, cv=5, scoring='neg_mean_squared_error')
-catboost_cv_rmse_scores = np.sqrt(-catboost_cv_scores)
-
-print("\nCatBoost Cross-Validation Results:")
-print(f"RMSE Scores: {catboost_cv_rmse_scores}")
-print(f"Mean RMSE: {catboost_cv_rmse_scores.mean()}")
-print(f"Std RMSE: {catboost_cv_rmse_scores.std()}")
-
-
-# Save the trained Gradient Boosting model using joblib
-joblib.dump(best_gb_reduced, 'program/cinema_booking_prediction/gradient_boosting_model.joblib')
-
-print("Gradient Boosting model saved as 'gradient_boosting_model.joblib'")
\ No newline at end of file
+model_columns = [column for column in X_train.columns if column not in low_importance_features]
+
+# The reduced features are built by the same pipeline the application runs, fitted on the training rows only.
+pipeline = FeaturePipeline.fit(raw_df.loc[X_train.index], model_columns)
+features = store.feature_matrix(pipeline) # Cached in the store, the next run with the same pipeline reuses it.
+X_train_reduced = features[X_train.index.to_numpy()]
+X_test_reduced = features[X_test.index.to_numpy()]
+
+print(model_columns)
+
+# Random search with successive halving over both model families, under a budget. Candidates are scored on
+# small samples of the cached folds first and only the best ones are fitted on more rows. Every fit is written
+# to the ledger, so a rerun on the same data reads back what was already scored instead of fitting it again.
+search_spaces = [
+    SearchSpace('Gradient Boosting Regressor', GradientBoostingRegressor(random_state=42), {
+        'n_estimators': [100, 200, 300],
+        'learning_rate': [0.01, 0.05, 0.1],
+        'max_depth': [3, 4, 5],
+        'min_samples_split': [2, 5, 10],
+        'min_samples_leaf': [1, 2, 4]
+    }, candidates=60),
+    SearchSpace('CatBoost', cb.CatBoostRegressor(random_state=42, verbose=0), {
+        'iterations': [100, 200, 300],
+        'learning_rate': [0.01, 0.05, 0.1],
+        'depth': [3, 4, 5]
+    }, candidates=15),
+]
+search = SuccessiveHalvingSearch(search_spaces,
+                                 budget=SearchBudget(max_fits=int(os.getenv('CINEMA_SEARCH_MAX_FITS', 400)),
+                                                     max_seconds=float(os.getenv('CINEMA_SEARCH_MAX_SECONDS', 1800))),
+                                 ledger=SearchLedger('program/cinema_booking_prediction/search_ledger.jsonl'),
+                                 folds=5)
+best = search.fit(X_train_reduced, y_train)
+
+y_pred_best = best.estimator.predict(X_test_reduced)
+mse_best = mean_squared_error(y_test, y_pred_best)
+rmse_best = np.sqrt(mse_best)
+mae_best = mean_absolute_error(y_test, y_pred_best)
+r2_best = r2_score(y_test, y_pred_best)
+
+print(f'{best.family} (Reduced Features, Tuned): MSE={mse_best:.2f}, RMSE={rmse_best:.2f}, MAE={mae_best:.2f}, R2={r2_best:.2f}')
+print(f'Best Parameters (Reduced Features): {best.parameters}')
+print(f'{best.fits} fits run, {best.reused} fold scores read from the ledger.')
+
+# The cross-validation scores of the search, on the last rung the best candidate was scored at.
+print(f"\n{best.family} Cross-Validation Results ({best.samples} training rows per fold):")
+print(f"RMSE Scores: {best.fold_rmse}")
+print(f"Mean RMSE: {best.fold_rmse.mean()}")
+print(f"Std RMSE: {best.fold_rmse.std()}")
+
+
+# Save the best model and its feature pipeline together, the application loads both.
+save_model_artifacts(best.estimator, pipeline, 'program/cinema_booking_prediction')
+
+print(f"Best model ({best.family}) saved as '{MODEL_FILE}' with '{PIPELINE_FILE}'")
\ No newline at end of file